@@ -1,50 +1,106 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 import sys
 import os
-import json
-from datetime import datetime
-import threading
 import time
 
 # Add the src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.agents.research_agent import ResearchAgent
+from src.agents.agent_pool import AgentPool
+from src.jobs.api import Poller, Reply, ResearchAPI
+from src.jobs.queue import create_job_queue
+from src.jobs.runner import JobRunner
+from src.jobs.scheduler import JobScheduler
+from src.jobs.store import create_job_store
+from src.utils.config import Config
+from src.utils.http_responses import COMPRESS_MIN_BYTES, choose_encoding, compress, should_compress
+from src.utils.metrics import get_metrics, render_prometheus
+from src.utils.rate_limiter import get_shared_rate_limiter
 
 app = Flask(__name__)
 
-# In-memory storage for research results (in production, use a database)
-research_results = {}
-research_queue = []
+# Job records live in a shared store so every gunicorn worker sees them
+job_store = create_job_store(Config.JOB_STORE_URL)
 
-class ResearchThread(threading.Thread):
-    def __init__(self, research_id, topic, questions):
-        threading.Thread.__init__(self)
-        self.research_id = research_id
-        self.topic = topic
-        self.questions = questions
+# Each worker publishes its metrics to a shared directory that /metrics merges
+metrics = get_metrics()
+metrics.start_flusher(Config.METRICS_FLUSH_SECONDS)
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli JSON and text bodies for clients that accept it (streams are left alone)"""
+    if (response.direct_passthrough or response.is_streamed
+            or not should_compress(response.status_code, response.mimetype, response.headers)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    body = response.get_data()
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+if Config.JOB_EXECUTION == 'queue':
+    # Web processes only enqueue and read status; `python -m src.worker` processes run the jobs
+    job_queue = create_job_queue(Config.JOB_QUEUE_URL)
+    agent_pool = runner = scheduler = None
+else:
+    job_queue = None
+    # Agents are built once per worker process and reused across jobs
+    agent_pool = AgentPool(Config.AGENT_POOL_SIZE)
+    try:
+        agent_pool.warm()
+    except Exception as e:
+        # Jobs will retry building agents lazily and report the error per job
+        print(f"⚠️ Could not pre-warm research agents: {e}")
+    
+    # Runs jobs against the store (progress events, results, metrics); shared with app/asgi.py
+    runner = JobRunner(job_store, agent_pool, metrics)
     
-    def run(self):
-        try:
-            agent = ResearchAgent()
-            results = agent.conduct_research(self.topic, self.questions)
-            report = agent.generate_report(results, self.topic)
-            
-            # Save results
-            research_results[self.research_id] = {
-                'status': 'completed',
-                'topic': self.topic,
-                'questions': self.questions,
-                'results': results,
-                'report': report,
-                'completed_at': datetime.now().isoformat()
-            }
-        except Exception as e:
-            research_results[self.research_id] = {
-                'status': 'error',
-                'error': str(e),
-                'completed_at': datetime.now().isoformat()
-            }
+    # Fixed worker count and bounded queue; bursts beyond it are rejected with 429
+    scheduler = JobScheduler(
+        workers=Config.JOB_WORKERS,
+        max_queue=Config.JOB_QUEUE_SIZE,
+        expected_duration=Config.JOB_EXPECTED_SECONDS,
+        on_start=runner.mark_processing
+    )
+
+# Admission, queue positions and queue stats come from whichever tier runs the jobs
+jobs = job_queue if job_queue is not None else scheduler
+
+def submit_job(research_id, topic, questions, fresh=False, priority='normal'):
+    """Hand a job to the worker tier or to this process's scheduler; raises QueueFullError"""
+    if job_queue is not None:
+        payload = {'topic': topic, 'questions': questions, 'fresh': fresh, 'priority': priority}
+        job_queue.submit(research_id, payload, priority=priority)
+    else:
+        scheduler.submit(
+            research_id,
+            lambda: runner.run(research_id, topic, questions, fresh=fresh, priority=priority),
+            priority=priority
+        )
+
+# Request handling shared with app/asgi.py; the routes below only adapt it to Flask
+api = ResearchAPI(job_store, jobs, submit_job)
+
+def drain(poller):
+    while True:
+        chunks, finished = poller.poll()
+        yield from chunks
+        if finished:
+            return
+        time.sleep(Config.SSE_POLL_INTERVAL)
+
+def respond(reply: Reply):
+    if reply.status == 304:
+        return Response(status=304, headers=reply.headers)
+    if isinstance(reply.stream, Poller):
+        # Each open stream holds a worker thread until it ends (SSE_MAX_STREAM_SECONDS)
+        return Response(stream_with_context(drain(reply.stream)), mimetype=reply.mimetype, headers=reply.headers)
+    if reply.stream is not None:
+        return Response(reply.stream, mimetype=reply.mimetype, headers=reply.headers)
+    return jsonify(reply.body), reply.status, reply.headers
 
 @app.route('/')
 def index():
@@ -52,70 +108,61 @@ def index():
 
 @app.route('/api/research', methods=['POST'])
 def start_research():
-    data = request.json
-    topic = data.get('topic', '').strip()
-    questions = [q.strip() for q in data.get('questions', []) if q.strip()]
-    
-    if not topic or not questions:
-        return jsonify({'error': 'Topic and questions are required'}), 400
-    
-    # Generate unique research ID
-    research_id = f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    
-    # Start research in background thread
-    research_thread = ResearchThread(research_id, topic, questions)
-    research_thread.start()
-    
-    # Store initial status
-    research_results[research_id] = {
-        'status': 'processing',
-        'topic': topic,
-        'questions': questions,
-        'started_at': datetime.now().isoformat()
-    }
-    
-    return jsonify({
-        'research_id': research_id,
-        'status': 'started',
-        'message': 'Research started successfully'
-    })
+    return respond(api.start(request.get_json(silent=True)))
 
 @app.route('/api/research/<research_id>', methods=['GET'])
 def get_research_status(research_id):
-    if research_id not in research_results:
-        return jsonify({'error': 'Research not found'}), 404
-    
-    result = research_results[research_id]
-    return jsonify(result)
+    """Job record; ?fields=status,progress returns only those keys. Supports If-None-Match."""
+    return respond(api.status(research_id, request.args.get('fields'), request.headers.get('If-None-Match')))
+
+@app.route('/api/research/<research_id>/resume', methods=['POST'])
+def resume_research(research_id):
+    """Re-queue a failed (or, with force, an orphaned) job; finished questions are not redone"""
+    return respond(api.resume(research_id, request.get_json(silent=True)))
+
+@app.route('/api/research/<research_id>/events', methods=['GET'])
+def stream_research_events(research_id):
+    """Server-Sent Events stream of a job's progress (replaces client polling)"""
+    # EventSource sends Last-Event-ID when it reconnects
+    return respond(api.events(research_id, request.headers.get('Last-Event-ID') or request.args.get('after')))
+
+@app.route('/api/research/<research_id>/report/stream', methods=['GET'])
+def stream_report(research_id):
+    """Stream the report as plain text while it is generated (or at once if done)"""
+    return respond(api.report_stream(research_id))
 
 @app.route('/api/research/<research_id>/report', methods=['GET'])
 def download_report(research_id):
-    if research_id not in research_results:
-        return jsonify({'error': 'Research not found'}), 404
-    
-    result = research_results[research_id]
-    if result['status'] != 'completed':
-        return jsonify({'error': 'Research not completed yet'}), 400
-    
-    return jsonify({
-        'report': result['report'],
-        'topic': result['topic']
-    })
+    """Finished report as JSON, or as a text/markdown download with ?format=markdown"""
+    markdown = (request.args.get('format') == 'markdown'
+                or request.accept_mimetypes.best_match(['application/json', 'text/markdown']) == 'text/markdown')
+    return respond(api.report(research_id, markdown, request.headers.get('If-None-Match'),
+                              request.headers.get('Accept-Encoding')))
+
+@app.route('/api/search', methods=['GET'])
+def search_research():
+    """Past research most similar to ?q= (topic, questions and answers)"""
+    return respond(api.search(request.args.get('q', ''), request.args.get('limit', 10, type=int)))
+
+@app.route('/api/quota', methods=['GET'])
+def get_quota():
+    """Usage and headroom against the per-minute and per-day Gemini limits (all workers)"""
+    return jsonify(get_shared_rate_limiter().stats())
+
+@app.route('/api/queue', methods=['GET'])
+def get_queue_stats():
+    return jsonify(jobs.stats())
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint, summed over every worker process"""
+    metrics.flush()
+    return Response(render_prometheus(metrics.collect()), mimetype='text/plain; version=0.0.4')
 
 @app.route('/api/history', methods=['GET'])
 def get_research_history():
-    # Return recent research projects (last 10)
-    history = []
-    for research_id, research in list(research_results.items())[-10:]:
-        history.append({
-            'id': research_id,
-            'topic': research.get('topic', ''),
-            'status': research.get('status', ''),
-            'started_at': research.get('started_at', ''),
-            'completed_at': research.get('completed_at', '')
-        })
-    
-    return jsonify({'history': history})
+    # Return recent research projects (last 10), served from the started_at index
+    return jsonify({'history': job_store.recent(10)})
 
 import sys
 
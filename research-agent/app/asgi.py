@@ -0,0 +1,198 @@
+"""
+ASGI server mode: the routes of app.py served by Quart on one event loop.
+
+Research jobs run as tasks (agent.aconduct_research, async model and tool
+calls) instead of one OS thread each, so a single worker process can drive
+hundreds of concurrent jobs and keep answering status polls and event
+streams while they wait on Gemini. Run with (as run_production.sh does):
+
+    hypercorn -w 4 -b 0.0.0.0:5000 asgi:app   (from the app/ directory)
+
+Every worker process runs up to ASYNC_JOB_WORKERS jobs, so -w 4 allows four
+times that many at once. They all draw on the one Gemini quota shared through
+QUOTA_STORE_PATH, which admits their calls in priority order; more jobs
+than the quota can feed only wait longer for it. Size -w for request
+handling and ASYNC_JOB_WORKERS for the jobs one process should hold.
+
+Request handling is shared with app.py (src/jobs/api.py); this module only
+adapts it to Quart.
+"""
+
+from quart import Quart, Response, render_template, request, jsonify
+import asyncio
+import sys
+import os
+
+# Add the src directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.agent_pool import AgentPool
+from src.jobs.api import Poller, Reply, ResearchAPI
+from src.jobs.queue import create_job_queue
+from src.jobs.runner import JobRunner
+from src.jobs.scheduler import AsyncJobScheduler
+from src.jobs.store import create_job_store
+from src.utils.config import Config
+from src.utils.http_responses import COMPRESS_MIN_BYTES, choose_encoding, compress, should_compress
+from src.utils.metrics import get_metrics, render_prometheus
+from src.utils.rate_limiter import get_shared_rate_limiter
+
+app = Quart(__name__)
+
+job_store = create_job_store(Config.JOB_STORE_URL)
+
+metrics = get_metrics()
+metrics.start_flusher(Config.METRICS_FLUSH_SECONDS)
+
+if Config.JOB_EXECUTION == 'queue':
+    # Web processes only enqueue and read status; `python -m src.worker` processes run the jobs
+    job_queue = create_job_queue(Config.JOB_QUEUE_URL)
+    agent_pool = runner = scheduler = None
+else:
+    job_queue = None
+    # One agent per concurrently running job; a few are built up front, the rest on demand
+    agent_pool = AgentPool(Config.ASYNC_JOB_WORKERS)
+    try:
+        agent_pool.warm(min(Config.AGENT_POOL_SIZE, Config.ASYNC_JOB_WORKERS))
+    except Exception as e:
+        print(f"⚠️ Could not pre-warm research agents: {e}")
+
+    runner = JobRunner(job_store, agent_pool, metrics)
+
+    # Worker tasks instead of threads; same bounded priority queue as the threaded app
+    scheduler = AsyncJobScheduler(
+        workers=Config.ASYNC_JOB_WORKERS,
+        max_queue=Config.JOB_QUEUE_SIZE,
+        expected_duration=Config.JOB_EXPECTED_SECONDS,
+        on_start=runner.mark_processing
+    )
+
+# Admission, queue positions and queue stats come from whichever tier runs the jobs
+jobs = job_queue if job_queue is not None else scheduler
+
+def submit_job(research_id, topic, questions, fresh=False, priority='normal'):
+    """Hand a job to the worker tier or to the event loop's scheduler; raises QueueFullError"""
+    if job_queue is not None:
+        payload = {'topic': topic, 'questions': questions, 'fresh': fresh, 'priority': priority}
+        job_queue.submit(research_id, payload, priority=priority)
+    else:
+        scheduler.submit(
+            research_id,
+            lambda: runner.arun(research_id, topic, questions, fresh=fresh, priority=priority),
+            priority=priority
+        )
+
+@app.before_serving
+async def start_scheduler():
+    if scheduler is not None:
+        scheduler.start()
+
+@app.after_request
+async def compress_response(response):
+    """gzip/brotli JSON and text bodies for clients that accept it (streams are left alone)"""
+    if (not isinstance(response.response, response.data_body_class)
+            or not should_compress(response.status_code, response.mimetype, response.headers)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    body = await response.get_data()
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# Request handling shared with app.py; the routes below only adapt it to Quart and run
+# it on worker threads, since it reads and writes the job store and queue
+api = ResearchAPI(job_store, jobs, submit_job)
+
+async def drain(poller):
+    while True:
+        # Store reads run off the loop
+        chunks, finished = await asyncio.to_thread(poller.poll)
+        for chunk in chunks:
+            yield chunk
+        if finished:
+            return
+        await asyncio.sleep(Config.SSE_POLL_INTERVAL)
+
+def respond(reply: Reply):
+    if reply.status == 304:
+        return Response('', status=304, headers=reply.headers)
+    if reply.stream is not None:
+        body = drain(reply.stream) if isinstance(reply.stream, Poller) else reply.stream
+        response = Response(body, mimetype=reply.mimetype, headers=reply.headers)
+        # Streams end on their own (SSE_MAX_STREAM_SECONDS); Quart's default timeout would cut them at 60s
+        response.timeout = None
+        return response
+    return jsonify(reply.body), reply.status, reply.headers
+
+@app.route('/')
+async def index():
+    return await render_template('index.html')
+
+@app.route('/api/research', methods=['POST'])
+async def start_research():
+    return respond(await asyncio.to_thread(api.start, await request.get_json(silent=True)))
+
+@app.route('/api/research/<research_id>', methods=['GET'])
+async def get_research_status(research_id):
+    """Job record; ?fields=status,progress returns only those keys. Supports If-None-Match."""
+    return respond(await asyncio.to_thread(api.status, research_id, request.args.get('fields'),
+                                           request.headers.get('If-None-Match')))
+
+@app.route('/api/research/<research_id>/resume', methods=['POST'])
+async def resume_research(research_id):
+    """Re-queue a failed (or, with force, an orphaned) job; finished questions are not redone"""
+    return respond(await asyncio.to_thread(api.resume, research_id, await request.get_json(silent=True)))
+
+@app.route('/api/research/<research_id>/events', methods=['GET'])
+async def stream_research_events(research_id):
+    """Server-Sent Events stream of a job's progress; an open stream costs no thread here"""
+    return respond(await asyncio.to_thread(api.events, research_id,
+                                           request.headers.get('Last-Event-ID') or request.args.get('after')))
+
+@app.route('/api/research/<research_id>/report/stream', methods=['GET'])
+async def stream_report(research_id):
+    """Stream the report as plain text while it is generated (or at once if done)"""
+    return respond(await asyncio.to_thread(api.report_stream, research_id))
+
+@app.route('/api/research/<research_id>/report', methods=['GET'])
+async def download_report(research_id):
+    """Finished report as JSON, or as a text/markdown download with ?format=markdown"""
+    markdown = (request.args.get('format') == 'markdown'
+                or request.accept_mimetypes.best_match(['application/json', 'text/markdown']) == 'text/markdown')
+    return respond(await asyncio.to_thread(api.report, research_id, markdown,
+                                           request.headers.get('If-None-Match'),
+                                           request.headers.get('Accept-Encoding')))
+
+@app.route('/api/search', methods=['GET'])
+async def search_research():
+    """Past research most similar to ?q= (topic, questions and answers)"""
+    # A matrix product over every indexed job; keep it off the loop
+    return respond(await asyncio.to_thread(api.search, request.args.get('q', ''),
+                                           request.args.get('limit', 10, type=int)))
+
+@app.route('/api/quota', methods=['GET'])
+async def get_quota():
+    """Usage and headroom against the per-minute and per-day Gemini limits (all workers)"""
+    return jsonify(await asyncio.to_thread(lambda: get_shared_rate_limiter().stats()))
+
+@app.route('/api/queue', methods=['GET'])
+async def get_queue_stats():
+    return jsonify(await asyncio.to_thread(jobs.stats))
+
+@app.route('/metrics', methods=['GET'])
+async def prometheus_metrics():
+    """Prometheus scrape endpoint, summed over every worker process"""
+    metrics.flush()
+    body = render_prometheus(await asyncio.to_thread(metrics.collect))
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/history', methods=['GET'])
+async def get_research_history():
+    return jsonify({'history': await asyncio.to_thread(job_store.recent, 10)})
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app.run(port=port)
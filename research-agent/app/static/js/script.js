@@ -1,6 +1,10 @@
+// Fields a status poll needs (the full record, with every answer and the report, is fetched once at the end)
+const POLL_FIELDS = 'status,progress,queue_position,estimated_start,error';
+
 class ResearchApp {
     constructor() {
         this.currentResearchId = null;
+        this.eventSource = null;
         this.initializeEventListeners();
         this.loadResearchHistory();
     }
@@ -46,30 +50,115 @@ class ResearchApp {
                 body: JSON.stringify({ topic, questions })
             });
 
+            if (response.status === 429) {
+                const busy = await response.json();
+                throw new Error(`The research queue is full. Please try again in about ${busy.retry_after} seconds.`);
+            }
+
             if (!response.ok) {
                 throw new Error('Failed to start research');
             }
 
             const data = await response.json();
             this.currentResearchId = data.research_id;
+            this.updateProgress(data);
 
-            // Start polling for results
-            this.pollResearchStatus();
+            // Follow live progress events (falls back to polling if unsupported)
+            this.watchResearch(questions.length);
 
         } catch (error) {
             this.showError(error.message);
         }
     }
 
+    watchResearch(totalQuestions) {
+        if (!window.EventSource) {
+            this.pollResearchStatus();
+            return;
+        }
+
+        this.closeEventStream();
+        const researchId = this.currentResearchId;
+        const source = new EventSource(`/api/research/${researchId}/events`);
+        this.eventSource = source;
+
+        let total = totalQuestions;
+        let finished = 0;
+        const progressBar = document.querySelector('.progress-fill');
+        const progressText = document.getElementById('progressText');
+        const questionItems = document.querySelectorAll('#questionsList li');
+        const on = (type, handler) => source.addEventListener(type, (e) => handler(JSON.parse(e.data || '{}')));
+
+        on('job_started', () => {
+            progressText.textContent = 'Research agent started...';
+        });
+        on('research_started', (data) => {
+            total = data.total || total;
+        });
+        on('question_started', (data) => {
+            progressText.textContent = `Researching question ${data.index + 1}/${total}: ${data.question}`;
+        });
+        on('tool_call', (data) => {
+            progressText.textContent = `Question ${data.index + 1}/${total}: using ${data.tool}...`;
+        });
+        on('question_finished', (data) => {
+            finished += 1;
+            progressBar.style.width = Math.round(90 * finished / total) + '%';
+            const item = questionItems[data.index];
+            if (item) {
+                item.textContent = `${data.ok ? '✅' : '⚠️'} ${data.question}`;
+            }
+        });
+        let reportStarted = false;
+        on('report_started', () => {
+            progressText.textContent = 'Writing the final report...';
+        });
+        on('report_chunk', (data) => {
+            // Show the report as it is written instead of waiting for the end
+            if (!reportStarted) {
+                reportStarted = true;
+                this.showResults({ report: '' });
+            }
+            document.getElementById('reportContent').textContent += data.text;
+        });
+        on('job_completed', async () => {
+            this.closeEventStream();
+            const response = await fetch(`/api/research/${researchId}`);
+            this.showResults(await response.json());
+            this.loadResearchHistory();
+        });
+        on('job_failed', (data) => {
+            this.closeEventStream();
+            this.showError(data.error || 'Research failed');
+        });
+
+        source.onerror = () => {
+            // The browser retries dropped connections itself; only fall back once it gives up
+            if (source.readyState === EventSource.CLOSED) {
+                this.closeEventStream();
+                this.pollResearchStatus();
+            }
+        };
+    }
+
+    closeEventStream() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
+    }
+
     async pollResearchStatus() {
         if (!this.currentResearchId) return;
 
         try {
-            const response = await fetch(`/api/research/${this.currentResearchId}`);
+            // Only what the progress view needs; unchanged polls come back as 304s
+            const response = await fetch(`/api/research/${this.currentResearchId}?fields=${POLL_FIELDS}`);
             const status = await response.json();
 
             if (status.status === 'completed') {
-                this.showResults(status);
+                const full = await fetch(`/api/research/${this.currentResearchId}`);
+                this.showResults(await full.json());
                 this.loadResearchHistory();
             } else if (status.status === 'error') {
                 this.showError(status.error);
@@ -104,14 +193,19 @@ class ResearchApp {
     }
 
     updateProgress(status) {
-        // Simulate progress (in real app, you might have actual progress indicators)
         const progressBar = document.querySelector('.progress-fill');
         const progressText = document.getElementById('progressText');
         
-        // Animate progress bar
-        const currentWidth = parseInt(progressBar.style.width) || 0;
-        const newWidth = Math.min(currentWidth + 10, 90);
-        progressBar.style.width = newWidth + '%';
+        if (status.status === 'queued' && status.queue_position) {
+            const eta = status.estimated_start
+                ? `, estimated start ${new Date(status.estimated_start).toLocaleTimeString()}`
+                : '';
+            progressText.textContent = `Queued (position ${status.queue_position}${eta})`;
+            return;
+        }
+
+        // Real progress reported by the server (questions finished so far)
+        progressBar.style.width = (status.progress || 0) + '%';
         
         progressText.textContent = 'Research in progress...';
     }
@@ -133,18 +227,12 @@ class ResearchApp {
         if (!this.currentResearchId) return;
 
         try {
-            const response = await fetch(`/api/research/${this.currentResearchId}/report`);
-            const data = await response.json();
-
-            // Create download link
-            const blob = new Blob([data.report], { type: 'text/plain' });
-            const url = window.URL.createObjectURL(blob);
+            // The server streams the report as a markdown attachment
             const a = document.createElement('a');
-            a.href = url;
-            a.download = `research_report_${data.topic.replace(/\s+/g, '_')}.txt`;
+            a.href = `/api/research/${this.currentResearchId}/report?format=markdown`;
+            a.download = '';
             document.body.appendChild(a);
             a.click();
-            window.URL.revokeObjectURL(url);
             document.body.removeChild(a);
 
         } catch (error) {
@@ -153,6 +241,7 @@ class ResearchApp {
     }
 
     showResearchForm() {
+        this.closeEventStream();
         this.hideAllSections();
         document.getElementById('researchForm').reset();
     }
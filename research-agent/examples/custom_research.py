@@ -5,10 +5,10 @@ Custom research example that demonstrates how to extend the basic functionality.
 
 import sys
 import os
-import json
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.agents.research_agent import ResearchAgent
+from src.utils.checkpoint import get_checkpoint_store
 
 def custom_research_with_savepoints():
     """Example with intermediate save points and custom processing."""
@@ -26,20 +26,10 @@ def custom_research_with_savepoints():
     
     print(f"🔬 Research Topic: {topic}")
     
-    # Research step by step with save points
-    all_results = {}
-    
-    for i, question in enumerate(questions, 1):
-        print(f"\n🔍 Researching question {i}/{len(questions)}: {question}")
-        
-        results = agent.conduct_research(topic, [question])
-        all_results[question] = results[question]
-        
-        # Save intermediate results
-        with open(f"intermediate_results_q{i}.json", "w", encoding="utf-8") as f:
-            json.dump({question: results[question]}, f, indent=2)
-        
-        print(f"   ✅ Question {i} completed and saved")
+    # Every answered question is checkpointed under this id; if the run dies
+    # (rate limit, Ctrl+C), running the example again skips finished questions
+    research_id = "quantum_computing_example"
+    all_results = agent.conduct_research(topic, questions, research_id=research_id)
     
     # Generate final report
     print("\n📊 Generating comprehensive report...")
@@ -54,7 +44,11 @@ def custom_research_with_savepoints():
     
     print(f"✅ All research completed!")
     print(f"📄 Final report saved to: {output_file}")
-    print(f"📁 Intermediate results saved for each question")
+    
+    # The report is saved, so the checkpoint is no longer needed
+    checkpoints = get_checkpoint_store()
+    if checkpoints is not None:
+        checkpoints.delete(research_id)
 
 if __name__ == "__main__":
     custom_research_with_savepoints()
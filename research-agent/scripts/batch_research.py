@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Run many research topics in one process under a single Gemini rate budget.
+
+Input is JSONL ({"id": ..., "topic": ..., "questions": [...]}) or CSV with a
+`topic` column and either a `questions` column ("|"-separated) or one
+`question` per row (rows are grouped by id/topic). Each finished item is
+appended to the output JSONL as soon as it completes; items already in the
+output as completed are skipped on restart; failed, partial and
+half-finished items resume from their per-question checkpoints.
+
+  python scripts/batch_research.py topics.jsonl --output results.jsonl --workers 4
+"""
+
+import sys
+import os
+import csv
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.agent_pool import AgentPool
+from src.agents.research_agent import ResearchAgent
+from src.utils.checkpoint import get_checkpoint_store
+from src.utils.config import Config
+from src.utils.rate_limiter import get_shared_rate_limiter
+
+def item_id(topic, questions):
+    """Stable id for items that do not bring their own"""
+    return hashlib.sha1(json.dumps([topic, questions]).encode("utf-8")).hexdigest()[:12]
+
+def load_items(path):
+    """Read research items from JSONL or CSV"""
+    items = []
+    if path.endswith(".csv"):
+        grouped = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                topic = (row.get("topic") or "").strip()
+                if not topic:
+                    continue
+                key = (row.get("id") or "").strip() or topic
+                item = grouped.setdefault(key, {"id": row.get("id") or None, "topic": topic, "questions": []})
+                if row.get("questions"):
+                    item["questions"].extend(q.strip() for q in row["questions"].split("|") if q.strip())
+                if row.get("question", "").strip():
+                    item["questions"].append(row["question"].strip())
+        items = list(grouped.values())
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ Skipping line {line_no}: {e}")
+
+    valid = []
+    for item in items:
+        topic = (item.get("topic") or "").strip()
+        questions = [q.strip() for q in item.get("questions", []) if q and q.strip()]
+        if not topic or not questions:
+            print(f"⚠️ Skipping item without topic/questions: {item.get('id') or topic!r}")
+            continue
+        valid.append({"id": str(item.get("id") or item_id(topic, questions)), "topic": topic, "questions": questions})
+    return valid
+
+def load_done(output_path):
+    """Ids that already have a successful record in the output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a torn last line from an interrupted run
+            if record.get("status") == "completed":
+                done.add(record["id"])
+    return done
+
+class ResultSink:
+    """Appends one JSON line per finished item (and optionally a report file), flushed immediately"""
+
+    def __init__(self, output_path, report_dir=None):
+        self.output_path = output_path
+        self.report_dir = report_dir
+        self._lock = threading.Lock()
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+
+    def write(self, record):
+        with self._lock:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if self.report_dir and record.get("report"):
+                with open(os.path.join(self.report_dir, f"{record['id']}.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# {record['topic']}\n\n{record['report']}\n")
+
+def run_item(pool, item, question_concurrency):
+    start = time.monotonic()
+    research_id = f"batch_{item['id']}"
+    record = {"id": item["id"], "topic": item["topic"], "questions": item["questions"]}
+    try:
+        with pool.checkout() as agent:
+            results = agent.conduct_research(
+                item["topic"], item["questions"], concurrency=question_concurrency, research_id=research_id
+            )
+            # Per-question errors come back as answers; such an item is not done (e.g. the daily
+            # quota ran out), so keep its checkpoint and let the next run redo only those questions
+            failed = [q for q, answer in results.items() if str(answer).startswith("Research failed")]
+            if failed:
+                record.update(status="error" if len(failed) == len(results) else "partial",
+                              results=results, failed_questions=failed,
+                              error=f"{len(failed)} of {len(results)} questions failed")
+                record["seconds"] = round(time.monotonic() - start, 2)
+                return record
+            record["report"] = agent.generate_report(results, item["topic"])
+            agent.record_research(research_id, item["topic"], results, record["report"])
+        record.update(status="completed", results=results)
+        checkpoints = get_checkpoint_store()
+        if checkpoints is not None:
+            checkpoints.delete(research_id)
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    record["seconds"] = round(time.monotonic() - start, 2)
+    return record
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch research over many topics")
+    parser.add_argument("input", help="JSONL or CSV file of research items")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL sink for finished items")
+    parser.add_argument("--report-dir", help="Also write each report to <dir>/<id>.md")
+    parser.add_argument("--workers", type=int, default=Config.AGENT_POOL_SIZE, help="Items researched at once")
+    parser.add_argument("--question-concurrency", type=int, default=1,
+                        help="Questions researched at once within an item")
+    parser.add_argument("--limit", type=int, help="Only run the first N pending items")
+    parser.add_argument("--fake-llm", action="store_true", help="Use the offline fake model (dry run)")
+    args = parser.parse_args()
+
+    items = load_items(args.input)
+    done = load_done(args.output)
+    pending = [item for item in items if item["id"] not in done]
+    if args.limit:
+        pending = pending[:args.limit]
+    print(f"📚 {len(items)} items, {len(items) - len(pending)} already done, {len(pending)} to run "
+          f"with {args.workers} workers")
+    if not pending:
+        return
+
+    if args.fake_llm:
+        from src.utils.fake_llm import FakeChatModel
+        factory = lambda: ResearchAgent(llm=FakeChatModel())
+    else:
+        factory = ResearchAgent
+    # One pool and one process-wide rate limiter: every item shares the same Gemini budget
+    pool = AgentPool(args.workers, factory)
+    pool.warm()
+    sink = ResultSink(args.output, args.report_dir)
+
+    start = time.monotonic()
+    finished = failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_item, pool, item, args.question_concurrency) for item in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            sink.write(record)
+            finished += 1
+            failed += record["status"] != "completed"
+
+            elapsed = time.monotonic() - start
+            rate = finished / elapsed
+            eta = (len(pending) - finished) / rate if rate else 0
+            icon = {"completed": "✅", "partial": "⚠️"}.get(record["status"], "❌")
+            print(f"{icon} [{finished}/{len(pending)}] {record['id']} ({record['seconds']}s) | "
+                  f"{rate * 60:.1f} items/min | ETA {format_duration(eta)}", flush=True)
+
+    elapsed = time.monotonic() - start
+    print("-" * 60)
+    print(f"🏁 {finished - failed} completed, {failed} failed or partial (rerun to resume them) in {format_duration(elapsed)} "
+          f"({finished / elapsed * 60:.1f} items/min)")
+    quota = get_shared_rate_limiter().stats()
+    print(f"⏳ Time spent waiting on the shared rate limit: {quota['total_wait_seconds']:.1f}s")
+    if quota["requests_per_day"]["limit"]:
+        print(f"📅 Daily requests: {quota['requests_per_day']['used']}/{quota['requests_per_day']['limit']} used")
+    print(f"💾 Results in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Measure per-job setup latency and allocations: fresh ResearchAgent vs AgentPool checkout.
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+import statistics
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Building a Gemini client needs a key but makes no network calls
+os.environ.setdefault("GEMINI_API_KEY", "benchmark-placeholder-key")
+
+from src.agents.agent_pool import AgentPool
+from src.agents.research_agent import ResearchAgent
+
+def measure(label, setup_job, jobs):
+    """Time and trace allocations of `jobs` calls to setup_job"""
+    latencies = []
+    tracemalloc.start()
+    for _ in range(jobs):
+        start = time.perf_counter()
+        setup_job()
+        latencies.append((time.perf_counter() - start) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    allocated = sum(stat.size for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    print(f"📊 {label}")
+    print(f"   mean setup: {statistics.mean(latencies):.2f} ms   "
+          f"p95: {sorted(latencies)[int(len(latencies) * 0.95) - 1]:.2f} ms")
+    print(f"   peak traced memory: {peak / 1024:.0f} KiB   retained: {allocated / 1024:.0f} KiB")
+    return statistics.mean(latencies)
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"🧪 Per-job setup cost over {jobs} jobs")
+    print("-" * 60)
+
+    fresh = measure("Fresh ResearchAgent() per job", ResearchAgent, jobs)
+
+    pool = AgentPool(size=2)
+    warm_start = time.perf_counter()
+    pool.warm()
+    print(f"🔥 Pool warm-up (2 agents, paid once per worker): "
+          f"{(time.perf_counter() - warm_start) * 1000:.1f} ms")
+
+    def pooled_job():
+        with pool.checkout():
+            pass
+
+    pooled = measure("AgentPool.checkout() per job", pooled_job, jobs)
+
+    print("-" * 60)
+    print(f"✅ Pool saves {fresh - pooled:.2f} ms of setup per job ({fresh / max(pooled, 1e-6):.0f}x faster)")
+    print(f"📈 Pool stats: {pool.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Measure HTML-to-text extraction throughput (documents/sec and per core).
+
+Uses a directory of saved pages when given one, otherwise a synthetic corpus:
+  python scripts/benchmark_extraction.py [--corpus saved_pages/] [--workers 4] [--json out.json]
+"""
+
+import sys
+import os
+import glob
+import json
+import time
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.mock_search_server import build_page
+from src.tools.html_extract import HTMLExtractor, extract_text
+
+def load_corpus(directory, count):
+    """(url, html) pairs from saved *.html files, or synthetic pages of mixed size"""
+    if directory:
+        paths = sorted(glob.glob(os.path.join(directory, "**", "*.htm*"), recursive=True))
+        pages = []
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((f"file://{os.path.abspath(path)}", f.read()))
+        return pages
+    sizes = [4, 20, 60, 200]
+    return [(f"http://corpus.local/{i}", build_page(i, sizes[i % len(sizes)])) for i in range(count)]
+
+def run(label, extract, pages, cores):
+    start = time.perf_counter()
+    texts = extract(pages)
+    elapsed = time.perf_counter() - start
+    rate = len(pages) / elapsed
+    mb = sum(len(html) for _, html in pages) / 1e6
+    print(f"📊 {label}: {rate:.1f} docs/s ({rate / cores:.1f} per core), "
+          f"{mb / elapsed:.1f} MB/s, {sum(len(t) for t in texts) / len(texts):.0f} chars/doc")
+    return {"docs_per_second": round(rate, 1), "docs_per_second_per_core": round(rate / cores, 1),
+            "seconds": round(elapsed, 3)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML-to-text extraction")
+    parser.add_argument("--corpus", help="Directory of saved HTML pages")
+    parser.add_argument("--docs", type=int, default=400, help="Synthetic corpus size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-chars", type=int, default=20000)
+    parser.add_argument("--json", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus, args.docs)
+    if not pages:
+        sys.exit(f"❌ No HTML files found in {args.corpus}")
+    print(f"🧪 {len(pages)} documents, {sum(len(h) for _, h in pages) / 1e6:.1f} MB, {args.workers} workers")
+    print("-" * 60)
+
+    results = {"documents": len(pages), "workers": args.workers}
+    results["inline"] = run("Inline, 1 core", lambda p: [extract_text(h, args.max_chars) for _, h in p], pages, 1)
+
+    try:
+        from bs4 import BeautifulSoup
+        results["beautifulsoup"] = run(
+            "BeautifulSoup get_text, 1 core",
+            lambda p: [BeautifulSoup(h, "html.parser").get_text(" ", strip=True)[:args.max_chars] for _, h in p],
+            pages, 1)
+    except ImportError:
+        print("ℹ️ beautifulsoup4 not installed, skipping baseline")
+
+    extractor = HTMLExtractor(workers=args.workers, max_chars=args.max_chars, cache_entries=len(pages))
+    extractor.extract_many(pages[:args.workers])  # start the worker processes outside the timing
+    cores = min(args.workers, os.cpu_count() or 1)
+    results["pool"] = run(f"Process pool, {args.workers} workers", extractor.extract_many, pages, cores)
+    results["cached"] = run("Process pool, cache warm", extractor.extract_many, pages, cores)
+    extractor.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Deterministic offline benchmark of the research pipeline (no API key or network).
+
+Runs conduct_research + generate_report against FakeChatModel and the mock
+WebSearchTool for each engine and concurrency level, and reports end-to-end
+and per-stage latency, throughput, LLM calls per question, prompt tokens and
+peak traced memory. Results are JSON so CI can diff them:
+
+  python scripts/benchmark_pipeline.py --json bench.json
+  python scripts/benchmark_pipeline.py --compare bench.json   # exits 1 on regression
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Isolate the benchmark from caches, checkpoints, quotas and real backends
+os.environ.setdefault("RESEARCH_DATA_DIR", tempfile.mkdtemp(prefix="research-bench-"))
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["SEARCH_CACHE_TTL"] = "0"
+os.environ["SEARCH_BACKEND"] = "mock"
+os.environ["CHECKPOINTS_ENABLED"] = "false"
+os.environ["RESEARCH_INDEX_ENABLED"] = "false"
+os.environ["GEMINI_REQUESTS_PER_MINUTE"] = "1000000"
+os.environ["GEMINI_TOKENS_PER_MINUTE"] = "1000000000"
+os.environ["GEMINI_REQUESTS_PER_DAY"] = "0"
+
+from src.agents.research_agent import ResearchAgent
+from src.utils.config import Config
+from src.utils.fake_llm import FakeChatModel
+
+TOPIC = "Renewable Energy Storage"
+
+def run_once(args, engine, concurrency, trace_memory=False):
+    """One full pipeline run; returns its metrics"""
+    Config.RESEARCH_ENGINE = engine
+    llm = FakeChatModel(latency=args.latency, reply_tokens=args.reply_tokens,
+                        failure_rate=args.failure_rate, retry_after=0.01, seed=args.seed)
+    agent = ResearchAgent(llm=llm)
+    questions = [f"Benchmark question {i + 1} about {TOPIC.lower()}?" for i in range(args.questions)]
+
+    if trace_memory:
+        tracemalloc.start()
+    output = io.StringIO()
+    with redirect_stdout(output if not args.verbose else sys.stdout):
+        start = time.perf_counter()
+        results = agent.conduct_research(TOPIC, questions, concurrency=concurrency)
+        research_done = time.perf_counter()
+        agent.generate_report(results, TOPIC)
+        report_done = time.perf_counter()
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    prompt_stats = agent.get_prompt_stats()
+    report_stats = agent.get_report_stats()
+    return {
+        "end_to_end_seconds": report_done - start,
+        "research_seconds": research_done - start,
+        "report_seconds": report_done - research_done,
+        "llm_calls": llm.calls,
+        "research_llm_steps": prompt_stats["llm_steps"],
+        "report_llm_calls": report_stats.get("llm_calls", 0),
+        "research_prompt_tokens": prompt_stats["total_prompt_tokens"],
+        "max_prompt_tokens": max(prompt_stats["max_prompt_tokens"], report_stats.get("max_prompt_tokens", 0)),
+        "failed_questions": sum(answer.startswith("Research failed") for answer in results.values()),
+        "retries": agent.get_llm_stats().get("retries", 0),
+        "node_profile": agent.get_engine_profile(),
+        "evidence": agent.get_evidence_stats(),
+        "peak_memory_kb": round(peak / 1024),
+    }
+
+def benchmark(args, engine, concurrency):
+    timed = [run_once(args, engine, concurrency) for _ in range(args.repeat)]
+    traced = run_once(args, engine, concurrency, trace_memory=True)
+    median = lambda key: round(statistics.median(run[key] for run in timed), 4)
+    last = timed[-1]
+    return {
+        "engine": engine,
+        "concurrency": concurrency,
+        "end_to_end_seconds": median("end_to_end_seconds"),
+        "research_seconds": median("research_seconds"),
+        "report_seconds": median("report_seconds"),
+        "questions_per_second": round(args.questions / median("research_seconds"), 3),
+        "llm_calls": last["llm_calls"],
+        "llm_calls_per_question": round(last["research_llm_steps"] / args.questions, 3),
+        "report_llm_calls": last["report_llm_calls"],
+        "research_prompt_tokens": last["research_prompt_tokens"],
+        "max_prompt_tokens": last["max_prompt_tokens"],
+        "failed_questions": last["failed_questions"],
+        "retries": last["retries"],
+        "peak_memory_kb": traced["peak_memory_kb"],
+        "node_profile": last["node_profile"],
+        "evidence": last["evidence"],
+    }
+
+def compare(runs, baseline_path, tolerance):
+    """Print deltas against a baseline file; returns the list of regressions"""
+    with open(baseline_path) as f:
+        baseline = {(run["engine"], run["concurrency"]): run for run in json.load(f)["runs"]}
+    regressions = []
+    checks = [("end_to_end_seconds", tolerance), ("peak_memory_kb", tolerance),
+              ("llm_calls_per_question", 0.0), ("max_prompt_tokens", 0.0)]
+    for run in runs:
+        base = baseline.get((run["engine"], run["concurrency"]))
+        if base is None:
+            continue
+        for metric, allowed in checks:
+            old, new = base.get(metric), run.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + allowed) + 1e-9:
+                regressions.append(f"{run['engine']}@{run['concurrency']} {metric}: {old} -> {new}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline research pipeline benchmark")
+    parser.add_argument("--questions", type=int, default=6)
+    parser.add_argument("--concurrency", default="1,3", help="Comma-separated concurrency levels")
+    parser.add_argument("--engines", default="react,graph", help="Comma-separated engines")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency per call (s)")
+    parser.add_argument("--reply-tokens", type=int, default=150, help="Fake LLM answer size")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of calls that 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per configuration (median kept)")
+    parser.add_argument("--json", help="Write results to this path")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/memory growth")
+    parser.add_argument("--verbose", action="store_true", help="Show agent output")
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    print(f"🧪 {args.questions} questions, latency {args.latency}s, {args.reply_tokens} reply tokens, "
+          f"failure rate {args.failure_rate}")
+    print(f"{'engine':<8}{'conc':>5}{'e2e s':>9}{'research':>10}{'report':>9}{'q/s':>7}"
+          f"{'calls/q':>9}{'max prompt':>12}{'peak KiB':>10}")
+
+    runs = []
+    for engine in engines:
+        for concurrency in levels:
+            run = benchmark(args, engine, concurrency)
+            runs.append(run)
+            print(f"{engine:<8}{concurrency:>5}{run['end_to_end_seconds']:>9.3f}{run['research_seconds']:>10.3f}"
+                  f"{run['report_seconds']:>9.3f}{run['questions_per_second']:>7.2f}"
+                  f"{run['llm_calls_per_question']:>9.2f}{run['max_prompt_tokens']:>12}{run['peak_memory_kb']:>10}")
+
+    result = {
+        "meta": {
+            "questions": args.questions, "latency": args.latency, "reply_tokens": args.reply_tokens,
+            "failure_rate": args.failure_rate, "seed": args.seed, "repeat": args.repeat,
+            "python": platform.python_version(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "runs": runs,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+    if args.compare:
+        regressions = compare(runs, args.compare, args.tolerance)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
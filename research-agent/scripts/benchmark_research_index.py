@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Measure research index insert throughput, cold load time and query latency.
+
+Builds a synthetic index of --jobs past research runs in a temp directory:
+  python scripts/benchmark_research_index.py --jobs 100000 [--json out.json]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.research_index import ResearchIndex
+
+SUBJECTS = ["solar", "wind", "battery", "hydrogen", "geothermal", "nuclear", "grid", "carbon capture",
+            "heat pump", "offshore wind", "biofuel", "tidal", "perovskite", "lithium", "smart meter"]
+ASPECTS = ["benefits", "costs", "environmental impact", "policy", "adoption", "efficiency", "storage",
+           "recycling", "jobs", "supply chain", "safety", "financing"]
+
+def synthetic_job(rng):
+    subject = rng.choice(SUBJECTS)
+    topic = f"{subject} {rng.choice(ASPECTS)} {rng.randint(1, 999)}"
+    questions = [f"What are the {rng.choice(ASPECTS)} of {subject} energy in region {rng.randint(1, 50)}?"
+                 for _ in range(rng.randint(3, 6))]
+    return topic, {q: f"Findings about {q} " * 8 for q in questions}
+
+def main():
+    parser = argparse.ArgumentParser(description="Research index benchmark")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--json", help="Write results to this path")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    path = os.path.join(tempfile.mkdtemp(prefix="research-index-"), "index.db")
+    index = ResearchIndex(path, dim=args.dim)
+
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        topic, results = synthetic_job(rng)
+        index.add(f"job_{i}", topic, results)
+    insert_seconds = time.perf_counter() - start
+    print(f"📥 Indexed {args.jobs} jobs in {insert_seconds:.1f}s ({args.jobs / insert_seconds:.0f} jobs/s)")
+
+    # A fresh process has to load every vector once
+    start = time.perf_counter()
+    cold = ResearchIndex(path, dim=args.dim)
+    stats = cold.stats()
+    load_seconds = time.perf_counter() - start
+    print(f"📂 Cold load: {load_seconds:.2f}s, {stats['matrix_mb']} MB matrix")
+
+    search_ms, match_ms = [], []
+    for _ in range(args.queries):
+        topic, results = synthetic_job(rng)
+        start = time.perf_counter()
+        cold.search(topic, limit=10)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        cold.match_answers(topic, list(results), threshold=0.9)
+        match_ms.append((time.perf_counter() - start) * 1000)
+
+    pick = lambda values, q: round(sorted(values)[min(len(values) - 1, int(q * len(values)))], 2)
+    result = {
+        "jobs": args.jobs,
+        "dim": args.dim,
+        "inserts_per_second": round(args.jobs / insert_seconds),
+        "cold_load_seconds": round(load_seconds, 2),
+        "matrix_mb": stats["matrix_mb"],
+        "search_ms_p50": pick(search_ms, 0.5),
+        "search_ms_p99": pick(search_ms, 0.99),
+        "match_ms_p50": pick(match_ms, 0.5),
+        "match_ms_p99": pick(match_ms, 0.99),
+        "search_ms_mean": round(statistics.mean(search_ms), 2),
+    }
+    print(f"🔎 search p50 {result['search_ms_p50']}ms p99 {result['search_ms_p99']}ms | "
+          f"match_answers p50 {result['match_ms_p50']}ms p99 {result['match_ms_p99']}ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
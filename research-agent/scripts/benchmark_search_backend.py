@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measure HTTPSearchBackend throughput against the local mock search server.
+
+  python scripts/benchmark_search_backend.py [--queries 40] [--concurrency 8] [--json out.json]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.mock_search_server import start_mock_server
+from src.tools.http_backend import HTTPSearchBackend
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pooled HTTP search backend")
+    parser.add_argument("--queries", type=int, default=40, help="Distinct queries to run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent searches")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Backend page-fetch pool size")
+    parser.add_argument("--per-host", type=int, default=8, help="Backend per-host limit")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server latency (s)")
+    parser.add_argument("--page-kb", type=int, default=20, help="Mock page size")
+    parser.add_argument("--json", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(latency=args.latency, page_kb=args.page_kb)
+    backend = HTTPSearchBackend(
+        search_url=f"{base_url}/search",
+        academic_url=f"{base_url}/api/query",
+        max_concurrency=args.max_concurrency,
+        per_host=args.per_host,
+    )
+    queries = [f"renewable energy topic {i}" for i in range(args.queries)]
+
+    print(f"🧪 {args.queries} searches, {args.concurrency} concurrent, against {base_url}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(backend.search_web, queries))
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    stats = backend.stats()
+    summary = {
+        "queries": args.queries,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "results": sum(len(r) for r in results),
+        "pages_per_second": round(stats["pages_fetched"] / elapsed, 1),
+        **stats,
+    }
+
+    print("-" * 60)
+    print(f"📊 {summary['pages_fetched']} pages in {elapsed:.2f}s "
+          f"({summary['pages_per_second']} pages/s, {stats['fetch_failures']} failures)")
+    print(f"   fetch latency p50: {stats['p50_fetch_ms']} ms   p99: {stats['p99_fetch_ms']} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Load test one web worker process in threaded (Flask) or async (ASGI) mode.
+
+Starts the server on a free port with the offline fake model (every LLM call
+waits --latency seconds, like a network round trip), submits --jobs research
+jobs at once and has --pollers clients poll job status until every job has
+finished. Reports job throughput and completion times, status request rate
+and latency, and the server's peak memory and thread count:
+
+  python scripts/load_test.py --mode both --jobs 200 --pollers 50 [--json out.json]
+
+Needs httpx for the client; the async mode needs Quart and Hypercorn.
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+try:
+    import httpx
+except ImportError:
+    sys.exit("❌ load_test.py needs httpx (pip install httpx)")
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_env(args, data_dir):
+    """Fake model, mock search, no caches or quotas: only the serving model is measured"""
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY": str(args.latency),
+        "SEARCH_BACKEND": "mock",
+        "LLM_CACHE_ENABLED": "false",
+        "CHECKPOINTS_ENABLED": "false",
+        "RESEARCH_INDEX_ENABLED": "false",
+        "GEMINI_REQUESTS_PER_MINUTE": "100000000",
+        "GEMINI_TOKENS_PER_MINUTE": "100000000000",
+        "GEMINI_REQUESTS_PER_DAY": "0",
+        "QUOTA_STORE_PATH": "",
+        "RESEARCH_DATA_DIR": data_dir,
+        "AGENT_VERBOSE": "false",
+        "RESEARCH_CONCURRENCY": str(args.question_concurrency),
+        "JOB_QUEUE_SIZE": str(args.jobs + 10),
+        # As many jobs in flight as the mode allows: one thread (and agent) each, or one task each
+        "JOB_WORKERS": str(args.workers),
+        "AGENT_POOL_SIZE": str(args.workers),
+        "ASYNC_JOB_WORKERS": str(args.workers),
+    })
+    return env
+
+def server_command(mode, port):
+    if mode == "async":
+        return [sys.executable, "-m", "hypercorn", "asgi:app", "--bind", f"127.0.0.1:{port}", "--workers", "1"]
+    if shutil.which("gunicorn"):
+        # Same shape as run_production.sh, one worker
+        return ["gunicorn", "-w", "1", "--threads", "16", "-b", f"127.0.0.1:{port}", "app:app"]
+    return [sys.executable, "-c",
+            f"from werkzeug.serving import run_simple; import app; "
+            f"run_simple('127.0.0.1', {port}, app.app, threaded=True)"]
+
+def process_status(pid):
+    """(RSS MB, thread count) of a process and its children (server workers) from /proc"""
+    rss_kb, threads = 0, 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                fields = dict(line.split(":", 1) for line in f if ":" in line)
+            rss_kb += int(fields["VmRSS"].split()[0])
+            threads += int(fields["Threads"])
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, KeyError, ValueError):
+            continue
+    return rss_kb / 1024, threads
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+async def wait_ready(client, base, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            if (await client.get(f"{base}/api/queue")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not come up in time")
+
+async def drive(args, base, pid):
+    limits = httpx.Limits(max_connections=args.pollers + 64, max_keepalive_connections=args.pollers + 64)
+    async with httpx.AsyncClient(timeout=args.request_timeout, limits=limits) as client:
+        peak = {"rss_mb": 0.0, "threads": 0}
+        sampling = True
+
+        async def sample():
+            while sampling:
+                rss, threads = process_status(pid)
+                peak["rss_mb"] = max(peak["rss_mb"], rss)
+                peak["threads"] = max(peak["threads"], threads)
+                await asyncio.sleep(0.25)
+
+        sampler = asyncio.create_task(sample())
+        idle_rss, idle_threads = process_status(pid)
+        start = time.monotonic()
+
+        async def submit(i):
+            body = {"topic": f"Load test topic {i}",
+                    "questions": [f"Question {q + 1} of job {i}?" for q in range(args.questions)]}
+            try:
+                response = await client.post(f"{base}/api/research", json=body)
+            except httpx.HTTPError:
+                return None
+            return response.json().get("research_id") if response.status_code == 200 else None
+
+        ids = [research_id for research_id in await asyncio.gather(*(submit(i) for i in range(args.jobs)))
+               if research_id]
+        submitted = time.monotonic() - start
+        finished = {}
+        latencies, errors = [], 0
+
+        async def poll(worker):
+            nonlocal errors
+            position = worker
+            while len(finished) < len(ids):
+                pending = [research_id for research_id in ids if research_id not in finished]
+                if not pending:
+                    break
+                research_id = pending[position % len(pending)]
+                position += 1
+                sent = time.monotonic()
+                try:
+                    response = await client.get(f"{base}/api/research/{research_id}",
+                                                params={"fields": "status,progress"})
+                    status = response.json().get("status")
+                except (httpx.HTTPError, ValueError):
+                    errors += 1
+                    continue
+                latencies.append(time.monotonic() - sent)
+                if status in ("completed", "error") and research_id not in finished:
+                    finished[research_id] = (status, time.monotonic() - start)
+                if args.poll_interval:
+                    await asyncio.sleep(args.poll_interval)
+
+        await asyncio.wait_for(asyncio.gather(*(poll(w) for w in range(args.pollers))), args.max_seconds)
+        wall = time.monotonic() - start
+        sampling = False
+        await sampler
+
+    done_times = [seconds for _, seconds in finished.values()]
+    return {
+        "jobs_submitted": len(ids),
+        "jobs_rejected": args.jobs - len(ids),
+        "jobs_completed": sum(status == "completed" for status, _ in finished.values()),
+        "jobs_failed": sum(status == "error" for status, _ in finished.values()),
+        "submit_seconds": round(submitted, 2),
+        "wall_seconds": round(wall, 2),
+        "jobs_per_second": round(len(finished) / wall, 2) if wall else 0.0,
+        "job_done_p50_seconds": round(percentile(done_times, 0.5), 2),
+        "job_done_p99_seconds": round(percentile(done_times, 0.99), 2),
+        "status_requests": len(latencies),
+        "status_errors": errors,
+        "status_requests_per_second": round(len(latencies) / wall, 1) if wall else 0.0,
+        "status_p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "status_p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "idle_rss_mb": round(idle_rss, 1),
+        "peak_rss_mb": round(peak["rss_mb"], 1),
+        "idle_threads": idle_threads,
+        "peak_threads": peak["threads"],
+    }
+
+def run_mode(args, mode):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    data_dir = tempfile.mkdtemp(prefix=f"research-load-{mode}-")
+    log = open(os.path.join(data_dir, "server.log"), "w")
+    print(f"🚦 {mode}: starting server on port {port} ({args.workers} job slots)")
+    process = subprocess.Popen(server_command(mode, port), cwd=APP_DIR, env=server_env(args, data_dir),
+                               stdout=log, stderr=subprocess.STDOUT)
+    try:
+        async def main():
+            async with httpx.AsyncClient(timeout=5) as client:
+                started = time.monotonic()
+                await wait_ready(client, base, process, args.startup_timeout)
+                startup = time.monotonic() - started
+            result = await drive(args, base, process.pid)
+            return {"mode": mode, "startup_seconds": round(startup, 2), **result}
+        result = asyncio.run(main())
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        log.close()
+    print(f"   {result['jobs_completed']}/{result['jobs_submitted']} jobs in {result['wall_seconds']}s "
+          f"({result['jobs_per_second']} jobs/s, p50 done {result['job_done_p50_seconds']}s) | "
+          f"{result['status_requests_per_second']} status req/s, p50 {result['status_p50_ms']}ms "
+          f"p99 {result['status_p99_ms']}ms | peak {result['peak_rss_mb']} MB, {result['peak_threads']} threads")
+    print(f"   server log: {os.path.join(data_dir, 'server.log')}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Threaded vs async serving load test")
+    parser.add_argument("--mode", choices=["threaded", "async", "both"], default="both")
+    parser.add_argument("--jobs", type=int, default=100, help="Jobs submitted at once")
+    parser.add_argument("--questions", type=int, default=3, help="Questions per job")
+    parser.add_argument("--question-concurrency", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=200,
+                        help="Jobs run at once (threads in threaded mode, tasks in async mode)")
+    parser.add_argument("--pollers", type=int, default=20, help="Concurrent status polling clients")
+    parser.add_argument("--poll-interval", type=float, default=0.0, help="Pause between a poller's requests")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake LLM latency per call (seconds)")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--max-seconds", type=float, default=900.0)
+    parser.add_argument("--json", help="Write results to this path")
+    args = parser.parse_args()
+
+    modes = ["threaded", "async"] if args.mode == "both" else [args.mode]
+    results = [run_mode(args, mode) for mode in modes]
+
+    if len(results) == 2:
+        threaded, asynchronous = results
+        ratio = lambda key: (asynchronous[key] / threaded[key]) if threaded[key] else float("inf")
+        print(f"📊 async vs threaded: {ratio('jobs_per_second'):.2f}x jobs/s, "
+              f"{ratio('status_requests_per_second'):.2f}x status req/s, "
+              f"{ratio('peak_rss_mb'):.2f}x peak memory, {ratio('peak_threads'):.2f}x threads")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
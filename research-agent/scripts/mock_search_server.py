@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the search APIs and result pages (no network needed).
+
+Serves:
+  /search?q=...&format=json       SearxNG-style JSON results
+  /api/query?search_query=...     arXiv-style Atom feed
+  /page/<n>                       an HTML result page
+
+Run standalone and point the agent at it:
+  python scripts/mock_search_server.py --port 8765
+  SEARCH_BACKEND=http SEARCH_API_URL=http://127.0.0.1:8765/search \\
+  ACADEMIC_API_URL=http://127.0.0.1:8765/api/query python src/main.py ...
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+from xml.sax.saxutils import escape
+
+PARAGRAPH = (
+    "Solar photovoltaic capacity continues to grow as module prices fall and "
+    "storage costs decline, while grid operators adapt to variable generation. "
+)
+
+def build_page(page_id, size_kb):
+    """Deterministic HTML page with boilerplate around ~size_kb of article text"""
+    body = "".join(f"<p>{PARAGRAPH}(page {page_id}, paragraph {i})</p>\n"
+                   for i in range(max(1, size_kb * 1024 // (len(PARAGRAPH) + 40))))
+    return (
+        "<!DOCTYPE html><html><head><title>Result page {0}</title>"
+        "<script>var tracking = 'x'.repeat(1000);</script><style>p {{ margin: 0 }}</style></head>"
+        "<body><nav><a href='/'>Home</a> | <a href='/about'>About</a></nav>"
+        "<article><h1>Result page {0}</h1>{1}</article>"
+        "<footer>Copyright Example Corp</footer></body></html>"
+    ).format(page_id, body)
+
+class MockSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like real servers
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type, status=200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        settings = self.server.settings
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if settings["latency"]:
+            # Jittered latency so percentiles mean something
+            time.sleep(settings["latency"] * random.uniform(0.5, 1.5))
+
+        if parts.path == "/search":
+            query = params.get("q", "")
+            base = f"http://{self.headers['Host']}"
+            results = [
+                {
+                    "title": f"{query.title()} - result {i}",
+                    "url": f"{base}/page/{abs(hash((query, i))) % 100000}",
+                    "content": f"Overview of {query} (result {i}).",
+                }
+                for i in range(settings["results"])
+            ]
+            self._send(json.dumps({"query": query, "results": results}), "application/json")
+        elif parts.path == "/api/query":
+            query = params.get("search_query", "").replace("all:", "")
+            count = int(params.get("max_results", 3))
+            entries = "".join(
+                "<entry><title>{0}: study {1}</title><summary>Findings about {0}.</summary>"
+                "<published>2024-01-0{2}T00:00:00Z</published>"
+                "<author><name>Researcher {1}</name></author>"
+                "<category term='physics.soc-ph'/><id>http://arxiv.org/abs/{3}</id></entry>".format(
+                    escape(query), i, i % 9 + 1, quote(f"2401.{i:05d}"))
+                for i in range(count)
+            )
+            self._send(f"<feed xmlns='http://www.w3.org/2005/Atom'>{entries}</feed>", "application/atom+xml")
+        elif parts.path.startswith("/page/"):
+            self._send(build_page(parts.path.rsplit("/", 1)[-1], settings["page_kb"]), "text/html; charset=utf-8")
+        else:
+            self._send("not found", "text/plain", status=404)
+
+def start_mock_server(port=0, latency=0.0, page_kb=20, results=5):
+    """Start the server on a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockSearchHandler)
+    server.daemon_threads = True
+    server.settings = {"latency": latency, "page_kb": page_kb, "results": results}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock search/HTML server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean response latency (s)")
+    parser.add_argument("--page-kb", type=int, default=20, help="Approximate HTML page size")
+    parser.add_argument("--results", type=int, default=5, help="Results per search")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, args.latency, args.page_kb, args.results)
+    print(f"🧪 Mock search server running at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
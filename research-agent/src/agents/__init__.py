@@ -3,5 +3,6 @@ Research Agent module for handling research tasks and workflows.
 """
 
 from .research_agent import ResearchAgent
+from .agent_pool import AgentPool
 
-__all__ = ['ResearchAgent']
+__all__ = ['ResearchAgent', 'AgentPool']
@@ -0,0 +1,91 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from src.agents.research_agent import ResearchAgent
+
+
+class AgentPool:
+    """Fixed-size pool of pre-built ResearchAgents checked out once per job.
+
+    Building an agent validates config, creates a Gemini client, rebuilds the
+    tool list and runs initialize_agent; the pool pays that cost once per
+    worker instead of once per job. Agents are reset on check-in so no
+    conversation state leaks from one job into the next.
+    """
+
+    def __init__(self, size: int, factory: Callable[[], ResearchAgent] = ResearchAgent):
+        self.size = size
+        self.factory = factory
+        # LIFO keeps recently used (warm) agents at the front
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+
+    def _create(self) -> Optional[ResearchAgent]:
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """Build every agent (or `count` of them) up front (call at worker start); returns agents created"""
+        created = 0
+        while count is None or created < count:
+            agent = self._create()
+            if agent is None:
+                return created
+            self._idle.put(agent)
+            created += 1
+        return created
+
+    def acquire(self, timeout: Optional[float] = None) -> ResearchAgent:
+        start = time.monotonic()
+        try:
+            agent = self._idle.get_nowait()
+        except queue.Empty:
+            # Build lazily if the pool was not (fully) warmed, else wait for a return
+            agent = self._create() or self._idle.get(timeout=timeout)
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += time.monotonic() - start
+        return agent
+
+    def release(self, agent: ResearchAgent):
+        try:
+            agent.reset()
+        except Exception as e:
+            # A broken agent is dropped; the pool will rebuild one on demand
+            print(f"⚠️ Discarding agent that failed to reset: {e}")
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(agent)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[ResearchAgent]:
+        agent = self.acquire(timeout=timeout)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self.checkouts,
+                "avg_wait_seconds": round(self.total_wait / self.checkouts, 4) if self.checkouts else 0.0,
+            }
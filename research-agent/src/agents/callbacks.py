@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from src.utils.llm import messages_to_text
+from src.utils.metrics import MetricsRegistry, get_metrics
+from src.utils.rate_limiter import estimate_tokens
+
+# Progress events are plain (type, data) pairs handed to a sink function
+EventSink = Callable[[str, Dict], None]
+
+
+def emit_event(sink: Optional[EventSink], event_type: str, **data):
+    """Send a progress event to the sink, never letting a sink failure break research"""
+    if sink is None:
+        return
+    try:
+        sink(event_type, data)
+    except Exception as e:
+        print(f"⚠️ Failed to publish {event_type} event: {e}")
+
+
+class ProgressCallbackHandler(BaseCallbackHandler):
+    """Turns LangChain tool callbacks into `tool_call` progress events for one question"""
+
+    # Cheap enough to call on the event loop in async runs instead of in an executor thread
+    run_inline = True
+
+    def __init__(self, sink: EventSink, question: str, index: int):
+        self.sink = sink
+        self.question = question
+        self.index = index
+        self._tool_runs = set()
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any):
+        self._tool_runs.add(kwargs.get("run_id"))
+        if kwargs.get("parent_run_id") in self._tool_runs:
+            # Tools that wrap other tools would otherwise report every call twice
+            return
+        emit_event(
+            self.sink, "tool_call",
+            index=self.index,
+            question=self.question,
+            tool=(serialized or {}).get("name", "tool"),
+            input=input_str[:200]
+        )
+
+
+class PromptSizeTracker(BaseCallbackHandler):
+    """Records the estimated prompt tokens of every LLM step of one question"""
+
+    run_inline = True
+
+    def __init__(self, log: List[Dict], lock: threading.Lock, index: int,
+                 sink: Optional[EventSink] = None):
+        self.log = log
+        self.lock = lock
+        self.index = index
+        self.sink = sink
+        self.step = 0
+
+    def _record(self, text: str):
+        self.step += 1
+        tokens = estimate_tokens(text)
+        with self.lock:
+            self.log.append({"index": self.index, "step": self.step, "prompt_tokens": tokens})
+        emit_event(self.sink, "llm_step", index=self.index, step=self.step, prompt_tokens=tokens)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], **kwargs: Any):
+        self._record(messages_to_text(messages[0]) if messages else "")
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any):
+        self._record(prompts[0] if prompts else "")
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Records latency and token counts of every LLM and tool run into the metrics registry.
+
+    One instance can be attached to any number of models and tools; runs are
+    matched up by run_id.
+    """
+
+    run_inline = True
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self.metrics = metrics
+        self._runs: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _registry(self) -> MetricsRegistry:
+        return self.metrics or get_metrics()
+
+    def _start(self, run_id: Any, *info):
+        with self._lock:
+            self._runs[run_id] = (time.perf_counter(),) + info
+
+    def _finish(self, run_id: Any) -> Optional[tuple]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        return (time.perf_counter() - run[0],) + run[1:]
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], **kwargs: Any):
+        self._start(kwargs.get("run_id"), estimate_tokens(messages_to_text(messages[0]) if messages else ""))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any):
+        self._start(kwargs.get("run_id"), estimate_tokens(prompts[0] if prompts else ""))
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        run = self._finish(kwargs.get("run_id"))
+        if run is None:
+            return
+        seconds, prompt_tokens = run
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        completion_tokens = usage.get("output_tokens") or estimate_tokens(generation.text if generation else "")
+        prompt_tokens = usage.get("input_tokens") or prompt_tokens
+        status = "cached" if (response.llm_output or {}).get("cached") else "ok"
+
+        metrics = self._registry()
+        metrics.observe("research_llm_call_seconds", seconds)
+        metrics.inc("research_llm_calls_total", status=status)
+        if status != "cached":
+            metrics.inc("research_llm_prompt_tokens_total", prompt_tokens)
+            metrics.inc("research_llm_completion_tokens_total", completion_tokens)
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any):
+        run = self._finish(kwargs.get("run_id"))
+        if run is None:
+            return
+        metrics = self._registry()
+        metrics.observe("research_llm_call_seconds", run[0])
+        metrics.inc("research_llm_calls_total", status="error")
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any):
+        self._start(kwargs.get("run_id"), (serialized or {}).get("name", "tool"))
+
+    def on_tool_end(self, output: Any, **kwargs: Any):
+        run = self._finish(kwargs.get("run_id"))
+        if run is not None:
+            self._registry().observe("research_tool_call_seconds", run[0], tool=run[1])
+
+    def on_tool_error(self, error: BaseException, **kwargs: Any):
+        run = self._finish(kwargs.get("run_id"))
+        if run is not None:
+            self._registry().observe("research_tool_call_seconds", run[0], tool=run[1])
+            self._registry().inc("research_tool_errors_total", tool=run[1])
+
+
+_shared_handler = None
+_shared_handler_lock = threading.Lock()
+
+
+def get_metrics_handler() -> MetricsCallbackHandler:
+    """Process-wide metrics handler shared by every agent"""
+    global _shared_handler
+    with _shared_handler_lock:
+        if _shared_handler is None:
+            _shared_handler = MetricsCallbackHandler()
+        return _shared_handler
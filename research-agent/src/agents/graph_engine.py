@@ -0,0 +1,218 @@
+import operator
+import threading
+import time
+from typing import Annotated, Callable, Dict, List, Optional, TypedDict
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from src.agents.callbacks import EventSink, emit_event
+from src.tools.evidence import EvidenceStore
+from src.tools.web_search import WebSearchTool
+from src.utils.config import Config
+from src.utils.metrics import get_metrics
+from src.utils.prompts import GRAPH_ANSWER_PROMPT
+
+
+def _merge(left: Dict, right: Dict) -> Dict:
+    """Reducer for per-question dicts written by parallel branches"""
+    return {**left, **right}
+
+
+class ResearchState(TypedDict, total=False):
+    topic: str
+    questions: List[str]
+    # Indexes of the questions to research (all when absent, e.g. not resuming)
+    pending: List[int]
+    include_report: bool
+    # index -> {"web": evidence, "academic": evidence}; compact excerpt text only
+    evidence: Annotated[Dict[int, Dict[str, str]], _merge]
+    answers: Annotated[Dict[int, str], _merge]
+    report: str
+    timings: Annotated[List[Dict], operator.add]
+
+
+class BranchState(TypedDict):
+    """Payload handed to one per-question branch via Send"""
+    topic: str
+    index: int
+    question: str
+
+
+class GraphResearchEngine:
+    """Research as an explicit LangGraph state graph instead of a ReAct loop.
+
+    plan -> (web search || academic search) for every question -> answer per
+    question -> collect -> optional report. Searches and answers for all
+    questions run as parallel branches (up to `concurrency` at a time), and
+    each question costs one LLM call instead of a ReAct round trip per tool
+    step. Every node records its wall time so runs can be profiled per node.
+    """
+
+    def __init__(self, llm: BaseChatModel, search_tool: WebSearchTool,
+                 report_writer: Optional[Callable[[Dict, str], str]] = None,
+                 callbacks_for: Optional[Callable[[int], List]] = None,
+                 evidence: Optional[EvidenceStore] = None):
+        self.llm = llm
+        self.search_tool = search_tool
+        # Hits are deduplicated across questions and handed to the model as ranked excerpts
+        self.evidence = evidence if evidence is not None else EvidenceStore(Config.EVIDENCE_EXCERPT_CHARS)
+        self.report_writer = report_writer
+        self.callbacks_for = callbacks_for or (lambda index: [])
+        self.on_event: Optional[EventSink] = None
+        self.on_answer: Optional[Callable[[str, str], None]] = None
+        self.last_timings: List[Dict] = []
+        self._events_lock = threading.Lock()
+        self.graph = self._build_graph()
+
+    def _build_graph(self):
+        graph = StateGraph(ResearchState)
+        graph.add_node("plan", self._timed("plan", self._plan))
+        graph.add_node("web_search", self._timed("web_search", self._web_search))
+        graph.add_node("academic_search", self._timed("academic_search", self._academic_search))
+        graph.add_node("gather", self._timed("gather", lambda state: {}))
+        graph.add_node("answer", self._timed("answer", self._answer))
+        graph.add_node("collect", self._timed("collect", lambda state: {}))
+        # named apart from the "report" state key, which langgraph < 0.6 rejects as a node name
+        graph.add_node("write_report", self._timed("write_report", self._report))
+
+        graph.add_edge(START, "plan")
+        graph.add_conditional_edges("plan", self._fan_out_searches, ["web_search", "academic_search"])
+        # gather runs once both search branches of every question have finished
+        graph.add_edge("web_search", "gather")
+        graph.add_edge("academic_search", "gather")
+        graph.add_conditional_edges("gather", self._fan_out_answers, ["answer"])
+        graph.add_edge("answer", "collect")
+        graph.add_conditional_edges(
+            "collect", lambda state: "write_report" if state.get("include_report") else END,
+            ["write_report", END]
+        )
+        graph.add_edge("write_report", END)
+        return graph.compile()
+
+    def _timed(self, name: str, node: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+        def run(state):
+            start = time.perf_counter()
+            update = node(state) or {}
+            timing = {"node": name, "seconds": round(time.perf_counter() - start, 4)}
+            if "index" in state:
+                timing["index"] = state["index"]
+            return {**update, "timings": [timing]}
+        return run
+
+    def _emit(self, event_type: str, **data):
+        # Sinks are not required to be thread-safe, and branches run in parallel
+        with self._events_lock:
+            emit_event(self.on_event, event_type, **data)
+
+    @staticmethod
+    def _pending(state: ResearchState) -> List[tuple]:
+        questions = state["questions"]
+        return [(index, questions[index]) for index in state.get("pending", range(len(questions)))]
+
+    def _plan(self, state: ResearchState) -> Dict:
+        for index, question in self._pending(state):
+            print(f"🔍 Researching question {index + 1}/{len(state['questions'])}: {question}")
+            self._emit("question_started", index=index, question=question)
+        return {}
+
+    def _fan_out_searches(self, state: ResearchState) -> List[Send]:
+        sends = []
+        for index, question in self._pending(state):
+            branch = {"topic": state["topic"], "index": index, "question": question}
+            sends.append(Send("web_search", branch))
+            sends.append(Send("academic_search", branch))
+        return sends
+
+    def _search(self, branch: BranchState, kind: str, search: Callable[[str], List[Dict]]) -> Dict:
+        query = f"{branch['question']} {branch['topic']}"
+        tool = "WebSearch" if kind == "web" else "AcademicSearch"
+        self._emit("tool_call", index=branch["index"], question=branch["question"], tool=tool, input=query[:200])
+        # Searches are plain calls here, not LangChain tool runs, so time them directly
+        metrics = get_metrics()
+        try:
+            with metrics.time("research_tool_call_seconds", tool=tool):
+                hits = search(query)
+            docs = [doc for doc, _ in self.evidence.add(kind, hits, query)]
+            evidence = self.evidence.format(self.evidence.rank(docs, query), Config.GRAPH_EVIDENCE_CHARS)
+        except Exception as e:
+            metrics.inc("research_tool_errors_total", tool=tool)
+            evidence = f"Search failed: {e}"
+        return {"evidence": {branch["index"]: {kind: evidence}}}
+
+    def _web_search(self, branch: BranchState) -> Dict:
+        return self._search(branch, "web", self.search_tool.search_web)
+
+    def _academic_search(self, branch: BranchState) -> Dict:
+        return self._search(branch, "academic", self.search_tool.search_academic)
+
+    def _fan_out_answers(self, state: ResearchState) -> List[Send]:
+        return [
+            Send("answer", {"topic": state["topic"], "index": index, "question": question,
+                            "evidence": state.get("evidence", {}).get(index, {})})
+            for index, question in self._pending(state)
+        ]
+
+    def _answer(self, branch: Dict) -> Dict:
+        index, question = branch["index"], branch["question"]
+        evidence = branch.get("evidence", {})
+        prompt = GRAPH_ANSWER_PROMPT.format(
+            topic=branch["topic"], question=question,
+            web_evidence=evidence.get("web", "(none)"),
+            academic_evidence=evidence.get("academic", "(none)"),
+        )
+        try:
+            answer = self.llm.invoke(prompt, config={"callbacks": self.callbacks_for(index)}).content
+            ok = True
+        except Exception as e:
+            print(f"❌ Error researching {question}: {e}")
+            answer = f"Research failed: {str(e)}"
+            ok = False
+        self._emit("question_finished", index=index, question=question, ok=ok)
+        if self.on_answer is not None:
+            self.on_answer(question, answer)
+        return {"answers": {index: answer}}
+
+    def _report(self, state: ResearchState) -> Dict:
+        if self.report_writer is None:
+            return {}
+        return {"report": self.report_writer(self._results(state), state["topic"])}
+
+    @staticmethod
+    def _results(state: ResearchState) -> Dict:
+        answers = state.get("answers", {})
+        return {question: answers.get(index, "Research failed: no answer produced")
+                for index, question in GraphResearchEngine._pending(state)}
+
+    def run(self, topic: str, questions: List[str], concurrency: int,
+            on_event: Optional[EventSink] = None, include_report: bool = False,
+            pending: Optional[List[int]] = None,
+            on_answer: Optional[Callable[[str, str], None]] = None) -> Dict:
+        """Run the graph; returns {"results": {question: answer}, "report": str or None}
+
+        Only the questions at the `pending` indexes are researched, and
+        `on_answer(question, answer)` is called as each one finishes.
+        """
+        initial = {"topic": topic, "questions": list(questions), "include_report": include_report}
+        if pending is not None:
+            initial["pending"] = list(pending)
+        self.on_event = on_event
+        self.on_answer = on_answer
+        try:
+            state = self.graph.invoke(initial, config={"max_concurrency": concurrency})
+        finally:
+            self.on_event = None
+            self.on_answer = None
+        self.last_timings = state.get("timings", [])
+        return {"results": self._results(state), "report": state.get("report")}
+
+    def node_profile(self) -> Dict[str, Dict]:
+        """Calls, total and max seconds per node for the last run"""
+        profile = {}
+        for timing in self.last_timings:
+            entry = profile.setdefault(timing["node"], {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["calls"] += 1
+            entry["total_seconds"] = round(entry["total_seconds"] + timing["seconds"], 4)
+            entry["max_seconds"] = max(entry["max_seconds"], timing["seconds"])
+        return profile
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Optional
+
+from langchain.memory import ConversationBufferMemory
+from langchain_core.messages import BaseMessage, SystemMessage, messages_from_dict, messages_to_dict
+
+from src.utils.config import Config
+from src.utils.prompts import ROLLING_SUMMARY_PROMPT
+from src.utils.rate_limiter import estimate_tokens
+
+MEMORY_MODES = ("isolated", "window", "summary")
+
+
+def _message_tokens(messages: List[BaseMessage]) -> int:
+    return sum(estimate_tokens(str(m.content)) + 4 for m in messages)
+
+
+class TokenWindowMemory(ConversationBufferMemory):
+    """Chat memory that drops the oldest messages once it exceeds `max_tokens`"""
+
+    max_tokens: int = 1500
+    memory_key: str = "chat_history"
+    return_messages: bool = True
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        super().save_context(inputs, outputs)
+        self._fold(self._prune())
+
+    def _budget(self) -> int:
+        return self.max_tokens
+
+    def _prune(self) -> List[BaseMessage]:
+        """Trim history to the budget, returning the messages that were dropped"""
+        messages = self.chat_memory.messages
+        dropped = []
+        while len(messages) > 1 and _message_tokens(messages) > self._budget():
+            dropped.append(messages.pop(0))
+        if messages and _message_tokens(messages) > self._budget():
+            # A single oversized message is cut down rather than dropped
+            only = messages[0]
+            messages[0] = only.__class__(content=str(only.content)[:self._budget() * 4])
+        return dropped
+
+    def _fold(self, dropped: List[BaseMessage]):
+        pass
+
+    def token_count(self) -> int:
+        return _message_tokens(self.chat_memory.messages)
+
+
+class RollingSummaryMemory(TokenWindowMemory):
+    """Token window whose dropped messages are folded into a bounded running summary"""
+
+    llm: Any = None
+    summary: str = ""
+    summary_tokens: int = 300
+
+    def _budget(self) -> int:
+        return max(1, self.max_tokens - self.summary_tokens)
+
+    def _fold(self, dropped: List[BaseMessage]):
+        if not dropped or self.llm is None:
+            return
+        new_lines = "\n".join(f"{m.type}: {m.content}" for m in dropped)
+        prompt = ROLLING_SUMMARY_PROMPT.format(
+            summary=self.summary or "(none)",
+            new_lines=new_lines[:self.max_tokens * 4],
+            max_words=int(self.summary_tokens * 0.75),
+        )
+        self.summary = self.llm.invoke(prompt).content[:self.summary_tokens * 4]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = list(self.chat_memory.messages)
+        if self.summary:
+            messages.insert(0, SystemMessage(content=f"Summary of earlier research:\n{self.summary}"))
+        return {self.memory_key: messages}
+
+    def token_count(self) -> int:
+        return super().token_count() + estimate_tokens(self.summary)
+
+    def clear(self) -> None:
+        super().clear()
+        self.summary = ""
+
+
+def build_carryover_digest(results: Dict[str, str], max_tokens: int) -> str:
+    """Compact digest of earlier answers that fits in max_tokens, dropping the oldest questions if needed"""
+    if not results or max_tokens <= 0:
+        return ""
+    header = "Findings from earlier questions in this research:"
+    per_item = max(40, (max_tokens * 4 - len(header)) // len(results))
+    lines = []
+    for question, answer in results.items():
+        answer = " ".join(str(answer).split())
+        if len(answer) > per_item:
+            answer = answer[:per_item].rsplit(" ", 1)[0] + "..."
+        lines.append(f"- {question}: {answer}")
+    digest = "\n".join([header] + lines)
+    while estimate_tokens(digest) > max_tokens and len(lines) > 1:
+        lines.pop(0)  # drop the oldest question first
+        digest = "\n".join([header] + lines)
+    return digest[:max_tokens * 4]
+
+
+def create_memory(mode: Optional[str] = None, llm: Any = None,
+                  carryover: Optional[Dict[str, str]] = None) -> TokenWindowMemory:
+    """Memory for one agent executor under the configured mode and token budget"""
+    mode = mode or Config.AGENT_MEMORY_MODE
+    if mode not in MEMORY_MODES:
+        raise ValueError(f"Unknown memory mode '{mode}', expected one of {', '.join(MEMORY_MODES)}")
+    if mode == "summary":
+        return RollingSummaryMemory(
+            llm=llm, max_tokens=Config.AGENT_MEMORY_TOKENS, summary_tokens=Config.AGENT_MEMORY_SUMMARY_TOKENS
+        )
+    memory = TokenWindowMemory(max_tokens=Config.AGENT_MEMORY_TOKENS)
+    digest = build_carryover_digest(carryover or {}, Config.AGENT_MEMORY_TOKENS)
+    if digest:
+        memory.chat_memory.add_message(SystemMessage(content=digest))
+    return memory
+
+
+def memory_state(memory: TokenWindowMemory) -> Dict[str, Any]:
+    """JSON-serializable snapshot of a memory, for checkpoints"""
+    state = {"messages": messages_to_dict(memory.chat_memory.messages)}
+    if isinstance(memory, RollingSummaryMemory):
+        state["summary"] = memory.summary
+    return state
+
+
+def restore_memory(memory: TokenWindowMemory, state: Optional[Dict[str, Any]]):
+    """Load a snapshot taken by memory_state back into a memory"""
+    if not state:
+        return
+    memory.clear()
+    memory.chat_memory.add_messages(messages_from_dict(state.get("messages", [])))
+    if isinstance(memory, RollingSummaryMemory):
+        memory.summary = state.get("summary", "")
@@ -1,29 +1,85 @@
 from langchain.agents import AgentType, initialize_agent
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.tools import Tool, StructuredTool
-from langchain.memory import ConversationBufferMemory
+from langchain_core.prompts import MessagesPlaceholder
 from langchain.agents import tool
-from typing import List, Dict
-import json
+from langchain_core.language_models.chat_models import BaseChatModel
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import asyncio
+import threading
 import time
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Optional, Tuple
 
+from src.agents.callbacks import (
+    EventSink, ProgressCallbackHandler, PromptSizeTracker, emit_event, get_metrics_handler
+)
+from src.agents.memory import create_memory, memory_state, restore_memory
+from src.agents.synthesis import ReportSynthesizer
+from src.tools.evidence import EvidenceStore
+from src.tools.pdf_reader import get_shared_pdf_reader, resolve_pdf_path
 from src.tools.web_search import WebSearchTool
+from src.utils.checkpoint import get_checkpoint_store
 from src.utils.config import Config
-from src.utils.prompts import RESEARCH_AGENT_PROMPT, SUMMARY_PROMPT
+from src.utils.llm import ManagedChatModel
+from src.utils.llm_cache import get_shared_llm_cache
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import get_shared_rate_limiter
+from src.utils.research_index import get_research_index
+from src.utils.retry import RetryEngine, RetryPolicy, get_circuit_breaker
+from src.utils.prompts import REFRESH_ANSWER_PROMPT, RESEARCH_AGENT_PROMPT, SUMMARY_PROMPT
+
+
+class ResearchCancelled(Exception):
+    """The job's cancel flag was set (e.g. its queue worker lost the lease); finished answers stay checkpointed"""
+
 
 class ResearchAgent:
-    def __init__(self):
-        Config.validate_config()
-        
-        # Use gemini-1.5-flash which has higher free tier limits
-        self.llm = ChatGoogleGenerativeAI(
-            model="models/gemini-1.5-flash",
-            google_api_key=Config.GEMINI_API_KEY,
-            temperature=0.3
+    def __init__(self, llm: Optional[BaseChatModel] = None):
+        if llm is None:
+            Config.validate_config()
+            
+            if Config.LLM_PROVIDER == "fake":
+                from src.utils.fake_llm import FakeChatModel
+                llm = FakeChatModel(latency=Config.FAKE_LLM_LATENCY)
+            else:
+                # Use gemini-1.5-flash which has higher free tier limits.
+                # Retries are handled by our RetryEngine, so the client makes one attempt.
+                llm = ChatGoogleGenerativeAI(
+                    model="models/gemini-1.5-flash",
+                    google_api_key=Config.GEMINI_API_KEY,
+                    temperature=0.3,
+                    max_retries=1
+                )
+        
+        # All calls go through the process-wide response cache and rate limiter
+        # (instead of fixed sleeps), and share one circuit breaker per model endpoint.
+        # The metrics handler times every call, whichever chain or tool makes it.
+        self.metrics_handler = get_metrics_handler()
+        self.llm = ManagedChatModel(
+            inner=llm,
+            callbacks=[self.metrics_handler],
+            response_cache=get_shared_llm_cache(),
+            limiter=get_shared_rate_limiter(),
+            retry_engine=RetryEngine(
+                policy=RetryPolicy.from_config(),
+                breaker=get_circuit_breaker(getattr(llm, "model", llm._llm_type))
+            )
         )
         
         self.web_search_tool = WebSearchTool()
-        self.memory = ConversationBufferMemory(memory_key="chat_history")
+        # Search hits of the current job, shared by all of its questions
+        self.evidence = EvidenceStore(Config.EVIDENCE_EXCERPT_CHARS)
+        self.pdf_reader = get_shared_pdf_reader()
+        # Bounded by AGENT_MEMORY_TOKENS; only used directly in "window"/"summary" mode
+        self.memory = create_memory(llm=self.llm)
+        self.prompt_log = []
+        self._prompt_log_lock = threading.Lock()
+        # Set by the current job's caller to stop it between questions
+        self._cancel: Optional[threading.Event] = None
+        
+        self.synthesizer = ReportSynthesizer(self.llm)
+        self.graph_engine = None
         
         self.tools = self._setup_tools()
         self.agent = self._initialize_agent()
@@ -31,17 +87,39 @@ class ResearchAgent:
     def _setup_tools(self) -> List[Tool]:
         """Setup tools for the research agent"""
         
+        def excerpts(kind: str, query: str, results: List[Dict]) -> str:
+            # Deduplicated into the job's evidence store, returned as ranked, capped excerpts
+            docs = [doc for doc, _ in self.evidence.add(kind, results, query)]
+            return self.evidence.format(self.evidence.rank(docs, query), Config.EVIDENCE_TOOL_MAX_CHARS)
+        
         @tool
         def web_search(query: str) -> str:
             """Search the web for information. Input should be a search query."""
-            results = self.web_search_tool.search_web(query)
-            return json.dumps(results, indent=2)
+            return excerpts("web", query, self.web_search_tool.search_web(query))
         
         @tool
         def academic_search(query: str) -> str:
             """Search academic sources for research papers. Input should be a research topic."""
-            results = self.web_search_tool.search_academic(query)
-            return json.dumps(results, indent=2)
+            return excerpts("academic", query, self.web_search_tool.search_academic(query))
+        
+        # Coroutine versions, used when the agent runs on an event loop (ainvoke)
+        async def aweb_search(query: str) -> str:
+            return excerpts("web", query, await self.web_search_tool.asearch_web(query))
+        
+        async def aacademic_search(query: str) -> str:
+            return excerpts("academic", query, await self.web_search_tool.asearch_academic(query))
+        
+        @tool
+        def local_evidence(query: str) -> str:
+            """Search sources already gathered in this research. Input should be a search query."""
+            hits = self.evidence.search(query, k=Config.EVIDENCE_TOP_K)
+            if not hits:
+                return "No gathered sources match yet; use WebSearch or AcademicSearch."
+            return self.evidence.format([doc for doc, _ in hits], Config.EVIDENCE_TOOL_MAX_CHARS)
+        
+        async def alocal_evidence(query: str) -> str:
+            # In-memory BM25 lookup; nothing to wait for
+            return local_evidence.func(query)
         
         # Use StructuredTool for the summarize_research function
         def summarize_research(topic: str, findings: str) -> str:
@@ -49,87 +127,547 @@ class ResearchAgent:
             prompt = SUMMARY_PROMPT.format(topic=topic, findings=findings)
             return self.llm.invoke(prompt).content
         
+        async def asummarize_research(topic: str, findings: str) -> str:
+            prompt = SUMMARY_PROMPT.format(topic=topic, findings=findings)
+            return (await self.llm.ainvoke(prompt)).content
+        
+        def read_pdf(path: str, pages: str = "") -> str:
+            """Read a PDF from the papers directory. Pages like '1-5,8'; empty reads from the start."""
+            try:
+                resolved = resolve_pdf_path(path)
+                total = self.pdf_reader.page_count(resolved)
+                text = self.pdf_reader.extract_text_from_pdf(
+                    resolved, pages, max_chars=Config.PDF_TOOL_MAX_CHARS
+                )
+            except Exception as e:
+                return f"Could not read PDF: {e}"
+            return f"[{path}: {total} pages]\n{text}"
+        
+        async def aread_pdf(path: str, pages: str = "") -> str:
+            # Page extraction already runs in worker processes; just keep the wait off the loop
+            return await asyncio.to_thread(read_pdf, path, pages)
+        
+        pdf_tool = StructuredTool.from_function(
+            func=read_pdf,
+            coroutine=aread_pdf,
+            name="PDFReader",
+            description="Read pages of a local research paper PDF. Ask for page ranges to read long papers in parts.",
+        )
+        
         # Create a StructuredTool that accepts multiple arguments
         summarize_tool = StructuredTool.from_function(
             func=summarize_research,
+            coroutine=asummarize_research,
             name="ResearchSummarizer",
             description="Summarize research findings into comprehensive reports.",
         )
         
-        return [
+        tools = [
             Tool.from_function(
                 func=web_search,
+                coroutine=aweb_search,
                 name="WebSearch",
                 description="Search the web for current information"
             ),
             Tool.from_function(
                 func=academic_search,
+                coroutine=aacademic_search,
                 name="AcademicSearch",
                 description="Search academic sources for research papers"
             ),
+            Tool.from_function(
+                func=local_evidence,
+                coroutine=alocal_evidence,
+                name="LocalEvidence",
+                description="Search sources already found for this research (by any question) before searching again"
+            ),
+            pdf_tool,
             summarize_tool
         ]
+        for research_tool in tools:
+            research_tool.callbacks = [self.metrics_handler]
+        return tools
     
     def _initialize_agent(self):
-        """Initialize the research agent"""
+        """Initialize the research agent (once per ResearchAgent; see _agent_with)"""
         return initialize_agent(
             tools=self.tools,
             llm=self.llm,
             agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
             memory=self.memory,
-            verbose=True,
-            handle_parsing_errors=True
+            verbose=Config.AGENT_VERBOSE,
+            handle_parsing_errors=True,
+            # The structured-chat prompt has no history slot by default
+            agent_kwargs={
+                "memory_prompts": [MessagesPlaceholder(variable_name="chat_history")],
+                "input_variables": ["input", "agent_scratchpad", "chat_history"],
+            }
         )
     
-    def conduct_research(self, topic: str, research_questions: List[str]) -> Dict:
-        """Conduct comprehensive research on a topic with rate limiting"""
-        results = {}
+    def _agent_with(self, memory):
+        """The prebuilt executor with its own memory: a shallow copy shares the prompt, agent
+        runnable and tools, so a question no longer pays for initialize_agent"""
+        return self.agent.model_copy(update={"memory": memory})
+    
+    def _start_question(self, topic: str, question: str, index: int,
+                        on_event: Optional[EventSink]) -> Tuple[Dict, Dict]:
+        """Agent input and run config for one question (announces it to the event sink)"""
+        self._check_cancelled()
+        prompt = RESEARCH_AGENT_PROMPT.format(topic=topic, query=question)
+        emit_event(on_event, "question_started", index=index, question=question)
+        callbacks = [PromptSizeTracker(self.prompt_log, self._prompt_log_lock, index, on_event)]
+        if on_event:
+            callbacks.append(ProgressCallbackHandler(on_event, question, index))
+        return {"input": prompt}, {"callbacks": callbacks}
+    
+    def _research_question(self, agent, topic: str, question: str, index: int = 0,
+                           on_event: Optional[EventSink] = None) -> str:
+        """Run the agent on a single question, returning the answer or a failure note"""
+        agent_input, config = self._start_question(topic, question, index, on_event)
+        try:
+            response = agent.invoke(agent_input, config=config)
+            answer = response["output"]
+            ok = True
+        except Exception as e:
+            print(f"❌ Error researching {question}: {e}")
+            answer = f"Research failed: {str(e)}"
+            ok = False
+        emit_event(on_event, "question_finished", index=index, question=question, ok=ok)
+        return answer
+    
+    async def _aresearch_question(self, agent, topic: str, question: str, index: int = 0,
+                                  on_event: Optional[EventSink] = None) -> str:
+        """_research_question on the event loop (agent.ainvoke, async model and tool calls)"""
+        agent_input, config = self._start_question(topic, question, index, on_event)
+        try:
+            response = await agent.ainvoke(agent_input, config=config)
+            answer = response["output"]
+            ok = True
+        except Exception as e:
+            print(f"❌ Error researching {question}: {e}")
+            answer = f"Research failed: {str(e)}"
+            ok = False
+        emit_event(on_event, "question_finished", index=index, question=question, ok=ok)
+        return answer
+    
+    def conduct_research(self, topic: str, research_questions: List[str],
+                         concurrency: Optional[int] = None,
+                         on_event: Optional[EventSink] = None,
+                         research_id: Optional[str] = None,
+                         cancel: Optional[threading.Event] = None) -> Dict:
+        """Conduct comprehensive research on a topic with rate limiting.
         
-        for i, question in enumerate(research_questions):
-            prompt = RESEARCH_AGENT_PROMPT.format(topic=topic, query=question)
-            
-            try:
-                print(f"🔍 Researching question {i+1}/{len(research_questions)}: {question}")
-                response = self.agent.invoke({"input": prompt})
-                results[question] = response["output"]
-                
-                # Add delay between requests to avoid rate limiting
-                if i < len(research_questions) - 1:
-                    print("⏳ Waiting 5 seconds to avoid rate limits...")
-                    time.sleep(5)
-                    
-            except Exception as e:
-                print(f"❌ Error researching {question}: {e}")
-                results[question] = f"Research failed: {str(e)}"
-                
-                # If it's a rate limit error, wait longer
-                if "429" in str(e) or "quota" in str(e).lower():
-                    print("🚫 Rate limit hit. Waiting 30 seconds...")
-                    time.sleep(30)
+        `on_event(type, data)` receives progress events (question_started,
+        tool_call, question_finished) as the research runs. With a
+        `research_id`, every finished question is checkpointed and a rerun
+        under the same id resumes after the last completed question. Once
+        `cancel` is set, no further question starts and ResearchCancelled
+        is raised.
+        """
+        concurrency = concurrency or Config.RESEARCH_CONCURRENCY
+        done, pending, on_answer = self._prepare_research(topic, research_questions, on_event, research_id,
+                                                          cancel)
+        
+        reused = self._reuse_answers(topic, pending, concurrency, on_event, on_answer)
+        if reused:
+            done = {**done, **reused}
+            pending = [(i, q) for i, q in pending if q not in reused]
+        
+        with get_metrics().time("research_stage_seconds", stage="research"):
+            if not pending:
+                answers = {}
+            elif Config.RESEARCH_ENGINE == "graph":
+                answers = self._conduct_research_graph(topic, research_questions, pending, concurrency,
+                                                       on_event, on_answer)
+            elif concurrency > 1 and len(pending) > 1:
+                answers = self._conduct_research_concurrent(topic, pending, concurrency, on_event, on_answer)
+            else:
+                answers = self._conduct_research_sequential(topic, research_questions, pending, done,
+                                                            on_event, on_answer)
+        
+        self._check_cancelled()
+        # Keep results keyed by question in input order
+        return {question: done[question] if question in done else answers[question]
+                for question in research_questions}
+    
+    async def aconduct_research(self, topic: str, research_questions: List[str],
+                                concurrency: Optional[int] = None,
+                                on_event: Optional[EventSink] = None,
+                                research_id: Optional[str] = None,
+                                cancel: Optional[threading.Event] = None) -> Dict:
+        """conduct_research as a coroutine, for running many jobs on one event loop.
+        
+        Questions run as tasks (at most `concurrency` at once) and every LLM
+        and search call is awaited, so a job holds no thread while it waits
+        on Gemini or the search backend. Checkpoint and research index I/O
+        runs on worker threads.
+        """
+        concurrency = concurrency or Config.RESEARCH_CONCURRENCY
+        done, pending, on_answer = await asyncio.to_thread(self._prepare_research, topic, research_questions,
+                                                           on_event, research_id, cancel)
+        
+        reused = await self._areuse_answers(topic, pending, on_event, on_answer)
+        if reused:
+            done = {**done, **reused}
+            pending = [(i, q) for i, q in pending if q not in reused]
+        
+        with get_metrics().time("research_stage_seconds", stage="research"):
+            if not pending:
+                answers = {}
+            elif Config.RESEARCH_ENGINE == "graph":
+                # The graph's nodes are synchronous, so the whole graph runs off the loop
+                answers = await asyncio.to_thread(self._conduct_research_graph, topic, research_questions,
+                                                  pending, concurrency, on_event, on_answer)
+            elif concurrency > 1 and len(pending) > 1:
+                answers = await self._aconduct_research_concurrent(topic, pending, concurrency,
+                                                                   on_event, on_answer)
+            else:
+                answers = await self._aconduct_research_sequential(topic, research_questions, pending, done,
+                                                                   on_event, on_answer)
+        
+        self._check_cancelled()
+        return {question: done[question] if question in done else answers[question]
+                for question in research_questions}
+    
+    def _prepare_research(self, topic: str, research_questions: List[str],
+                          on_event: Optional[EventSink], research_id: Optional[str],
+                          cancel: Optional[threading.Event] = None
+                          ) -> Tuple[Dict[str, str], List[Tuple[int, str]], Callable[[str, str], None]]:
+        """Reset per-job state and load checkpoints: (answers so far, pending questions, on_answer)"""
+        self._cancel = cancel
+        emit_event(on_event, "research_started", topic=topic, total=len(research_questions))
+        with self._prompt_log_lock:
+            self.prompt_log.clear()
+        self.evidence.clear()
+        
+        checkpoints = get_checkpoint_store() if research_id else None
+        done = checkpoints.completed_answers(research_id, topic) if checkpoints else {}
+        pending = [(i, q) for i, q in enumerate(research_questions) if q not in done]
+        if done:
+            print(f"♻️ Resuming {research_id}: {len(research_questions) - len(pending)} of "
+                  f"{len(research_questions)} questions already answered")
+            if Config.AGENT_MEMORY_MODE != "isolated":
+                restore_memory(self.memory, (checkpoints.load(research_id) or {}).get("state"))
+            for i, question in enumerate(research_questions):
+                if question in done:
+                    emit_event(on_event, "question_finished", index=i, question=question, ok=True, resumed=True)
+        
+        def on_answer(question: str, answer: str):
+            if checkpoints is not None:
+                state = memory_state(self.memory) if Config.AGENT_MEMORY_MODE != "isolated" else None
+                checkpoints.save_answer(research_id, topic, research_questions, question, answer, state)
+            # Also stops graph runs, which start questions without _start_question
+            self._check_cancelled()
+        
+        return done, pending, on_answer
+    
+    def _check_cancelled(self):
+        if self._cancel is not None and self._cancel.is_set():
+            raise ResearchCancelled("Research cancelled")
+    
+    def _reuse_matches(self, topic: str, pending: List[Tuple[int, str]]) -> Dict[str, Dict]:
+        """Earlier answers close enough to reuse for pending questions"""
+        research_index = get_research_index()
+        mode = Config.RESEARCH_REUSE_MODE
+        # Fresh jobs skip every cache, earlier research included
+        if research_index is None or mode == "off" or self.llm.cache_bypass or not pending:
+            return {}
+        matches = research_index.match_answers(topic, [q for _, q in pending], Config.RESEARCH_REUSE_THRESHOLD)
+        if matches:
+            print(f"🧠 {'Refreshing' if mode == 'refresh' else 'Reusing'} {len(matches)} answer(s) "
+                  f"from earlier research")
+        return matches
+    
+    def _refresh_call(self, topic: str, question: str, index: int, match: Dict,
+                      on_event: Optional[EventSink]) -> Tuple[str, Dict]:
+        """Prompt and run config of the call that updates an earlier answer"""
+        prompt = REFRESH_ANSWER_PROMPT.format(
+            topic=topic, question=question,
+            previous_question=match["question"], previous_answer=match["answer"]
+        )
+        return prompt, {"callbacks": [PromptSizeTracker(self.prompt_log, self._prompt_log_lock, index, on_event)]}
+    
+    def _reused(self, index: int, question: str, match: Dict, answer: str,
+                on_event: Optional[EventSink], on_answer: Callable[[str, str], None]) -> Tuple[str, str]:
+        emit_event(on_event, "question_finished", index=index, question=question, ok=True,
+                   reused=True, score=match["score"], source=match["research_id"])
+        on_answer(question, answer)
+        return question, answer
+    
+    def _reuse_answers(self, topic: str, pending: List[Tuple[int, str]], concurrency: int,
+                       on_event: Optional[EventSink],
+                       on_answer: Callable[[str, str], None]) -> Dict[str, str]:
+        """Answers taken (or refreshed) from earlier research on near-identical questions"""
+        matches = self._reuse_matches(topic, pending)
+        if not matches:
+            return {}
+        
+        def take(item: Tuple[int, str]) -> Tuple[str, Optional[str]]:
+            index, question = item
+            match = matches[question]
+            answer = match["answer"]
+            if Config.RESEARCH_REUSE_MODE == "refresh":
+                prompt, config = self._refresh_call(topic, question, index, match, on_event)
+                try:
+                    answer = self.llm.invoke(prompt, config=config).content
+                except Exception as e:
+                    # Researched from scratch instead
+                    print(f"⚠️ Could not refresh the earlier answer to {question}: {e}")
+                    return question, None
+            return self._reused(index, question, match, answer, on_event, on_answer)
+        
+        items = [(i, q) for i, q in pending if q in matches]
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as pool:
+            return {question: answer for question, answer in pool.map(take, items) if answer is not None}
+    
+    async def _areuse_answers(self, topic: str, pending: List[Tuple[int, str]],
+                              on_event: Optional[EventSink],
+                              on_answer: Callable[[str, str], None]) -> Dict[str, str]:
+        """_reuse_answers with refresh calls awaited concurrently on the event loop"""
+        matches = await asyncio.to_thread(self._reuse_matches, topic, pending)
+        if not matches:
+            return {}
+        
+        async def take(index: int, question: str) -> Tuple[str, Optional[str]]:
+            match = matches[question]
+            answer = match["answer"]
+            if Config.RESEARCH_REUSE_MODE == "refresh":
+                prompt, config = self._refresh_call(topic, question, index, match, on_event)
+                try:
+                    answer = (await self.llm.ainvoke(prompt, config=config)).content
+                except Exception as e:
+                    print(f"⚠️ Could not refresh the earlier answer to {question}: {e}")
+                    return question, None
+            return await asyncio.to_thread(self._reused, index, question, match, answer, on_event, on_answer)
+        
+        taken = await asyncio.gather(*(take(i, q) for i, q in pending if q in matches))
+        return {question: answer for question, answer in taken if answer is not None}
+    
+    def record_research(self, research_id: str, topic: str, results: Dict, report: Optional[str] = None):
+        """Add a finished run to the research index for search and later reuse"""
+        research_index = get_research_index()
+        if research_index is None:
+            return
+        try:
+            research_index.add(research_id, topic, results, report)
+        except Exception as e:
+            print(f"⚠️ Could not index research {research_id}: {e}")
+    
+    def _conduct_research_sequential(self, topic: str, research_questions: List[str],
+                                     pending: List[Tuple[int, str]], done: Dict[str, str],
+                                     on_event: Optional[EventSink],
+                                     on_answer: Callable[[str, str], None]) -> Dict:
+        """Research questions one after another, sharing (bounded) memory between them"""
+        results = dict(done)
+        for i, question in pending:
+            print(f"🔍 Researching question {i+1}/{len(research_questions)}: {question}")
+            if Config.AGENT_MEMORY_MODE == "isolated":
+                # Fresh memory per question, carrying over a bounded digest of earlier answers
+                agent = self._agent_with(create_memory("isolated", carryover=results))
+            else:
+                agent = self.agent
+            results[question] = self._research_question(agent, topic, question, i, on_event)
+            on_answer(question, results[question])
         
         return results
     
-    def generate_report(self, research_results: Dict, topic: str) -> str:
-        """Generate a comprehensive research report"""
-        findings_str = json.dumps(research_results, indent=2)
+    async def _aconduct_research_sequential(self, topic: str, research_questions: List[str],
+                                            pending: List[Tuple[int, str]], done: Dict[str, str],
+                                            on_event: Optional[EventSink],
+                                            on_answer: Callable[[str, str], None]) -> Dict:
+        results = dict(done)
+        for i, question in pending:
+            print(f"🔍 Researching question {i+1}/{len(research_questions)}: {question}")
+            if Config.AGENT_MEMORY_MODE == "isolated":
+                agent = self._agent_with(create_memory("isolated", carryover=results))
+            else:
+                agent = self.agent
+            results[question] = await self._aresearch_question(agent, topic, question, i, on_event)
+            await asyncio.to_thread(on_answer, question, results[question])
         
-        report_prompt = f"""
-        Generate a comprehensive research report on the topic: {topic}
+        return results
+    
+    def _get_graph_engine(self):
+        """Build the LangGraph engine on first use so the ReAct path never imports langgraph"""
+        if self.graph_engine is None:
+            from src.agents.graph_engine import GraphResearchEngine
+            self.graph_engine = GraphResearchEngine(
+                self.llm,
+                self.web_search_tool,
+                report_writer=self.generate_report,
+                callbacks_for=lambda index: [PromptSizeTracker(self.prompt_log, self._prompt_log_lock, index)],
+                evidence=self.evidence,
+            )
+        return self.graph_engine
+    
+    def _conduct_research_graph(self, topic: str, research_questions: List[str],
+                                pending: List[Tuple[int, str]], concurrency: int,
+                                on_event: Optional[EventSink],
+                                on_answer: Callable[[str, str], None]) -> Dict:
+        """Research the pending questions through the plan/search/answer graph"""
+        print(f"🕸️ Researching {len(pending)} questions with the graph engine "
+              f"(concurrency {concurrency})")
+        return self._get_graph_engine().run(
+            topic, research_questions, concurrency, on_event,
+            pending=[i for i, _ in pending], on_answer=on_answer
+        )["results"]
+    
+    def _conduct_research_concurrent(self, topic: str, pending: List[Tuple[int, str]],
+                                     concurrency: int,
+                                     on_event: Optional[EventSink],
+                                     on_answer: Callable[[str, str], None]) -> Dict:
+        """Research questions in parallel; the shared rate limiter paces the LLM calls"""
+        print(f"🚀 Researching {len(pending)} questions with concurrency {concurrency}")
         
-        Research Findings:
-        {findings_str}
+        def run(item: Tuple[int, str]) -> str:
+            index, question = item
+            # Each question gets its own scratch memory because memory cannot be
+            # shared between concurrent runs
+            agent = self._agent_with(create_memory("isolated"))
+            print(f"🔍 Researching: {question}")
+            answer = self._research_question(agent, topic, question, index, on_event)
+            on_answer(question, answer)
+            return answer
         
-        Please structure the report with:
-        1. Executive Summary
-        2. Key Findings
-        3. Methodology
-        4. Analysis
-        5. Conclusions
-        6. Recommendations
-        7. References
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(pending))) as pool:
+            answers = list(pool.map(run, pending))
         
-        Make the report professional and well-structured.
-        Be concise but comprehensive.
-        """
+        return {question: answer for (_, question), answer in zip(pending, answers)}
+    
+    async def _aconduct_research_concurrent(self, topic: str, pending: List[Tuple[int, str]],
+                                            concurrency: int,
+                                            on_event: Optional[EventSink],
+                                            on_answer: Callable[[str, str], None]) -> Dict:
+        """Research questions as concurrent tasks, at most `concurrency` at a time"""
+        print(f"🚀 Researching {len(pending)} questions with concurrency {concurrency}")
+        slots = asyncio.Semaphore(concurrency)
         
-        return self.llm.invoke(report_prompt).content
+        async def run(index: int, question: str) -> str:
+            async with slots:
+                agent = self._agent_with(create_memory("isolated"))
+                print(f"🔍 Researching: {question}")
+                answer = await self._aresearch_question(agent, topic, question, index, on_event)
+                await asyncio.to_thread(on_answer, question, answer)
+                return answer
+        
+        answers = await asyncio.gather(*(run(index, question) for index, question in pending))
+        return {question: answer for (_, question), answer in zip(pending, answers)}
+    
+    def _build_report_prompt(self, research_results: Dict, topic: str,
+                             on_event: Optional[EventSink] = None) -> str:
+        """Report prompt, condensing the findings first when they are too large for one call"""
+        with get_metrics().time("research_stage_seconds", stage="synthesis"):
+            return self.synthesizer.build_prompt(research_results, topic, on_event)
+    
+    @contextmanager
+    def _report_calls(self):
+        """Charge report calls at report size and let them ahead of other jobs' steps of the same priority"""
+        priority, kind = self.llm.priority, self.llm.quota_kind
+        self.llm.priority, self.llm.quota_kind = priority - 0.5, "report"
+        try:
+            yield
+        finally:
+            self.llm.priority, self.llm.quota_kind = priority, kind
+    
+    def generate_report(self, research_results: Dict, topic: str,
+                        on_event: Optional[EventSink] = None) -> str:
+        """Generate a comprehensive research report"""
+        with self._report_calls():
+            report_prompt = self._build_report_prompt(research_results, topic, on_event)
+            
+            emit_event(on_event, "report_started", topic=topic)
+            with get_metrics().time("research_stage_seconds", stage="report"):
+                report = self.llm.invoke(report_prompt).content
+        emit_event(on_event, "report_finished", length=len(report), **self.get_report_stats())
+        return report
+    
+    def generate_report_stream(self, research_results: Dict, topic: str,
+                               on_event: Optional[EventSink] = None) -> Iterator[str]:
+        """Generate the report like generate_report, yielding text as the model produces it.
+        
+        Joining the yielded chunks gives exactly the text generate_report returns
+        for the same model output.
+        """
+        with self._report_calls():
+            report_prompt = self._build_report_prompt(research_results, topic, on_event)
+            
+            emit_event(on_event, "report_started", topic=topic)
+            length = 0
+            started = time.perf_counter()
+            for chunk in self.llm.stream(report_prompt):
+                text = chunk.content
+                if not text:
+                    continue
+                length += len(text)
+                emit_event(on_event, "report_chunk", text=text)
+                yield text
+        get_metrics().observe("research_stage_seconds", time.perf_counter() - started, stage="report")
+        emit_event(on_event, "report_finished", length=length, **self.get_report_stats())
+    
+    async def agenerate_report_stream(self, research_results: Dict, topic: str,
+                                      on_event: Optional[EventSink] = None) -> AsyncIterator[str]:
+        """generate_report_stream as an async generator (the model is streamed with astream)"""
+        with self._report_calls():
+            # Condensing very large findings (map-reduce) uses the synchronous model API,
+            # so prompt building runs off the loop
+            report_prompt = await asyncio.to_thread(self._build_report_prompt, research_results, topic, on_event)
+            
+            emit_event(on_event, "report_started", topic=topic)
+            length = 0
+            started = time.perf_counter()
+            async for chunk in self.llm.astream(report_prompt):
+                text = chunk.content
+                if not text:
+                    continue
+                length += len(text)
+                emit_event(on_event, "report_chunk", text=text)
+                yield text
+        get_metrics().observe("research_stage_seconds", time.perf_counter() - started, stage="report")
+        emit_event(on_event, "report_finished", length=length, **self.get_report_stats())
+    
+    def set_cache_bypass(self, bypass: bool):
+        """Ask the model for fresh answers instead of cached ones (responses are still stored)"""
+        self.llm.cache_bypass = bypass
+    
+    def set_priority(self, rank: float):
+        """Quota admission rank for this agent's calls (lower first, e.g. scheduler PRIORITIES)"""
+        self.llm.priority = rank
+    
+    def reset(self):
+        """Clear per-job state so a pooled agent can be reused for the next job"""
+        self.memory.clear()
+        self.evidence.clear()
+        with self._prompt_log_lock:
+            self.prompt_log.clear()
+        self.llm.cache_bypass = False
+        self.llm.priority = 1.0
+        self._cancel = None
+    
+    def get_llm_stats(self) -> Dict:
+        """Retry counts, backoff time, circuit state and cache stats for this agent's model"""
+        return self.llm.get_stats()
+    
+    def get_prompt_stats(self) -> Dict:
+        """Estimated prompt tokens of every LLM step in the last conduct_research call"""
+        with self._prompt_log_lock:
+            steps = list(self.prompt_log)
+        sizes = [step["prompt_tokens"] for step in steps]
+        return {
+            "memory_mode": Config.AGENT_MEMORY_MODE,
+            "llm_steps": len(steps),
+            "total_prompt_tokens": sum(sizes),
+            "max_prompt_tokens": max(sizes, default=0),
+            "steps": steps,
+        }
+    
+    def get_engine_profile(self) -> Dict:
+        """Per-node call counts and timings of the last graph-engine run"""
+        return self.graph_engine.node_profile() if self.graph_engine is not None else {}
+    
+    def get_evidence_stats(self) -> Dict:
+        """Documents gathered, duplicate hits and LocalEvidence lookups of the current job"""
+        return self.evidence.stats()
+    
+    def get_report_stats(self) -> Dict:
+        """Synthesis mode, LLM calls and largest prompt (tokens) of the last report"""
+        return dict(self.synthesizer.stats)
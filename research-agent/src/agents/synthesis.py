@@ -0,0 +1,106 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.agents.callbacks import EventSink, emit_event
+from src.utils.config import Config
+from src.utils.prompts import FINDINGS_DIGEST_PROMPT, REPORT_PROMPT
+from src.utils.rate_limiter import estimate_tokens
+
+# Reduce levels before the findings are simply truncated to fit
+_MAX_LEVELS = 4
+
+
+class ReportSynthesizer:
+    """Builds the report prompt, condensing findings map-reduce style when they are large.
+
+    Up to `threshold_tokens` of findings go into the report prompt verbatim.
+    Above that, findings are packed into groups of at most `max_prompt_tokens`,
+    each group is digested in parallel into roughly `summary_tokens`, and the
+    digests are reduced again until they fit, so no single call's prompt
+    grows with the number of questions.
+    """
+
+    def __init__(self, llm: BaseChatModel, threshold_tokens: Optional[int] = None,
+                 max_prompt_tokens: Optional[int] = None, summary_tokens: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        self.llm = llm
+        self.max_prompt_tokens = max_prompt_tokens or Config.REPORT_MAX_PROMPT_TOKENS
+        self.threshold_tokens = min(threshold_tokens or Config.REPORT_MAP_REDUCE_THRESHOLD, self.max_prompt_tokens)
+        self.summary_tokens = summary_tokens or Config.REPORT_SUMMARY_TOKENS
+        self.concurrency = concurrency or Config.RESEARCH_CONCURRENCY
+        self.stats = {}
+
+    def build_prompt(self, research_results: Dict, topic: str,
+                     on_event: Optional[EventSink] = None) -> str:
+        """Final report prompt; runs the map/reduce calls first if findings are too large"""
+        findings = json.dumps(research_results, indent=2)
+        self.stats = {
+            "mode": "direct",
+            "findings_tokens": estimate_tokens(findings),
+            "llm_calls": 1,
+            "levels": 0,
+        }
+        if self.stats["findings_tokens"] > self.threshold_tokens:
+            findings = self._map_reduce(research_results, topic, on_event)
+        prompt = REPORT_PROMPT.format(topic=topic, findings=findings)
+        self.stats["max_prompt_tokens"] = max(self.stats.get("max_prompt_tokens", 0), estimate_tokens(prompt))
+        return prompt
+
+    def _map_reduce(self, research_results: Dict, topic: str, on_event: Optional[EventSink]) -> str:
+        self.stats["mode"] = "map_reduce"
+        items = [f"Question: {question}\nFindings: {answer}" for question, answer in research_results.items()]
+        overhead = estimate_tokens(FINDINGS_DIGEST_PROMPT.format(topic=topic, findings="", max_words=0))
+        budget = max(self.summary_tokens, self.max_prompt_tokens - overhead)
+
+        while True:
+            groups = self._pack(items, budget)
+            self.stats["levels"] += 1
+            emit_event(on_event, "report_map_started", level=self.stats["levels"],
+                       groups=len(groups), items=len(items))
+            print(f"🧩 Condensing {len(items)} findings into {len(groups)} digests "
+                  f"(level {self.stats['levels']})")
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(groups))) as pool:
+                items = list(pool.map(lambda group: self._digest(group, topic), groups))
+            self.stats["llm_calls"] += len(groups)
+            self.stats["max_prompt_tokens"] = max(
+                self.stats.get("max_prompt_tokens", 0),
+                overhead + max(estimate_tokens(group) for group in groups)
+            )
+
+            findings = "\n\n".join(f"Digest {i + 1}:\n{digest}" for i, digest in enumerate(items))
+            if estimate_tokens(findings) <= self.threshold_tokens or len(items) == 1:
+                break
+            if self.stats["levels"] >= _MAX_LEVELS:
+                findings = findings[:self.threshold_tokens * 4]
+                break
+
+        emit_event(on_event, "report_map_finished", levels=self.stats["levels"],
+                   llm_calls=self.stats["llm_calls"] - 1)
+        return findings
+
+    def _pack(self, items: List[str], budget: int) -> List[str]:
+        """Greedily group items in order so each group stays within the token budget"""
+        groups, current, used = [], [], 0
+        for item in items:
+            if estimate_tokens(item) > budget:
+                item = item[:budget * 4]  # one oversized answer is truncated rather than overflowing
+            size = estimate_tokens(item)
+            if current and used + size > budget:
+                groups.append("\n\n".join(current))
+                current, used = [], 0
+            current.append(item)
+            used += size
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+
+    def _digest(self, findings: str, topic: str) -> str:
+        prompt = FINDINGS_DIGEST_PROMPT.format(
+            topic=topic, findings=findings, max_words=int(self.summary_tokens * 0.75)
+        )
+        digest = self.llm.invoke(prompt).content
+        # Hold the model to the budget so the reduce step stays bounded
+        return digest[:self.summary_tokens * 4]
@@ -0,0 +1,14 @@
+"""
+Job execution and bookkeeping for research requests.
+"""
+
+from .queue import JobQueue, RedisJobQueue, SQLiteJobQueue, create_job_queue
+from .runner import JobRunner
+from .scheduler import AsyncJobScheduler, JobScheduler, QueueFullError
+from .store import JobStore, MemoryJobStore, SQLiteJobStore, create_job_store
+
+__all__ = [
+    'JobQueue', 'RedisJobQueue', 'SQLiteJobQueue', 'create_job_queue',
+    'JobRunner', 'AsyncJobScheduler', 'JobScheduler', 'QueueFullError',
+    'JobStore', 'MemoryJobStore', 'SQLiteJobStore', 'create_job_store',
+]
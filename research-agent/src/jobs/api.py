@@ -0,0 +1,326 @@
+"""
+Request handling shared by the threaded (app/app.py) and ASGI (app/asgi.py) servers.
+
+ResearchAPI validates requests, reads and writes the job store, hands jobs
+to the job tier and returns framework-neutral Replies. Each app only turns a
+Reply into its own response and drives the progress streams (Pollers) with
+its own kind of sleep, so clients cannot tell the two servers apart.
+"""
+
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.jobs.scheduler import PRIORITIES, QueueFullError
+from src.jobs.store import JobStore
+from src.utils.config import Config
+from src.utils.http_responses import (
+    choose_encoding, compress_stream, download_filename, etag_matches, iter_chunks, make_etag,
+    parse_fields, project, sse_event
+)
+from src.utils.rate_limiter import get_shared_rate_limiter
+from src.utils.research_index import get_research_index
+
+# Events after which a job's progress stream is closed
+TERMINAL_EVENTS = ('job_completed', 'job_failed')
+# Events that open a (re)run of a job; everything before the latest belongs to earlier runs
+RUN_START_EVENTS = ('job_started', 'job_resumed', 'job_requeued')
+SSE_RETRY_MS = 2000
+STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+
+class Poller(ABC):
+    """A stream fed from the job store; the app calls poll() every SSE_POLL_INTERVAL"""
+
+    @abstractmethod
+    def poll(self) -> Tuple[List[str], bool]:
+        """(chunks to send now, whether the stream is finished)"""
+
+
+@dataclass
+class Reply:
+    """A response for either app: a JSON `body`, or a `stream` (chunks or a Poller) of `mimetype`"""
+    body: Optional[Dict] = None
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    stream: Optional[Union[Iterable, Poller]] = None
+    mimetype: Optional[str] = None
+
+
+def error(message: str, status: int, **extra) -> Reply:
+    return Reply({'error': message, **extra}, status)
+
+
+def not_modified(etag: str) -> Reply:
+    return Reply(status=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+
+class EventPoller(Poller):
+    """Server-Sent Events of a job's progress after `last_id`"""
+
+    def __init__(self, job_store: JobStore, research_id: str, last_id: int):
+        self.job_store = job_store
+        self.research_id = research_id
+        self.last_id = last_id
+        self.opened = self.last_sent = time.monotonic()
+        self.idle_polls = 0
+        self.started = False
+
+    def _finished(self) -> Optional[str]:
+        record = self.job_store.get(self.research_id, ['status']) or {}
+        return record.get('status') if record.get('status') in ('completed', 'error') else None
+
+    def poll(self) -> Tuple[List[str], bool]:
+        chunks = []
+        if not self.started:
+            chunks.append(f"retry: {SSE_RETRY_MS}\n\n")
+            self.started = True
+        events = self.job_store.events_since(self.research_id, self.last_id)
+        for position, event in enumerate(events):
+            self.last_id = event['id']
+            self.last_sent = time.monotonic()
+            chunks.append(sse_event(event))
+            # A failed job may have been resumed since; only stop if it is still finished
+            if event['type'] in TERMINAL_EVENTS and position == len(events) - 1 and self._finished():
+                return chunks, True
+
+        self.idle_polls = 0 if events else self.idle_polls + 1
+        if self.idle_polls and (self.idle_polls % 10 == 0 or self.last_id == 0):
+            # Safety net for jobs that finished without a terminal event, or whose events
+            # were pruned (JOB_EVENT_RETENTION_MINUTES)
+            status = self._finished()
+            if status:
+                terminal = 'job_completed' if status == 'completed' else 'job_failed'
+                chunks.append(f"event: {terminal}\ndata: {{}}\n\n")
+                return chunks, True
+
+        now = time.monotonic()
+        if now - self.opened > Config.SSE_MAX_STREAM_SECONDS:
+            # Let the browser reconnect (with Last-Event-ID) rather than hold the stream forever
+            return chunks, True
+        if now - self.last_sent > 15:
+            # Comment line keeps proxies from closing an idle connection
+            chunks.append(": keep-alive\n\n")
+            self.last_sent = now
+        return chunks, False
+
+
+class ReportPoller(Poller):
+    """The report text of a running job, as its report_chunk events arrive"""
+
+    def __init__(self, job_store: JobStore, research_id: str, last_id: int = 0):
+        self.job_store = job_store
+        self.research_id = research_id
+        self.last_id = last_id
+        self.opened = time.monotonic()
+
+    def poll(self) -> Tuple[List[str], bool]:
+        if time.monotonic() - self.opened >= Config.SSE_MAX_STREAM_SECONDS:
+            return [], True
+        chunks = []
+        for event in self.job_store.events_since(self.research_id, self.last_id):
+            self.last_id = event['id']
+            if event['type'] == 'report_chunk':
+                chunks.append(event['data']['text'])
+            elif event['type'] in ('report_finished',) + TERMINAL_EVENTS:
+                return chunks, True
+        return chunks, False
+
+
+class ResearchAPI:
+    """The research endpoints, minus the web framework.
+
+    `jobs` is the tier that admits jobs (scheduler or durable queue: queue_status,
+    stats); `submit(research_id, topic, questions, fresh=, priority=)` hands a
+    job to it and raises QueueFullError when it is full.
+    """
+
+    def __init__(self, job_store: JobStore, jobs, submit: Callable[..., None]):
+        self.job_store = job_store
+        self.jobs = jobs
+        self.submit = submit
+
+    @staticmethod
+    def _queue_full(e: QueueFullError) -> Reply:
+        retry_after = int(e.retry_after) + 1
+        reply = error('Research queue is full, please retry later', 429,
+                      queue_size=e.queue_size, retry_after=retry_after)
+        reply.headers['Retry-After'] = str(retry_after)
+        return reply
+
+    def _queue_status(self, research_id: str) -> Dict:
+        queue_status = self.jobs.queue_status(research_id) or {}
+        if queue_status:
+            # Persist the admission-time estimate for polls served by other workers
+            self.job_store.update(research_id, **queue_status)
+        return queue_status
+
+    def start(self, data: Optional[Dict]) -> Reply:
+        data = data or {}
+        topic = data.get('topic', '').strip()
+        questions = [q.strip() for q in data.get('questions', []) if q.strip()]
+        if not topic or not questions:
+            return error('Topic and questions are required', 400)
+
+        priority = data.get('priority', 'normal')
+        fresh = bool(data.get('fresh', False))
+        if priority not in PRIORITIES:
+            return error(f"Priority must be one of: {', '.join(PRIORITIES)}", 400)
+
+        daily = get_shared_rate_limiter().stats()['requests_per_day']
+        if daily['remaining'] == 0:
+            # Every LLM call would be refused until the quota day rolls over
+            reply = error('Daily Gemini request budget is spent', 429, retry_after=daily['resets_in_seconds'])
+            reply.headers['Retry-After'] = str(daily['resets_in_seconds'])
+            return reply
+
+        # Unique research ID (suffix keeps concurrent submissions apart)
+        research_id = f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        # Stored before queueing so the worker always finds it
+        self.job_store.create(research_id, {
+            'status': 'queued',
+            'topic': topic,
+            'questions': questions,
+            'priority': priority,
+            'started_at': datetime.now().isoformat()
+        })
+        try:
+            self.submit(research_id, topic, questions, fresh=fresh, priority=priority)
+        except QueueFullError as e:
+            self.job_store.delete(research_id)
+            return self._queue_full(e)
+
+        return Reply({
+            'research_id': research_id,
+            'status': 'queued',
+            'message': 'Research queued successfully',
+            **self._queue_status(research_id)
+        })
+
+    def status(self, research_id: str, fields_param: Optional[str], if_none_match: Optional[str]) -> Reply:
+        """Job record, projected to `fields_param` (e.g. "status,progress"), with an ETag"""
+        fields = parse_fields(fields_param)
+        version = self.job_store.version(research_id)
+        if version is None:
+            return error('Research not found', 404)
+
+        # Queue position changes as other jobs start, so compute it live; it is part of the ETag
+        # (the estimated start is not, or a queued job would never be served a 304)
+        queue_status = self.jobs.queue_status(research_id) or {}
+        etag = make_etag(research_id, version, fields, queue_status.get('queue_position'))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        result = self.job_store.get(research_id, fields)
+        if result is None:
+            return error('Research not found', 404)
+        if queue_status:
+            result = {**result, **project(queue_status, fields)}
+        return Reply(result, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+    def resume(self, research_id: str, data: Optional[Dict]) -> Reply:
+        """Re-queue a failed (or, with force, an orphaned) job; finished questions are not redone"""
+        record = self.job_store.get(research_id)
+        if record is None:
+            return error('Research not found', 404)
+
+        force = bool((data or {}).get('force', False))
+        if record['status'] == 'completed':
+            return error('Research already completed', 409)
+        if record['status'] != 'error':
+            if not force:
+                # A processing job may belong to a worker that died; the caller has to say so
+                return error(f"Research is {record['status']}; pass force=true to resume it anyway", 409)
+            # Forcing a job that is still running would run it twice over the same checkpoint
+            if self.jobs.active(research_id):
+                return error(f"Research is still {record['status']}; it cannot be resumed", 409)
+            # Another web process's scheduler may be running it; live runs update the record
+            idle = time.time() - (self.job_store.version(research_id) or 0)
+            if idle < Config.JOB_STALL_SECONDS:
+                retry_after = int(Config.JOB_STALL_SECONDS - idle) + 1
+                reply = error(f"Research was updated {idle:.0f}s ago and may still be running",
+                              409, retry_after=retry_after)
+                reply.headers['Retry-After'] = str(retry_after)
+                return reply
+
+        self.job_store.update(research_id, status='queued', error=None, failed_questions=None, completed_at=None)
+        try:
+            self.submit(research_id, record['topic'], record['questions'],
+                        priority=record.get('priority', 'normal'))
+        except QueueFullError as e:
+            self.job_store.update(research_id, status=record['status'], error=record.get('error'))
+            return self._queue_full(e)
+
+        self.job_store.append_event(research_id, 'job_resumed', {})
+        return Reply({'research_id': research_id, 'status': 'queued', **self._queue_status(research_id)})
+
+    def events(self, research_id: str, last_event_id: Optional[str]) -> Reply:
+        """Server-Sent Events stream of a job's progress, resuming after `last_event_id`"""
+        try:
+            last_id = int(last_event_id or 0)
+        except ValueError:
+            return error('Last-Event-ID must be an event id', 400)
+        if self.job_store.version(research_id) is None:
+            return error('Research not found', 404)
+        poller = EventPoller(self.job_store, research_id, last_id)
+        return Reply(stream=poller, mimetype='text/event-stream', headers=dict(STREAM_HEADERS))
+
+    def report_stream(self, research_id: str) -> Reply:
+        """The report as plain text while it is generated (or at once if done)"""
+        record = self.job_store.get(research_id, ['status', 'report', 'error'])
+        if record is None:
+            return error('Research not found', 404)
+        if record['status'] == 'error':
+            return error(record.get('error') or 'Research failed', 400)
+        if record['status'] == 'completed':
+            stream = iter([record['report']])
+        else:
+            # A resumed or re-queued job may have streamed part of a report before; skip that run
+            stream = ReportPoller(self.job_store, research_id,
+                                  self.job_store.latest_event_id(research_id, RUN_START_EVENTS))
+        return Reply(stream=stream, mimetype='text/plain', headers=dict(STREAM_HEADERS))
+
+    def report(self, research_id: str, markdown: bool, if_none_match: Optional[str],
+               accept_encoding: Optional[str]) -> Reply:
+        """Finished report as JSON, or as a (compressed if accepted) text/markdown download"""
+        version = self.job_store.version(research_id)
+        if version is None:
+            return error('Research not found', 404)
+
+        etag = make_etag(research_id, version, 'markdown' if markdown else 'json')
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        result = self.job_store.get(research_id, ['status', 'topic', 'report'])
+        if result is None:
+            return error('Research not found', 404)
+        if result['status'] != 'completed':
+            return error('Research not completed yet', 400)
+
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if not markdown:
+            return Reply({'report': result['report'], 'topic': result['topic']}, headers=headers)
+
+        # Sent in chunks (compressed on the fly if accepted) so large reports start downloading at once
+        chunks = iter_chunks(result['report'] or '')
+        headers['Vary'] = 'Accept-Encoding'
+        headers['Content-Disposition'] = f'attachment; filename="{download_filename(result["topic"], "md")}"'
+        encoding = choose_encoding(accept_encoding)
+        if encoding:
+            chunks = compress_stream(chunks, encoding)
+            headers['Content-Encoding'] = encoding
+        return Reply(stream=chunks, mimetype='text/markdown', headers=headers)
+
+    @staticmethod
+    def search(query: str, limit: int) -> Reply:
+        """Past research most similar to `query` (topic, questions and answers)"""
+        query = query.strip()
+        if not query:
+            return error('Query parameter q is required', 400)
+        research_index = get_research_index()
+        if research_index is None:
+            return error('Research index is disabled', 404)
+        return Reply({'query': query, 'results': research_index.search(query, max(1, min(limit, 50)))})
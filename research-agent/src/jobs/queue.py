@@ -0,0 +1,562 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.jobs.scheduler import PRIORITIES, QueueFullError, estimate_wait
+from src.utils.config import Config
+
+try:
+    import redis
+except ImportError:  # optional; only needed for a redis:// JOB_QUEUE_URL
+    redis = None
+
+
+class JobQueue(ABC):
+    """Durable queue between web processes (submit, status) and `python -m src.worker` processes.
+
+    Jobs wait in priority order (then first-in first-out) and survive
+    restarts of either tier. A worker claims a job under a lease of
+    `lease_seconds` and keeps it alive with heartbeat(); when a lease lapses
+    (worker killed, host gone, process stalled) requeue_expired() puts the
+    job back in its old place, until it has been claimed `max_attempts`
+    times. At most `max_queue` jobs wait at once; submit() rejects beyond
+    that with QueueFullError, exactly like the in-process JobScheduler.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None, lease_seconds: Optional[float] = None,
+                 max_attempts: Optional[int] = None, expected_duration: Optional[float] = None):
+        self.max_queue = max_queue if max_queue is not None else Config.JOB_QUEUE_SIZE
+        self.lease_seconds = lease_seconds if lease_seconds is not None else Config.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts if max_attempts is not None else Config.JOB_MAX_ATTEMPTS
+        self.expected_duration = expected_duration if expected_duration is not None else Config.JOB_EXPECTED_SECONDS
+
+    @abstractmethod
+    def submit(self, job_id: str, payload: Dict, priority: str = "normal") -> int:
+        """Queue a job (a no-op if it is already queued or running); returns its 1-based queue position"""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Lease the next job to `worker_id`: {"id", "payload", "attempts", "waited"}, or None if idle"""
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, job_ids: List[str], slots: int) -> List[str]:
+        """Renew the leases on `job_ids` and announce the worker; returns the ids it still holds"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, duration: float) -> bool:
+        """Remove a finished job; False if the lease had already passed to another worker"""
+
+    @abstractmethod
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Put a held job back at its old place without counting the attempt (worker shutting down)"""
+
+    @abstractmethod
+    def requeue_expired(self) -> List[Tuple[str, bool]]:
+        """Re-queue jobs whose lease lapsed: (job_id, True), or (job_id, False) if out of attempts and dropped"""
+
+    @abstractmethod
+    def leave(self, worker_id: str):
+        """Forget a worker that is shutting down"""
+
+    @abstractmethod
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position among waiting jobs, None if the job is not waiting"""
+
+    @abstractmethod
+    def active(self, job_id: str) -> bool:
+        """Whether the job is waiting or held by a worker whose lease has not lapsed"""
+
+    @abstractmethod
+    def _snapshot(self) -> Dict:
+        """Counters and live state for estimates and stats(): running_elapsed, slots, workers,
+        queued, avg_duration, completed, rejected, requeued, dead, claimed, total_wait"""
+
+    def _retry_after(self, snapshot: Dict) -> float:
+        """Seconds until a queue slot is likely to free up"""
+        avg = snapshot["avg_duration"]
+        remaining = [max(1.0, avg - elapsed) for elapsed in snapshot["running_elapsed"]]
+        return min(remaining) if remaining else avg / max(1, snapshot["slots"])
+
+    def queue_status(self, job_id: str) -> Optional[Dict]:
+        """Queue position and estimated start time, or None if the job is not waiting"""
+        position = self.position(job_id)
+        if position is None:
+            return None
+        snapshot = self._snapshot()
+        wait = estimate_wait(snapshot["running_elapsed"], snapshot["slots"], position, snapshot["avg_duration"])
+        return {
+            "queue_position": position,
+            "estimated_start": (datetime.now() + timedelta(seconds=wait)).isoformat(),
+        }
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot()
+        claimed = snapshot["claimed"]
+        return {
+            # Same keys as JobScheduler.stats(); `workers` counts job slots of live worker processes
+            "workers": snapshot["slots"],
+            "worker_processes": snapshot["workers"],
+            "running": len(snapshot["running_elapsed"]),
+            "queued": snapshot["queued"],
+            "max_queue": self.max_queue,
+            "completed": snapshot["completed"],
+            "rejected": snapshot["rejected"],
+            "requeued": snapshot["requeued"],
+            "dead": snapshot["dead"],
+            "avg_duration_seconds": round(snapshot["avg_duration"], 1),
+            "avg_queue_wait_seconds": round(snapshot["total_wait"] / claimed, 2) if claimed else 0.0,
+        }
+
+
+class SQLiteJobQueue(JobQueue):
+    """Embedded queue in WAL mode for web and worker processes on one host (or a shared volume).
+
+    Every state change is one BEGIN IMMEDIATE transaction, so two workers
+    can never claim the same job and a lapsed lease is re-queued exactly
+    once no matter how many workers run the reaper. Waiting jobs are
+    served from an index on (worker, rank, enqueued_at).
+    """
+
+    def __init__(self, path: str, **options):
+        super().__init__(**options)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS job_queue (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                claimed_at REAL,
+                lease_expires REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_job_queue_ready ON job_queue(worker, rank, enqueued_at);
+            CREATE INDEX IF NOT EXISTS idx_job_queue_lease ON job_queue(lease_expires);
+            CREATE TABLE IF NOT EXISTS queue_workers (
+                id TEXT PRIMARY KEY,
+                slots INTEGER NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS queue_stats (
+                name TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _add_stat(conn: sqlite3.Connection, name: str, value: float):
+        conn.execute(
+            "INSERT INTO queue_stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, value)
+        )
+
+    def submit(self, job_id: str, payload: Dict, priority: str = "normal") -> int:
+        rank = PRIORITIES.get(priority, PRIORITIES["normal"])
+        full = None
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM job_queue WHERE id = ?", (job_id,)).fetchone() is None:
+                queued = conn.execute("SELECT COUNT(*) FROM job_queue WHERE worker IS NULL").fetchone()[0]
+                if queued >= self.max_queue:
+                    self._add_stat(conn, "rejected", 1)
+                    full = queued
+                else:
+                    conn.execute(
+                        "INSERT INTO job_queue (id, payload, rank, enqueued_at) VALUES (?, ?, ?, ?)",
+                        (job_id, json.dumps(payload), rank, time.time())
+                    )
+        if full is not None:
+            raise QueueFullError(full, self._retry_after(self._snapshot()))
+        return self.position(job_id) or 0
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, payload, attempts, enqueued_at FROM job_queue WHERE worker IS NULL "
+                "ORDER BY rank, enqueued_at, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE job_queue SET worker = ?, claimed_at = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (worker_id, now, now + self.lease_seconds, row["id"])
+            )
+            waited = now - row["enqueued_at"]
+            if row["attempts"] == 0:
+                self._add_stat(conn, "claimed", 1)
+                self._add_stat(conn, "total_wait", waited)
+        return {"id": row["id"], "payload": json.loads(row["payload"]),
+                "attempts": row["attempts"] + 1, "waited": waited}
+
+    def heartbeat(self, worker_id: str, job_ids: List[str], slots: int) -> List[str]:
+        now = time.time()
+        held = []
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO queue_workers (id, slots, seen_at) VALUES (?, ?, ?)",
+                         (worker_id, slots, now))
+            for job_id in job_ids:
+                cursor = conn.execute("UPDATE job_queue SET lease_expires = ? WHERE id = ? AND worker = ?",
+                                      (now + self.lease_seconds, job_id, worker_id))
+                if cursor.rowcount:
+                    held.append(job_id)
+        return held
+
+    def complete(self, job_id: str, worker_id: str, duration: float) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM job_queue WHERE id = ? AND worker = ?", (job_id, worker_id))
+            if not cursor.rowcount:
+                return False
+            self._add_stat(conn, "completed", 1)
+            row = conn.execute("SELECT value FROM queue_stats WHERE name = 'avg_duration'").fetchone()
+            avg = row["value"] if row is not None else self.expected_duration
+            conn.execute("INSERT OR REPLACE INTO queue_stats (name, value) VALUES ('avg_duration', ?)",
+                         (0.8 * avg + 0.2 * duration,))
+        return True
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE job_queue SET worker = NULL, claimed_at = NULL, lease_expires = NULL, "
+                "attempts = MAX(0, attempts - 1) WHERE id = ? AND worker = ?",
+                (job_id, worker_id)
+            )
+        return bool(cursor.rowcount)
+
+    def requeue_expired(self) -> List[Tuple[str, bool]]:
+        now = time.time()
+        outcomes = []
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, attempts FROM job_queue WHERE lease_expires < ?", (now,)
+            ).fetchall()
+            for row in rows:
+                if row["attempts"] >= self.max_attempts:
+                    conn.execute("DELETE FROM job_queue WHERE id = ?", (row["id"],))
+                    self._add_stat(conn, "dead", 1)
+                    outcomes.append((row["id"], False))
+                else:
+                    # Back in its old place: enqueued_at and rank are unchanged
+                    conn.execute(
+                        "UPDATE job_queue SET worker = NULL, claimed_at = NULL, lease_expires = NULL WHERE id = ?",
+                        (row["id"],)
+                    )
+                    self._add_stat(conn, "requeued", 1)
+                    outcomes.append((row["id"], True))
+            # Workers that vanished without leave() drop out of the registry after a while
+            conn.execute("DELETE FROM queue_workers WHERE seen_at < ?", (now - 10 * self.lease_seconds,))
+        return outcomes
+
+    def leave(self, worker_id: str):
+        self._connect().execute("DELETE FROM queue_workers WHERE id = ?", (worker_id,))
+
+    def position(self, job_id: str) -> Optional[int]:
+        conn = self._connect()
+        row = conn.execute("SELECT rank, enqueued_at, worker FROM job_queue WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row["worker"] is not None:
+            return None
+        ahead = conn.execute(
+            "SELECT COUNT(*) FROM job_queue WHERE worker IS NULL AND (rank < ? OR (rank = ? AND "
+            "(enqueued_at < ? OR (enqueued_at = ? AND id < ?))))",
+            (row["rank"], row["rank"], row["enqueued_at"], row["enqueued_at"], job_id)
+        ).fetchone()[0]
+        return ahead + 1
+
+    def active(self, job_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM job_queue WHERE id = ? AND (worker IS NULL OR lease_expires >= ?)",
+            (job_id, time.time())
+        ).fetchone()
+        return row is not None
+
+    def _snapshot(self) -> Dict:
+        now = time.time()
+        conn = self._connect()
+        running = [row[0] for row in conn.execute("SELECT claimed_at FROM job_queue WHERE worker IS NOT NULL")]
+        queued = conn.execute("SELECT COUNT(*) FROM job_queue WHERE worker IS NULL").fetchone()[0]
+        workers, slots = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(slots), 0) FROM queue_workers WHERE seen_at > ?",
+            (now - self.lease_seconds,)
+        ).fetchone()
+        counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM queue_stats")}
+        return {
+            "running_elapsed": [now - claimed_at for claimed_at in running],
+            "slots": slots,
+            "workers": workers,
+            "queued": queued,
+            "avg_duration": counters.get("avg_duration", self.expected_duration),
+            "total_wait": counters.get("total_wait", 0.0),
+            **{name: int(counters.get(name, 0)) for name in ("completed", "rejected", "requeued", "dead", "claimed")},
+        }
+
+
+# Lua scripts keep each Redis queue transition atomic (see RedisJobQueue for the key layout)
+_REDIS_SUBMIT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then return 0 end
+local waiting = redis.call('ZCARD', KEYS[3]) + redis.call('ZCARD', KEYS[4]) + redis.call('ZCARD', KEYS[5])
+if waiting >= tonumber(ARGV[5]) then
+    redis.call('HINCRBY', KEYS[2], 'rejected', 1)
+    return -1
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[3 + tonumber(ARGV[3])], ARGV[4], ARGV[1])
+return 1
+"""
+
+_REDIS_CLAIM = """
+for i = 6, 8 do
+    local first = redis.call('ZRANGE', KEYS[i], 0, 0)
+    if #first > 0 then
+        local id = first[1]
+        redis.call('ZREM', KEYS[i], id)
+        redis.call('ZADD', KEYS[2], ARGV[3], id)
+        redis.call('HSET', KEYS[3], id, ARGV[1])
+        redis.call('HSET', KEYS[4], id, ARGV[2])
+        local attempts = redis.call('HINCRBY', KEYS[5], id, 1)
+        return {id, redis.call('HGET', KEYS[1], id), attempts}
+    end
+end
+return false
+"""
+
+_REDIS_HEARTBEAT = """
+local held = {}
+for i = 3, #ARGV do
+    if redis.call('HGET', KEYS[2], ARGV[i]) == ARGV[1] then
+        redis.call('ZADD', KEYS[1], ARGV[2], ARGV[i])
+        table.insert(held, ARGV[i])
+    end
+end
+return held
+"""
+
+_REDIS_COMPLETE = """
+if redis.call('HGET', KEYS[3], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('HDEL', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('HDEL', KEYS[5], ARGV[1])
+return 1
+"""
+
+_REDIS_RELEASE = """
+if redis.call('HGET', KEYS[3], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+redis.call('HINCRBY', KEYS[5], ARGV[1], -1)
+local job = cjson.decode(redis.call('HGET', KEYS[1], ARGV[1]))
+redis.call('ZADD', KEYS[6 + job.rank], job.seq, ARGV[1])
+return 1
+"""
+
+_REDIS_REQUEUE_EXPIRED = """
+local outcomes = {}
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', '(' .. ARGV[1])) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('HDEL', KEYS[3], id)
+    redis.call('HDEL', KEYS[4], id)
+    local record = redis.call('HGET', KEYS[1], id)
+    if record and tonumber(redis.call('HGET', KEYS[5], id) or '0') < tonumber(ARGV[2]) then
+        local job = cjson.decode(record)
+        redis.call('ZADD', KEYS[6 + job.rank], job.seq, id)
+        redis.call('HINCRBY', KEYS[9], 'requeued', 1)
+        table.insert(outcomes, id)
+        table.insert(outcomes, 1)
+    else
+        redis.call('HDEL', KEYS[1], id)
+        redis.call('HDEL', KEYS[5], id)
+        redis.call('HINCRBY', KEYS[9], 'dead', 1)
+        table.insert(outcomes, id)
+        table.insert(outcomes, 0)
+    end
+end
+return outcomes
+"""
+
+
+class RedisJobQueue(JobQueue):
+    """Queue on a Redis server, for web and worker processes spread over several hosts.
+
+    Keys (all under one hash tag, so they stay in one cluster slot):
+    `jobs` hash of job records, one `queued:<rank>` sorted set per priority
+    scored by submission sequence, `leases` sorted set of lease expiry
+    times, `owners`/`claimed`/`attempts` hashes per leased job, `workers`
+    hash of live workers and `stats` counters. Every transition is a Lua
+    script, so claims and re-queues are atomic across all clients.
+    """
+
+    def __init__(self, url: str, prefix: str = "{research_queue}", **options):
+        if redis is None:
+            raise ImportError("A redis:// job queue requires redis-py: pip install redis")
+        super().__init__(**options)
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.ranks = sorted(set(PRIORITIES.values()))
+        key = lambda name: f"{prefix}:{name}"
+        self.k_jobs, self.k_leases, self.k_owners = key("jobs"), key("leases"), key("owners")
+        self.k_claimed, self.k_attempts, self.k_stats = key("claimed"), key("attempts"), key("stats")
+        self.k_workers, self.k_seq = key("workers"), key("seq")
+        self.k_queued = [key(f"queued:{rank}") for rank in self.ranks]
+        self._submit = self.redis.register_script(_REDIS_SUBMIT)
+        self._claim = self.redis.register_script(_REDIS_CLAIM)
+        self._heartbeat = self.redis.register_script(_REDIS_HEARTBEAT)
+        self._complete = self.redis.register_script(_REDIS_COMPLETE)
+        self._release = self.redis.register_script(_REDIS_RELEASE)
+        self._requeue_expired = self.redis.register_script(_REDIS_REQUEUE_EXPIRED)
+
+    def submit(self, job_id: str, payload: Dict, priority: str = "normal") -> int:
+        rank = PRIORITIES.get(priority, PRIORITIES["normal"])
+        seq = self.redis.incr(self.k_seq)
+        record = json.dumps({"payload": payload, "rank": rank, "seq": seq, "enqueued_at": time.time()})
+        outcome = self._submit(keys=[self.k_jobs, self.k_stats] + self.k_queued,
+                               args=[job_id, record, rank, seq, self.max_queue])
+        if outcome == -1:
+            snapshot = self._snapshot()
+            raise QueueFullError(snapshot["queued"], self._retry_after(snapshot))
+        return self.position(job_id) or 0
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        now = time.time()
+        claimed = self._claim(
+            keys=[self.k_jobs, self.k_leases, self.k_owners, self.k_claimed, self.k_attempts] + self.k_queued,
+            args=[worker_id, now, now + self.lease_seconds]
+        )
+        if not claimed:
+            return None
+        job_id, record, attempts = claimed
+        job = json.loads(record)
+        waited = now - job["enqueued_at"]
+        if int(attempts) == 1:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(self.k_stats, "claimed", 1)
+            pipe.hincrbyfloat(self.k_stats, "total_wait", waited)
+            pipe.execute()
+        return {"id": job_id, "payload": job["payload"], "attempts": int(attempts), "waited": waited}
+
+    def heartbeat(self, worker_id: str, job_ids: List[str], slots: int) -> List[str]:
+        now = time.time()
+        self.redis.hset(self.k_workers, worker_id, json.dumps({"slots": slots, "seen_at": now}))
+        if not job_ids:
+            return []
+        return list(self._heartbeat(keys=[self.k_leases, self.k_owners],
+                                    args=[worker_id, now + self.lease_seconds] + list(job_ids)))
+
+    def complete(self, job_id: str, worker_id: str, duration: float) -> bool:
+        done = self._complete(keys=[self.k_jobs, self.k_leases, self.k_owners, self.k_claimed, self.k_attempts],
+                              args=[job_id, worker_id])
+        if not done:
+            return False
+        # Counters only feed estimates, so a read-modify-write race between workers is harmless
+        avg = float(self.redis.hget(self.k_stats, "avg_duration") or self.expected_duration)
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self.k_stats, "completed", 1)
+        pipe.hset(self.k_stats, "avg_duration", 0.8 * avg + 0.2 * duration)
+        pipe.execute()
+        return True
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        return bool(self._release(
+            keys=[self.k_jobs, self.k_leases, self.k_owners, self.k_claimed, self.k_attempts] + self.k_queued,
+            args=[job_id, worker_id]
+        ))
+
+    def requeue_expired(self) -> List[Tuple[str, bool]]:
+        now = time.time()
+        flat = self._requeue_expired(
+            keys=[self.k_jobs, self.k_leases, self.k_owners, self.k_claimed, self.k_attempts]
+                 + self.k_queued + [self.k_stats],
+            args=[now, self.max_attempts]
+        )
+        outcomes = [(flat[i], bool(int(flat[i + 1]))) for i in range(0, len(flat), 2)]
+        stale = [worker_id for worker_id, info in self.redis.hgetall(self.k_workers).items()
+                 if json.loads(info)["seen_at"] < now - 10 * self.lease_seconds]
+        if stale:
+            self.redis.hdel(self.k_workers, *stale)
+        return outcomes
+
+    def leave(self, worker_id: str):
+        self.redis.hdel(self.k_workers, worker_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        pipe = self.redis.pipeline()
+        for key in self.k_queued:
+            pipe.zrank(key, job_id)
+            pipe.zcard(key)
+        replies = pipe.execute()
+        ahead = 0
+        for rank_in_queue, size in zip(replies[::2], replies[1::2]):
+            if rank_in_queue is not None:
+                return ahead + rank_in_queue + 1
+            ahead += size
+        return None
+
+    def active(self, job_id: str) -> bool:
+        pipe = self.redis.pipeline()
+        pipe.hexists(self.k_jobs, job_id)
+        pipe.zscore(self.k_leases, job_id)
+        exists, lease_expires = pipe.execute()
+        # Waiting jobs have no lease; leased ones count until the lease lapses
+        return bool(exists) and (lease_expires is None or lease_expires >= time.time())
+
+    def _snapshot(self) -> Dict:
+        now = time.time()
+        pipe = self.redis.pipeline()
+        pipe.hvals(self.k_claimed)
+        pipe.hvals(self.k_workers)
+        pipe.hgetall(self.k_stats)
+        for key in self.k_queued:
+            pipe.zcard(key)
+        claimed, workers, counters, *queued = pipe.execute()
+        live = [json.loads(info) for info in workers]
+        live = [info for info in live if info["seen_at"] > now - self.lease_seconds]
+        return {
+            "running_elapsed": [now - float(claimed_at) for claimed_at in claimed],
+            "slots": sum(info["slots"] for info in live),
+            "workers": len(live),
+            "queued": sum(queued),
+            "avg_duration": float(counters.get("avg_duration", self.expected_duration)),
+            "total_wait": float(counters.get("total_wait", 0.0)),
+            **{name: int(counters.get(name, 0)) for name in ("completed", "rejected", "requeued", "dead", "claimed")},
+        }
+
+
+def create_job_queue(url: str, **options) -> JobQueue:
+    """Build a queue from a URL: `sqlite:///path/to/queue.db` (embedded) or `redis://host:6379/0`"""
+    if url.startswith("sqlite:///"):
+        return SQLiteJobQueue(url[len("sqlite:///"):], **options)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobQueue(url, **options)
+    raise ValueError(f"Unsupported job queue URL: {url}")
@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from src.agents.agent_pool import AgentPool
+from src.agents.callbacks import EventSink
+from src.agents.research_agent import ResearchCancelled
+from src.jobs.scheduler import PRIORITIES
+from src.jobs.store import JobStore
+from src.utils.checkpoint import get_checkpoint_store
+from src.utils.config import Config
+from src.utils.metrics import MetricsRegistry, get_metrics
+
+
+class JobRunner:
+    """Runs research jobs and keeps their records in the job store current.
+
+    Progress events and the progress percentage are written as the job runs,
+    the results (or the error) when it ends. The threaded app and queue
+    workers (src/worker.py) call run() on their own threads; the ASGI app
+    awaits arun() on its event loop, which hands every store write to one
+    writer thread (in order) so the loop never waits on the database. A run whose `cancel` flag is set stops
+    before its next question and leaves the record to whoever took the job
+    over.
+    """
+
+    def __init__(self, job_store: JobStore, agent_pool: AgentPool, metrics: Optional[MetricsRegistry] = None):
+        self.job_store = job_store
+        self.agent_pool = agent_pool
+        self.metrics = metrics or get_metrics()
+        # Store writes of arun() jobs; built on first use
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Monotonic time of this runner's last pass over finished jobs' events
+        self._pruned_at = float("-inf")
+
+    def mark_processing(self, research_id: str):
+        self.job_store.update(
+            research_id,
+            status='processing',
+            processing_started_at=datetime.now().isoformat(),
+            queue_position=None,
+            estimated_start=None
+        )
+        self.job_store.append_event(research_id, 'job_started', {})
+
+    def event_sink(self, research_id: str, total_questions: int,
+                   cancel: Optional[threading.Event] = None,
+                   on_progress: Optional[Callable[[], None]] = None,
+                   writer: Optional[ThreadPoolExecutor] = None) -> EventSink:
+        """Persist agent progress events and keep the record's progress percentage current.
+
+        With a `writer`, the sink only queues the writes on it and returns at once.
+        """
+        finished = []
+        lock = threading.Lock()
+
+        def sink(event_type, data):
+            if cancel is not None and cancel.is_set():
+                # The job may already be running elsewhere; keep its event log to that run
+                return
+            if on_progress is not None:
+                on_progress()
+            self.job_store.append_event(research_id, event_type, data)
+            if event_type == 'question_finished':
+                with lock:
+                    finished.append(data.get('index'))
+                    # Questions account for 90% of the work, the report for the rest
+                    progress = int(90 * len(finished) / max(1, total_questions))
+                self.job_store.update(research_id, progress=progress)
+
+        def write(event_type, data):
+            try:
+                sink(event_type, data)
+            except Exception as e:
+                print(f"⚠️ Failed to publish {event_type} event: {e}")
+
+        if writer is not None:
+            return lambda event_type, data: writer.submit(write, event_type, data)
+        return sink
+
+    def _store_writer(self) -> ThreadPoolExecutor:
+        # A single thread keeps every job's events in the order they were emitted
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store-writer")
+            return self._writer
+
+    @staticmethod
+    def _configure(agent, fresh: bool, priority: str):
+        # `fresh` jobs skip cached LLM answers; the pool resets this on check-in
+        agent.set_cache_bypass(fresh)
+        # Job priority also orders this job's LLM calls against other jobs' in the quota planner
+        agent.set_priority(PRIORITIES.get(priority, PRIORITIES['normal']))
+
+    def run(self, research_id: str, topic: str, questions, fresh: bool = False, priority: str = 'normal',
+            cancel: Optional[threading.Event] = None, on_progress: Optional[Callable[[], None]] = None):
+        """Research job executed on a scheduler worker thread; `on_progress` is called on every event"""
+        on_event = self.event_sink(research_id, len(questions), cancel, on_progress)
+        started = time.perf_counter()
+        try:
+            with self.agent_pool.checkout() as agent:
+                self._configure(agent, fresh, priority)
+                # Checkpointed per question, so /resume picks up where a failed run stopped
+                results = agent.conduct_research(topic, questions, on_event=on_event, research_id=research_id,
+                                                 cancel=cancel)
+                failed = self._failed_questions(results)
+                if not failed:
+                    # Streamed so watchers see the report as it is written (report_chunk events);
+                    # the stored report is exactly the concatenated chunks
+                    report = "".join(agent.generate_report_stream(results, topic, on_event=on_event))
+                    if cancel is not None and cancel.is_set():
+                        raise ResearchCancelled("Research cancelled")
+                    agent.record_research(research_id, topic, results, report)
+            if failed:
+                self._incomplete(research_id, results, failed)
+            else:
+                self._completed(research_id, results, report)
+        except ResearchCancelled:
+            print(f"🛑 Stopped {research_id}: cancelled")
+        except Exception as e:
+            self._failed(research_id, e)
+        finally:
+            self.metrics.observe('research_stage_seconds', time.perf_counter() - started, stage='job')
+
+    async def arun(self, research_id: str, topic: str, questions, fresh: bool = False, priority: str = 'normal'):
+        """run() as a coroutine; the agent pool must be at least as large as the number of worker tasks"""
+        loop = asyncio.get_running_loop()
+        writer = self._store_writer()
+        on_event = self.event_sink(research_id, len(questions), writer=writer)
+        started = time.perf_counter()
+        try:
+            # Checking out may build an agent
+            agent = await asyncio.to_thread(self.agent_pool.acquire)
+            try:
+                self._configure(agent, fresh, priority)
+                results = await agent.aconduct_research(topic, questions, on_event=on_event,
+                                                        research_id=research_id)
+                failed = self._failed_questions(results)
+                if not failed:
+                    report = "".join([chunk async for chunk in
+                                      agent.agenerate_report_stream(results, topic, on_event=on_event)])
+                    await asyncio.to_thread(agent.record_research, research_id, topic, results, report)
+            finally:
+                self.agent_pool.release(agent)
+            # Queued behind the job's events
+            if failed:
+                await loop.run_in_executor(writer, self._incomplete, research_id, results, failed)
+            else:
+                await loop.run_in_executor(writer, self._completed, research_id, results, report)
+        except Exception as e:
+            await loop.run_in_executor(writer, self._failed, research_id, e)
+        finally:
+            self.metrics.observe('research_stage_seconds', time.perf_counter() - started, stage='job')
+
+    def _completed(self, research_id: str, results, report: str):
+        self.job_store.update(
+            research_id,
+            status='completed',
+            results=results,
+            report=report,
+            progress=100,
+            completed_at=datetime.now().isoformat()
+        )
+        self.job_store.append_event(research_id, 'job_completed', {})
+        self.metrics.inc('research_jobs_total', status='completed')
+        checkpoints = get_checkpoint_store()
+        if checkpoints is not None:
+            checkpoints.delete(research_id)
+        self._prune_events()
+
+    @staticmethod
+    def _failed_questions(results) -> List[str]:
+        # Per-question errors (e.g. a 429 after retries) come back as answers
+        return [question for question, answer in results.items() if str(answer).startswith("Research failed")]
+
+    def _incomplete(self, research_id: str, results, failed: List[str]):
+        """Some questions failed: no report, and the checkpoint stays so /resume redoes only those"""
+        error = f"{len(failed)} of {len(results)} questions failed; resume to retry them"
+        self.job_store.update(
+            research_id,
+            status='error',
+            results=results,
+            failed_questions=failed,
+            error=error,
+            completed_at=datetime.now().isoformat()
+        )
+        self.job_store.append_event(research_id, 'job_failed', {'error': error, 'failed_questions': failed})
+        self.metrics.inc('research_jobs_total', status='error')
+        self._prune_events()
+
+    def _failed(self, research_id: str, error: Exception):
+        self.job_store.update(
+            research_id,
+            status='error',
+            error=str(error),
+            completed_at=datetime.now().isoformat()
+        )
+        self.job_store.append_event(research_id, 'job_failed', {'error': str(error)})
+        self.metrics.inc('research_jobs_total', status='error')
+        self._prune_events()
+
+    def _prune_events(self):
+        """Drop events of jobs finished more than JOB_EVENT_RETENTION_MINUTES ago (at most once a minute)"""
+        retention = Config.JOB_EVENT_RETENTION_MINUTES * 60
+        now = time.monotonic()
+        with self._lock:
+            if not retention or now - self._pruned_at < 60:
+                return
+            self._pruned_at = now
+        try:
+            pruned = self.job_store.prune_events(time.time() - retention)
+        except Exception as e:
+            print(f"⚠️ Could not prune job events: {e}")
+            return
+        if pruned:
+            print(f"🧹 Pruned {pruned} events of jobs finished over {Config.JOB_EVENT_RETENTION_MINUTES:g} min ago")
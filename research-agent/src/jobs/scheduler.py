@@ -0,0 +1,203 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from src.utils.metrics import get_metrics
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+def estimate_wait(running_elapsed: List[float], slots: int, position: int, avg_duration: float) -> float:
+    """Seconds until the job at `position` starts, simulating `slots` workers taking the jobs ahead"""
+    free_at = [max(0.0, avg_duration - elapsed) for elapsed in running_elapsed]
+    free_at += [0.0] * (slots - len(free_at))
+    if not free_at:
+        # No worker alive to take it; assume one turns up
+        free_at = [avg_duration]
+    heapq.heapify(free_at)
+    for _ in range(position - 1):
+        heapq.heappush(free_at, heapq.heappop(free_at) + avg_duration)
+    return free_at[0]
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler cannot admit another job"""
+
+    def __init__(self, queue_size: int, retry_after: float):
+        super().__init__(f"Research queue is full ({queue_size} jobs waiting)")
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+
+
+class JobScheduler:
+    """Fixed pool of worker threads fed from a bounded priority queue.
+
+    Jobs with the same priority run first-in first-out. Once `max_queue`
+    jobs are waiting, submit() rejects immediately with QueueFullError so
+    a burst cannot pile hundreds of threads onto the same Gemini quota.
+    """
+
+    def __init__(self, workers: int, max_queue: int, expected_duration: float = 60.0,
+                 on_start: Optional[Callable[[str], None]] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.on_start = on_start
+        # Exponential moving average of job run time, used for start estimates
+        self.avg_duration = expected_duration
+        self._heap = []
+        self._seq = itertools.count()
+        self._running = {}
+        self._cond = threading.Condition()
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self._start_workers()
+
+    def _start_workers(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"research-worker-{i}", daemon=True)
+            thread.start()
+
+    def submit(self, job_id: str, func: Callable[[], None], priority: str = "normal") -> int:
+        """Queue a job; returns its 1-based queue position"""
+        rank = PRIORITIES.get(priority, PRIORITIES["normal"])
+        with self._cond:
+            if len(self._heap) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(len(self._heap), self._retry_after_locked())
+            heapq.heappush(self._heap, (rank, next(self._seq), job_id, func, time.monotonic()))
+            self._cond.notify()
+            return self._position_locked(job_id)
+
+    def _ordered_locked(self) -> List[str]:
+        return [entry[2] for entry in sorted(self._heap)]
+
+    def _position_locked(self, job_id: str) -> Optional[int]:
+        try:
+            return self._ordered_locked().index(job_id) + 1
+        except ValueError:
+            return None
+
+    def _retry_after_locked(self) -> float:
+        """Seconds until a queue slot is likely to free up"""
+        now = time.monotonic()
+        remaining = [max(1.0, self.avg_duration - (now - started)) for started in self._running.values()]
+        return min(remaining) if remaining else self.avg_duration / max(1, self.workers)
+
+    def position(self, job_id: str) -> Optional[int]:
+        with self._cond:
+            return self._position_locked(job_id)
+
+    def active(self, job_id: str) -> bool:
+        """Whether the job is waiting or running in this process"""
+        with self._cond:
+            return job_id in self._running or self._position_locked(job_id) is not None
+
+    def queue_status(self, job_id: str) -> Optional[Dict]:
+        """Queue position and estimated start time, or None if the job is not waiting"""
+        with self._cond:
+            ordered = self._ordered_locked()
+            if job_id not in ordered:
+                return None
+            position = ordered.index(job_id) + 1
+
+            now = time.monotonic()
+            wait = estimate_wait([now - started for started in self._running.values()],
+                                 self.workers, position, self.avg_duration)
+
+        return {
+            "queue_position": position,
+            "estimated_start": (datetime.now() + timedelta(seconds=wait)).isoformat(),
+        }
+
+    def _take_locked(self):
+        """Pop the next job and mark it running; returns (job_id, func, started)"""
+        _, _, job_id, func, queued_at = heapq.heappop(self._heap)
+        started = time.monotonic()
+        self._running[job_id] = started
+        self.total_wait += started - queued_at
+        get_metrics().observe("research_stage_seconds", started - queued_at, stage="queue")
+        return job_id, func, started
+
+    def _finish(self, job_id: str, started: float):
+        duration = time.monotonic() - started
+        with self._cond:
+            del self._running[job_id]
+            self.completed += 1
+            self.avg_duration = 0.8 * self.avg_duration + 0.2 * duration
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                job_id, func, started = self._take_locked()
+
+            try:
+                if self.on_start is not None:
+                    self.on_start(job_id)
+                func()
+            except Exception as e:
+                print(f"❌ Job {job_id} crashed: {e}")
+            finally:
+                self._finish(job_id, started)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._heap),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_duration_seconds": round(self.avg_duration, 1),
+                "avg_queue_wait_seconds": round(self.total_wait / self.completed, 2) if self.completed else 0.0,
+            }
+
+
+class AsyncJobScheduler(JobScheduler):
+    """JobScheduler whose workers are tasks on one event loop and whose jobs are coroutines.
+
+    Admission, priorities, queue positions and start estimates are the same;
+    `workers` can be in the hundreds because a waiting job holds no thread.
+    Call start() from the running loop (server startup) before submitting.
+    """
+
+    def _start_workers(self):
+        self._loop = None
+        self._ready = None
+        self._tasks = []
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        # Counts queued jobs; each release lets one worker task take a job
+        self._ready = asyncio.Semaphore(0)
+        self._tasks = [self._loop.create_task(self._aworker()) for _ in range(self.workers)]
+
+    def submit(self, job_id: str, func: Callable[[], Awaitable[None]], priority: str = "normal") -> int:
+        if self._loop is None:
+            raise RuntimeError("AsyncJobScheduler.start() must be called before submitting jobs")
+        position = super().submit(job_id, func, priority)
+        self._loop.call_soon_threadsafe(self._ready.release)
+        return position
+
+    async def _aworker(self):
+        while True:
+            await self._ready.acquire()
+            with self._cond:
+                job_id, func, started = self._take_locked()
+
+            try:
+                if self.on_start is not None:
+                    # Usually a job store write; done before the job's own events
+                    await asyncio.to_thread(self.on_start, job_id)
+                await func()
+            except Exception as e:
+                print(f"❌ Job {job_id} crashed: {e}")
+            finally:
+                self._finish(job_id, started)
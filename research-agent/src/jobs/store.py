@@ -0,0 +1,300 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+# Fields kept in their own columns; anything else lives in the `extra` JSON blob
+_COLUMNS = ("status", "topic", "started_at", "completed_at", "questions", "results", "report", "error")
+_JSON_COLUMNS = ("questions", "results")
+_SUMMARY_FIELDS = ("id", "topic", "status", "started_at", "completed_at")
+_FINISHED = ("completed", "error")
+
+
+class JobStore(ABC):
+    """Interface for research job records shared by every web worker"""
+
+    @abstractmethod
+    def create(self, job_id: str, record: Dict):
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, **fields):
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """The job record, or only `fields` of it (cheaper: large columns are not loaded)"""
+
+    @abstractmethod
+    def version(self, job_id: str) -> Optional[float]:
+        """Time of the record's last write (None if missing); changes whenever the record does"""
+
+    @abstractmethod
+    def delete(self, job_id: str):
+        ...
+
+    @abstractmethod
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Summaries of the most recently started jobs, oldest first"""
+
+    @abstractmethod
+    def append_event(self, job_id: str, event_type: str, data: Dict) -> int:
+        """Record a progress event; returns its id (increasing per store)"""
+
+    @abstractmethod
+    def events_since(self, job_id: str, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        """Events for a job with id greater than `after_id`, oldest first"""
+
+    @abstractmethod
+    def latest_event_id(self, job_id: str, event_types: Iterable[str]) -> int:
+        """Id of the job's most recent event of one of `event_types`, 0 if it has none"""
+
+    @abstractmethod
+    def prune_events(self, finished_before: float) -> int:
+        """Drop the events of jobs that finished (last written) before this time; returns events dropped"""
+
+
+class MemoryJobStore(JobStore):
+    """Per-process dict store (single worker or tests only)"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._versions = {}
+        self._events = {}
+        self._next_event_id = 1
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, record: Dict):
+        with self._lock:
+            self._jobs[job_id] = dict(record)
+            self._versions[job_id] = time.time()
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            self._versions[job_id] = time.time()
+
+    def get(self, job_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            if fields is not None:
+                return {name: record[name] for name in fields if name in record}
+            return dict(record)
+
+    def version(self, job_id: str) -> Optional[float]:
+        with self._lock:
+            return self._versions.get(job_id)
+
+    def delete(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._versions.pop(job_id, None)
+            self._events.pop(job_id, None)
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        with self._lock:
+            items = list(self._jobs.items())[-limit:]
+        return [
+            {"id": job_id, **{field: record.get(field, "") for field in _SUMMARY_FIELDS[1:]}}
+            for job_id, record in items
+        ]
+
+    def append_event(self, job_id: str, event_type: str, data: Dict) -> int:
+        with self._lock:
+            event_id = self._next_event_id
+            self._next_event_id += 1
+            self._events.setdefault(job_id, []).append(
+                {"id": event_id, "type": event_type, "data": data}
+            )
+            return event_id
+
+    def events_since(self, job_id: str, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        with self._lock:
+            events = [e for e in self._events.get(job_id, []) if e["id"] > after_id]
+        return events[:limit]
+
+    def latest_event_id(self, job_id: str, event_types: Iterable[str]) -> int:
+        event_types = set(event_types)
+        with self._lock:
+            return max((e["id"] for e in self._events.get(job_id, []) if e["type"] in event_types), default=0)
+
+    def prune_events(self, finished_before: float) -> int:
+        with self._lock:
+            expired = [job_id for job_id in self._events
+                       if self._jobs.get(job_id, {}).get("status") in _FINISHED
+                       and self._versions[job_id] < finished_before]
+            return sum(len(self._events.pop(job_id)) for job_id in expired)
+
+
+class SQLiteJobStore(JobStore):
+    """Embedded store in WAL mode so every gunicorn worker sees the same jobs.
+
+    Lookups go through the primary key and history through indexes on the
+    timestamps, so reads stay O(log n); each write is a single small
+    transaction with synchronous=NORMAL, which is durable across process
+    crashes and cheap enough for dozens of completions per minute.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                topic TEXT,
+                started_at TEXT,
+                completed_at TEXT,
+                updated_at REAL NOT NULL,
+                questions TEXT,
+                results TEXT,
+                report TEXT,
+                error TEXT,
+                extra TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, started_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_started_at ON jobs(started_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_completed_at ON jobs(completed_at);
+            CREATE TABLE IF NOT EXISTS job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, id);
+            CREATE INDEX IF NOT EXISTS idx_job_events_created ON job_events(created_at);
+        """)
+
+    @staticmethod
+    def _split(fields: Dict):
+        columns, extra = {}, {}
+        for name, value in fields.items():
+            if name in _COLUMNS:
+                columns[name] = json.dumps(value) if name in _JSON_COLUMNS and value is not None else value
+            else:
+                extra[name] = value
+        return columns, extra
+
+    def create(self, job_id: str, record: Dict):
+        columns, extra = self._split(record)
+        columns.setdefault("status", "queued")
+        names = ["id", "updated_at", "extra"] + list(columns)
+        values = [job_id, time.time(), json.dumps(extra)] + list(columns.values())
+        self._connect().execute(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            values
+        )
+
+    def update(self, job_id: str, **fields):
+        columns, extra = self._split(fields)
+        assignments = [f"{name} = ?" for name in columns] + ["updated_at = ?"]
+        values = list(columns.values()) + [time.time()]
+        if extra:
+            assignments.append("extra = json_patch(extra, ?)")
+            values.append(json.dumps(extra))
+        self._connect().execute(
+            f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?",
+            values + [job_id]
+        )
+
+    def get(self, job_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        if fields is None:
+            columns, need_extra = list(_COLUMNS), True
+        else:
+            # Only read (and JSON-decode) the columns asked for; the rest live in `extra`
+            columns = [name for name in _COLUMNS if name in fields]
+            need_extra = any(name not in _COLUMNS for name in fields)
+        selected = columns + (["extra"] if need_extra else [])
+        row = self._connect().execute(
+            f"SELECT {', '.join(selected) or 'id'} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row["extra"]) if need_extra else {}
+        for name in columns:
+            value = row[name]
+            if value is None:
+                continue
+            record[name] = json.loads(value) if name in _JSON_COLUMNS else value
+        if fields is not None:
+            return {name: record[name] for name in fields if name in record}
+        return record
+
+    def version(self, job_id: str) -> Optional[float]:
+        row = self._connect().execute("SELECT updated_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["updated_at"] if row is not None else None
+
+    def delete(self, job_id: str):
+        conn = self._connect()
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        rows = self._connect().execute(
+            f"SELECT {', '.join(_SUMMARY_FIELDS)} FROM jobs ORDER BY started_at DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [{name: row[name] or "" for name in _SUMMARY_FIELDS} for row in reversed(rows)]
+
+    def append_event(self, job_id: str, event_type: str, data: Dict) -> int:
+        cursor = self._connect().execute(
+            "INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, event_type, json.dumps(data), time.time())
+        )
+        return cursor.lastrowid
+
+    def events_since(self, job_id: str, after_id: int = 0, limit: int = 500) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT id, type, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (job_id, after_id, limit)
+        ).fetchall()
+        return [{"id": row["id"], "type": row["type"], "data": json.loads(row["data"])} for row in rows]
+
+    def latest_event_id(self, job_id: str, event_types: Iterable[str]) -> int:
+        event_types = list(event_types)
+        row = self._connect().execute(
+            f"SELECT MAX(id) FROM job_events WHERE job_id = ? AND type IN ({', '.join('?' * len(event_types))})",
+            (job_id, *event_types)
+        ).fetchone()
+        return row[0] or 0
+
+    def prune_events(self, finished_before: float) -> int:
+        # Only events older than the cutoff are scanned; a job's events predate its last write
+        cursor = self._connect().execute(
+            f"""DELETE FROM job_events WHERE created_at < ? AND job_id IN (
+                   SELECT id FROM jobs WHERE status IN ({', '.join('?' * len(_FINISHED))}) AND updated_at < ?)""",
+            (finished_before, *_FINISHED, finished_before)
+        )
+        return cursor.rowcount
+
+
+def create_job_store(url: str) -> JobStore:
+    """Build a store from a URL: `sqlite:///path/to/jobs.db` or `memory://`"""
+    if url.startswith("memory://"):
+        return MemoryJobStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteJobStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported job store URL: {url}")
@@ -2,27 +2,43 @@ import argparse
 import json
 from datetime import datetime
 from src.agents.research_agent import ResearchAgent
+from src.utils.checkpoint import get_checkpoint_store
+from src.utils.config import Config
 
 def main():
     parser = argparse.ArgumentParser(description="Research Agent")
     parser.add_argument("--topic", required=True, help="Research topic")
     parser.add_argument("--questions", nargs="+", required=True, help="Research questions")
     parser.add_argument("--output", help="Output file path")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="Wait for the whole report instead of streaming it to the file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached LLM responses and ask the model again")
+    parser.add_argument("--resume", metavar="RESEARCH_ID",
+                        help="Resume an interrupted run, skipping questions already answered")
+    parser.add_argument("--engine", choices=["react", "graph"],
+                        help="Research engine (default: RESEARCH_ENGINE, normally react)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Do not print the agent's step-by-step reasoning")
     
     args = parser.parse_args()
+    if args.engine:
+        Config.RESEARCH_ENGINE = args.engine
+    if args.quiet:
+        Config.AGENT_VERBOSE = False
     
     # Initialize research agent
     agent = ResearchAgent()
+    agent.set_cache_bypass(args.no_cache)
     
     print(f"Starting research on: {args.topic}")
     print(f"Research questions: {args.questions}")
     print("-" * 50)
     
-    # Conduct research
-    results = agent.conduct_research(args.topic, args.questions)
-    
-    # Generate report
-    report = agent.generate_report(results, args.topic)
+    # Conduct research, checkpointing each answered question under this id
+    research_id = args.resume or f"cli_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    print(f"Research id: {research_id} (resume with --resume {research_id})")
+    results = agent.conduct_research(args.topic, args.questions, research_id=research_id)
     
     # Save results
     output_file = args.output or f"research_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -31,12 +47,44 @@ def main():
         f.write(f"Research Report: {args.topic}\n")
         f.write(f"Generated on: {datetime.now()}\n")
         f.write("=" * 80 + "\n\n")
-        f.write(report)
+        
+        if args.no_stream:
+            report = agent.generate_report(results, args.topic)
+            f.write(report)
+        else:
+            # Write (and show) the report as the model produces it
+            print("\nReport:")
+            print("-" * 50)
+            chunks = []
+            for chunk in agent.generate_report_stream(results, args.topic):
+                chunks.append(chunk)
+                f.write(chunk)
+                f.flush()
+                print(chunk, end="", flush=True)
+            print()
+            report = "".join(chunks)
     
     print(f"\nResearch completed! Report saved to: {output_file}")
-    print("\nSummary:")
-    print("-" * 50)
-    print(report[:500] + "..." if len(report) > 500 else report)
+    agent.record_research(research_id, args.topic, results, report)
+    checkpoints = get_checkpoint_store()
+    if checkpoints is not None:
+        checkpoints.delete(research_id)
+    prompt_stats = agent.get_prompt_stats()
+    print(f"🧮 Research prompts ({prompt_stats['memory_mode']} memory): {prompt_stats['llm_steps']} LLM steps, "
+          f"largest ~{prompt_stats['max_prompt_tokens']} tokens, total ~{prompt_stats['total_prompt_tokens']} tokens")
+    for node, profile in agent.get_engine_profile().items():
+        print(f"🕸️ {node}: {profile['calls']} calls, {profile['total_seconds']:.2f}s total, "
+              f"{profile['max_seconds']:.2f}s max")
+    evidence_stats = agent.get_evidence_stats()
+    print(f"📎 Evidence: {evidence_stats['documents']} sources from {evidence_stats['hits_added']} search hits "
+          f"({evidence_stats['duplicate_hits']} duplicates), {evidence_stats['local_queries']} local lookups")
+    report_stats = agent.get_report_stats()
+    print(f"🧩 Report synthesis: {report_stats['mode']}, {report_stats['llm_calls']} LLM calls, "
+          f"largest prompt ~{report_stats['max_prompt_tokens']} tokens")
+    if args.no_stream:
+        print("\nSummary:")
+        print("-" * 50)
+        print(report[:500] + "..." if len(report) > 500 else report)
 
 if __name__ == "__main__":
     main()
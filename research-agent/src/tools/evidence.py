@@ -0,0 +1,157 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it of on or that the this to was what "
+    "when where which who why will with about into than their there these those".split()
+)
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ref")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def evidence_key(hit: Dict) -> str:
+    """Dedup key of a search hit: DOI, else normalized URL, else title"""
+    doi = (hit.get("doi") or "").strip().lower()
+    if doi:
+        return "doi:" + re.sub(r"^(https?://)?(dx\.)?doi\.org/", "", doi)
+    url = (hit.get("url") or "").strip()
+    if url:
+        parts = urlsplit(url)
+        query = urlencode([(k, v) for k, v in parse_qsl(parts.query)
+                           if not k.lower().startswith(_TRACKING_PARAMS)])
+        host = parts.netloc.lower()
+        host = host[4:] if host.startswith("www.") else host
+        return "url:" + urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+    return "title:" + " ".join(tokenize(hit.get("title", "")))
+
+
+class EvidenceStore:
+    """Every search hit of one research job, deduplicated and indexed with BM25.
+
+    Tools add their hits here and hand the agent short ranked excerpts
+    instead of raw JSON; a hit found again keeps its first id (E1, E2, ...)
+    so it is cited consistently. The LocalEvidence tool searches the same
+    index so the agent can reuse what other questions already found instead
+    of searching again.
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, excerpt_chars: int = 300):
+        self.excerpt_chars = excerpt_chars
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._docs: List[Dict] = []
+            self._by_key: Dict[str, int] = {}
+            self._postings: Dict[str, Dict[int, int]] = {}
+            self._lengths: List[int] = []
+            self.hits_added = 0
+            self.duplicates = 0
+            self.local_queries = 0
+            self.local_answered = 0
+
+    def add(self, kind: str, hits: List[Dict], query: str = "") -> List[Tuple[Dict, bool]]:
+        """Store hits; returns (document, is_new) for each hit in order"""
+        added = []
+        with self._lock:
+            for hit in hits:
+                key = evidence_key(hit)
+                self.hits_added += 1
+                if key in self._by_key:
+                    self.duplicates += 1
+                    added.append((self._docs[self._by_key[key]], False))
+                    continue
+                doc = {
+                    "id": f"E{len(self._docs) + 1}",
+                    "kind": kind,
+                    "title": hit.get("title", ""),
+                    "url": hit.get("url", ""),
+                    "source": hit.get("source", ""),
+                    "published": hit.get("published", ""),
+                    "text": " ".join((hit.get("snippet") or hit.get("summary") or "").split()),
+                    "query": query,
+                }
+                index = len(self._docs)
+                self._docs.append(doc)
+                self._by_key[key] = index
+                terms = Counter(tokenize(f"{doc['title']} {doc['title']} {doc['text']}"))
+                for term, count in terms.items():
+                    self._postings.setdefault(term, {})[index] = count
+                self._lengths.append(sum(terms.values()))
+                added.append((doc, True))
+        return added
+
+    def _scores(self, terms: List[str]) -> Dict[int, float]:
+        total = len(self._docs)
+        avg_length = sum(self._lengths) / total if total else 0.0
+        scores: Dict[int, float] = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for index, tf in postings.items():
+                norm = self.K1 * (1 - self.B + self.B * self._lengths[index] / (avg_length or 1))
+                scores[index] = scores.get(index, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[Dict, float]]:
+        """Top-k documents for a query by BM25 score"""
+        with self._lock:
+            self.local_queries += 1
+            scores = self._scores(tokenize(query))
+            ranked = sorted((s, i) for i, s in scores.items() if s > min_score)
+            results = [(self._docs[i], round(s, 3)) for s, i in reversed(ranked[-k:])] if ranked else []
+            if results:
+                self.local_answered += 1
+        return results
+
+    def rank(self, docs: List[Dict], query: str) -> List[Dict]:
+        """Order documents by relevance to the query (stable for ties)"""
+        with self._lock:
+            scores = self._scores(tokenize(query))
+            positions = {doc["id"]: i for i, doc in enumerate(self._docs)}
+        return sorted(docs, key=lambda doc: -scores.get(positions.get(doc["id"], -1), 0.0))
+
+    def excerpt(self, doc: Dict) -> str:
+        text = doc["text"]
+        if len(text) > self.excerpt_chars:
+            text = text[:self.excerpt_chars].rsplit(" ", 1)[0] + "…"
+        meta = ", ".join(x for x in (doc["source"], doc["published"]) if x)
+        header = f"[{doc['id']}] {doc['title']}" + (f" ({meta})" if meta else "")
+        if doc["url"]:
+            header += f" {doc['url']}"
+        return f"{header}\n{text}" if text else header
+
+    def format(self, docs: List[Dict], max_chars: int) -> str:
+        """Compact excerpts, best first, within `max_chars`"""
+        parts, used = [], 0
+        for doc in docs:
+            block = self.excerpt(doc)
+            if parts and used + len(block) > max_chars:
+                break
+            parts.append(block)
+            used += len(block) + 2
+        return "\n\n".join(parts)[:max_chars] if parts else "No results."
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "hits_added": self.hits_added,
+                "duplicate_hits": self.duplicates,
+                "local_queries": self.local_queries,
+                "local_queries_answered": self.local_answered,
+            }
@@ -0,0 +1,229 @@
+import hashlib
+import multiprocessing
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+
+# Subtrees that are never article text
+_SKIP_TAGS = {
+    "head", "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "header", "footer", "aside", "form", "button", "select",
+}
+# Subtrees that usually hold the article itself
+_MAIN_TAGS = {"article", "main"}
+_BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "blockquote",
+    "pre", "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "figcaption",
+}
+_FEED_CHUNK = 64 * 1024
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+# Below this much <article>/<main> text, fall back to the whole body
+_MIN_MAIN_CHARS = 200
+
+
+class _TextExtractor(HTMLParser):
+    """Event-driven text collector: no tree is built, boilerplate subtrees are dropped"""
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.skip_depth = 0
+        self.main_depth = 0
+        self.body = []
+        self.body_chars = 0
+        self.main = []
+        self.main_chars = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in _MAIN_TAGS:
+            self.main_depth += 1
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in _MAIN_TAGS:
+            self.main_depth = max(0, self.main_depth - 1)
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth and data.strip():
+            self._append(data)
+
+    def _append(self, text):
+        if self.skip_depth:
+            return
+        self.body.append(text)
+        self.body_chars += len(text)
+        if self.main_depth:
+            self.main.append(text)
+            self.main_chars += len(text)
+        # Enough article text, or a page with no usable article far past the cap
+        if self.main_chars >= self.max_chars or self.body_chars >= self.max_chars * 4:
+            self.done = True
+
+    def text(self) -> str:
+        chunks = self.main if self.main_chars >= _MIN_MAIN_CHARS else self.body
+        lines = (_SPACES.sub(" ", line).strip() for line in "".join(chunks).split("\n"))
+        return "\n".join(line for line in lines if line)[:self.max_chars]
+
+
+def extract_text(html: str, max_chars: int = 20000) -> str:
+    """Clean article text from an HTML page, capped at max_chars.
+
+    Parsing is streamed in chunks and stops as soon as enough text has been
+    collected, so the tail of a very large page is never parsed.
+    """
+    parser = _TextExtractor(max_chars)
+    for start in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[start:start + _FEED_CHUNK])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.text()
+
+
+def _extract_batch(pages: List[str], max_chars: int) -> List[str]:
+    """Process-pool entry point: one IPC round trip per batch of pages"""
+    return [extract_text(html, max_chars) for html in pages]
+
+
+class HTMLExtractor:
+    """Turns fetched pages into text in a process pool, off the web worker's GIL.
+
+    Pages smaller than `inline_bytes` are parsed in the calling thread since
+    shipping them to another process costs more than parsing them. Results
+    are cached by URL and content hash, so a page refetched unchanged is not
+    parsed twice. With `workers=0` everything runs inline.
+    """
+
+    def __init__(self, workers: int = 2, max_chars: int = 20000, inline_bytes: int = 8192,
+                 cache_entries: int = 2000, start_method: Optional[str] = None):
+        self.workers = workers
+        self.max_chars = max_chars
+        self.inline_bytes = inline_bytes
+        self.cache_entries = cache_entries
+        self.start_method = start_method
+        self._executor = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.extracted = 0
+        self.offloaded = 0
+        self.cache_hits = 0
+        self.extract_seconds = 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method) if self.start_method else None
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._executor
+
+    def _cache_get(self, key):
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            return text
+
+    def _cache_set(self, key, text):
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def extract_many(self, pages: List[Tuple[str, str]]) -> List[str]:
+        """Extract text for (url, html) pairs, preserving input order"""
+        start = time.perf_counter()
+        texts: List[Optional[str]] = [None] * len(pages)
+        keys = []
+        offload = []
+        for i, (url, html) in enumerate(pages):
+            key = (url, hashlib.sha1(html.encode("utf-8", "surrogatepass")).hexdigest())
+            keys.append(key)
+            texts[i] = self._cache_get(key)
+            if texts[i] is not None:
+                continue
+            if self.workers > 0 and len(html) >= self.inline_bytes:
+                offload.append(i)
+            else:
+                texts[i] = extract_text(html, self.max_chars)
+
+        if offload:
+            texts = self._extract_offloaded(pages, offload, texts)
+        for i, key in enumerate(keys):
+            self._cache_set(key, texts[i])
+
+        with self._lock:
+            self.extracted += len(pages)
+            self.offloaded += len(offload)
+            self.extract_seconds += time.perf_counter() - start
+        return texts
+
+    def _extract_offloaded(self, pages, offload, texts):
+        # Spread the large pages over the workers in a few batches
+        batches = [offload[n::self.workers] for n in range(min(self.workers, len(offload)))]
+        try:
+            pool = self._pool()
+            futures = [pool.submit(_extract_batch, [pages[i][1] for i in batch], self.max_chars)
+                       for batch in batches]
+            for batch, future in zip(batches, futures):
+                for i, text in zip(batch, future.result()):
+                    texts[i] = text
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ Extraction pool unavailable ({e}), parsing inline")
+            with self._lock:
+                self._executor = None
+            for i in offload:
+                if texts[i] is None:
+                    texts[i] = extract_text(pages[i][1], self.max_chars)
+        return texts
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pages_extracted": self.extracted,
+                "pages_offloaded": self.offloaded,
+                "extract_cache_hits": self.cache_hits,
+                "extract_seconds": round(self.extract_seconds, 3),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_shared_extractor = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_extractor() -> HTMLExtractor:
+    """One extraction pool per process, shared by every search backend"""
+    global _shared_extractor
+    with _shared_lock:
+        if _shared_extractor is None:
+            _shared_extractor = HTMLExtractor(
+                workers=Config.EXTRACT_WORKERS,
+                max_chars=Config.EXTRACT_MAX_CHARS,
+                inline_bytes=Config.EXTRACT_INLINE_KB * 1024,
+                cache_entries=Config.EXTRACT_CACHE_ENTRIES,
+                start_method=Config.EXTRACT_START_METHOD or None,
+            )
+        return _shared_extractor
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.tools.html_extract import HTMLExtractor, get_shared_extractor
+from src.utils.config import Config
+
+_ATOM = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+
+
+class HTTPSearchBackend:
+    """Real search backend over one pooled, keep-alive requests.Session.
+
+    Web search speaks the SearxNG JSON API (`/search?q=...&format=json`) and
+    academic search the arXiv Atom API, so the same code runs against a
+    self-hosted SearxNG, arXiv, or the local stand-in in
+    scripts/mock_search_server.py. Result pages are fetched in parallel under
+    a global concurrency cap and a per-host cap, with timeouts and a
+    response size limit, and turned into snippets in the same dict shape as
+    the mock backend.
+    """
+
+    def __init__(self, search_url: str, academic_url: str, timeout: float = 10.0,
+                 max_concurrency: int = 16, per_host: int = 4, max_page_bytes: int = 512 * 1024,
+                 snippet_chars: int = 500, fetch_pages: bool = True,
+                 extractor: Optional[HTMLExtractor] = None):
+        self.search_url = search_url
+        self.academic_url = academic_url
+        # (connect, read) timeouts
+        self.timeout = (min(3.05, timeout), timeout)
+        self.max_page_bytes = max_page_bytes
+        self.snippet_chars = snippet_chars
+        self.fetch_pages = fetch_pages
+        self.per_host = per_host
+        # Page parsing is CPU-bound, so it runs in a separate process pool
+        self.extractor = extractor if extractor is not None else get_shared_extractor()
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "ResearchAgent/1.0"
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="page-fetch")
+        # Whole searches started from an event loop; separate from the page pool they fan out to
+        self._search_pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="search")
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._lock = threading.Lock()
+        self.pages_fetched = 0
+        self.fetch_failures = 0
+        self.bytes_fetched = 0
+        self._latencies = deque(maxlen=10000)
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            return self._host_limits[host]
+
+    def fetch(self, url: str) -> Optional[str]:
+        """GET a page within the per-host limit, reading at most max_page_bytes"""
+        start = time.perf_counter()
+        try:
+            with self._host_limit(url):
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    body = bytearray()
+                    for block in response.iter_content(chunk_size=16384):
+                        body.extend(block)
+                        if len(body) >= self.max_page_bytes:
+                            del body[self.max_page_bytes:]
+                            break
+                    encoding = response.encoding or "utf-8"
+            text = bytes(body).decode(encoding, errors="replace")
+        except (requests.RequestException, LookupError) as e:
+            with self._lock:
+                self.fetch_failures += 1
+            print(f"⚠️ Failed to fetch {url}: {e}")
+            return None
+
+        with self._lock:
+            self.pages_fetched += 1
+            self.bytes_fetched += len(body)
+            self._latencies.append(time.perf_counter() - start)
+        return text
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """Fetch pages in parallel, preserving input order"""
+        return list(self._pool.map(self.fetch, urls))
+
+    async def run_async(self, func, *args):
+        """Await a blocking search call (requests has no async API) on this backend's search threads.
+
+        The threads are capped at max_concurrency like the connection pool, so
+        any number of coroutines can search without adding threads.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._search_pool, func, *args)
+
+    def search_web(self, query: str, max_results: int = 5) -> List[Dict]:
+        response = self.session.get(
+            self.search_url, params={"q": query, "format": "json"}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        hits = response.json().get("results", [])[:max_results]
+
+        results = [
+            {"title": hit.get("title", ""), "url": hit.get("url", ""), "snippet": hit.get("content", "")}
+            for hit in hits
+        ]
+        if self.fetch_pages and results:
+            pages = self.fetch_many([result["url"] for result in results])
+            fetched = [(result["url"], page) for result, page in zip(results, pages) if page]
+            texts = iter(self.extractor.extract_many(fetched))
+            for result, page in zip(results, pages):
+                if page:
+                    text = " ".join(next(texts).split())
+                    result["snippet"] = text[:self.snippet_chars] or result["snippet"]
+        return results
+
+    def search_academic(self, query: str, max_results: int = 3) -> List[Dict]:
+        response = self.session.get(
+            self.academic_url,
+            params={"search_query": f"all:{query}", "max_results": max_results},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        feed = ET.fromstring(response.content)
+
+        results = []
+        for entry in feed.findall("atom:entry", _ATOM)[:max_results]:
+            def field(name):
+                return " ".join((entry.findtext(f"atom:{name}", "", _ATOM) or "").split())
+            results.append({
+                "title": field("title"),
+                "url": field("id"),
+                "doi": (entry.findtext("arxiv:doi", "", _ATOM) or "").strip(),
+                "authors": [a.findtext("atom:name", "", _ATOM) for a in entry.findall("atom:author", _ATOM)],
+                "summary": field("summary"),
+                "published": field("published")[:4],
+                "source": "arXiv",
+                "keywords": [c.get("term") for c in entry.findall("atom:category", _ATOM) if c.get("term")],
+            })
+        return results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2)
+            return {
+                "pages_fetched": self.pages_fetched,
+                "fetch_failures": self.fetch_failures,
+                "bytes_fetched": self.bytes_fetched,
+                "p50_fetch_ms": pick(0.50) if latencies else 0.0,
+                "p99_fetch_ms": pick(0.99) if latencies else 0.0,
+                **self.extractor.stats(),
+            }
+
+
+_shared_backend = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_http_backend() -> HTTPSearchBackend:
+    """One backend (and connection pool) per process, shared by every agent"""
+    global _shared_backend
+    with _shared_lock:
+        if _shared_backend is None:
+            _shared_backend = HTTPSearchBackend(
+                search_url=Config.SEARCH_API_URL,
+                academic_url=Config.ACADEMIC_API_URL,
+                timeout=Config.SEARCH_TIMEOUT,
+                max_concurrency=Config.SEARCH_MAX_CONCURRENCY,
+                per_host=Config.SEARCH_PER_HOST_LIMIT,
+                max_page_bytes=Config.SEARCH_MAX_PAGE_KB * 1024,
+                snippet_chars=Config.SEARCH_SNIPPET_CHARS,
+                fetch_pages=Config.SEARCH_FETCH_PAGES,
+            )
+        return _shared_backend
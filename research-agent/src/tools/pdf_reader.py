@@ -0,0 +1,256 @@
+import hashlib
+import mmap
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.config import Config
+
+try:
+    from pypdf import PdfReader as _PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    _PdfReader = None
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def _require_pypdf():
+    if _PdfReader is None:
+        raise ImportError("PDF support requires pypdf: pip install pypdf")
+
+
+def _open_pdf(path: str):
+    """PdfReader over a read-only memory map; pages are parsed only when accessed"""
+    _require_pypdf()
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return mapped, _PdfReader(mapped)
+
+
+def _extract_pages(path: str, indexes: List[int]) -> List[Tuple[int, str]]:
+    """Extract the given 0-based pages; runs in a pool worker or inline"""
+    mapped, reader = _open_pdf(path)
+    try:
+        pages = []
+        for index in indexes:
+            try:
+                text = reader.pages[index].extract_text() or ""
+            except Exception as e:
+                text = f"[page {index + 1} could not be extracted: {e}]"
+            pages.append((index, text))
+        return pages
+    finally:
+        del reader
+        mapped.close()
+
+
+def parse_page_range(spec: Optional[str], page_count: int) -> List[int]:
+    """'1-5,8,10-' -> 0-based page indexes; empty means every page"""
+    if not spec or not spec.strip():
+        return list(range(page_count))
+    indexes = []
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, _, last = part.partition("-")
+            start = int(first) if first else 1
+            end = int(last) if last else page_count
+        else:
+            start = end = int(part)
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {part}")
+        indexes.extend(range(start - 1, min(end, page_count)))
+    if not indexes:
+        raise ValueError(f"Pages {spec} are outside 1-{page_count}")
+    return sorted(set(indexes))
+
+
+class PDFPageCache:
+    """SQLite store of extracted page text keyed by file content hash and page number"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS pdf_pages (
+                file_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (file_hash, page)
+            )
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, file_hash: str, indexes: List[int]) -> Dict[int, str]:
+        if not indexes:
+            return {}
+        placeholders = ",".join("?" * len(indexes))
+        rows = self._connect().execute(
+            f"SELECT page, text FROM pdf_pages WHERE file_hash = ? AND page IN ({placeholders})",
+            (file_hash, *indexes)
+        )
+        return dict(rows)
+
+    def set_many(self, file_hash: str, pages: List[Tuple[int, str]]):
+        now = time.time()
+        self._connect().executemany(
+            "INSERT OR REPLACE INTO pdf_pages (file_hash, page, text, created_at) VALUES (?, ?, ?, ?)",
+            [(file_hash, index, text, now) for index, text in pages]
+        )
+
+
+class PDFReader:
+    """Page-level PDF text extraction for long papers.
+
+    Files are memory-mapped rather than read into memory, and pages are
+    extracted lazily in windows: pages missing from the cache are split
+    across a process pool, written to the page cache, and yielded in order,
+    so peak memory is bounded by one window no matter how long the PDF is
+    and a consumer that stops early never parses the rest.
+    """
+
+    def __init__(self, cache: Optional[PDFPageCache] = None, workers: Optional[int] = None,
+                 batch_pages: int = 4, parallel_min_pages: int = 8):
+        self.cache = cache
+        self.workers = Config.PDF_WORKERS if workers is None else workers
+        self.batch_pages = batch_pages
+        self.parallel_min_pages = parallel_min_pages
+        self._executor = None
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._page_counts = {}
+        self.pages_extracted = 0
+        self.cache_hits = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                method = Config.EXTRACT_START_METHOD
+                context = multiprocessing.get_context(method) if method else None
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._executor
+
+    def file_hash(self, path: str) -> str:
+        """sha256 of the file contents, hashed through the memory map in blocks"""
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            if key in self._hashes:
+                return self._hashes[key]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), _HASH_BLOCK):
+                digest.update(mapped[start:start + _HASH_BLOCK])
+        with self._lock:
+            self._hashes[key] = digest.hexdigest()
+        return self._hashes[key]
+
+    def page_count(self, path: str) -> int:
+        file_hash = self.file_hash(path)
+        with self._lock:
+            if file_hash in self._page_counts:
+                return self._page_counts[file_hash]
+        mapped, reader = _open_pdf(path)
+        try:
+            count = len(reader.pages)
+        finally:
+            del reader
+            mapped.close()
+        with self._lock:
+            self._page_counts[file_hash] = count
+        return count
+
+    def iter_pages(self, path: str, pages: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (1-based page number, text) for a page range such as '1-5,8'"""
+        file_hash = self.file_hash(path)
+        indexes = parse_page_range(pages, self.page_count(path))
+        window = max(1, self.workers) * self.batch_pages
+        for start in range(0, len(indexes), window):
+            wanted = indexes[start:start + window]
+            found = self.cache.get_many(file_hash, wanted) if self.cache is not None else {}
+            missing = [index for index in wanted if index not in found]
+            if missing:
+                extracted = self._extract(path, missing)
+                if self.cache is not None:
+                    self.cache.set_many(file_hash, extracted)
+                found.update(extracted)
+            with self._lock:
+                self.cache_hits += len(wanted) - len(missing)
+                self.pages_extracted += len(missing)
+            for index in wanted:
+                yield index + 1, found[index]
+
+    def _extract(self, path: str, indexes: List[int]) -> List[Tuple[int, str]]:
+        if self.workers <= 1 or len(indexes) < self.parallel_min_pages:
+            return _extract_pages(path, indexes)
+        batches = [indexes[i:i + self.batch_pages] for i in range(0, len(indexes), self.batch_pages)]
+        try:
+            pool = self._pool()
+            futures = [pool.submit(_extract_pages, path, batch) for batch in batches]
+            return [page for future in futures for page in future.result()]
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️ PDF pool unavailable ({e}), extracting inline")
+            with self._lock:
+                self._executor = None
+            return _extract_pages(path, indexes)
+
+    def extract_pages(self, path: str, pages: Optional[str] = None) -> Dict[int, str]:
+        """Text of each requested page keyed by 1-based page number"""
+        return dict(self.iter_pages(path, pages))
+
+    def extract_text_from_pdf(self, pdf_path: str, pages: Optional[str] = None,
+                              max_chars: Optional[int] = None) -> str:
+        """Extract text from PDF file, stopping once max_chars have been collected"""
+        max_chars = max_chars or Config.PDF_MAX_CHARS
+        parts = []
+        total = 0
+        for number, text in self.iter_pages(pdf_path, pages):
+            parts.append(f"--- Page {number} ---\n{text.strip()}")
+            total += len(parts[-1])
+            if total >= max_chars:
+                break
+        return "\n\n".join(parts)[:max_chars]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"pages_extracted": self.pages_extracted, "page_cache_hits": self.cache_hits}
+
+
+def resolve_pdf_path(name: str) -> str:
+    """Map a tool-supplied file name into Config.PDF_DIR, refusing paths that escape it"""
+    root = os.path.realpath(Config.PDF_DIR)
+    path = os.path.realpath(os.path.join(root, name.strip().strip("'\"")))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"PDF path must be inside {Config.PDF_DIR}")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No such PDF: {name}")
+    return path
+
+
+_shared_reader = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_pdf_reader() -> PDFReader:
+    """One reader (page cache and process pool) per process"""
+    global _shared_reader
+    with _shared_lock:
+        if _shared_reader is None:
+            _shared_reader = PDFReader(cache=PDFPageCache(Config.PDF_CACHE_PATH))
+        return _shared_reader
@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from src.utils.config import Config
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace so near-identical queries share a key"""
+    query = _PUNCTUATION.sub(" ", query.casefold())
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class _Entry:
+    __slots__ = ("value", "error", "expires_at")
+
+    def __init__(self, value, error, expires_at):
+        self.value = value
+        self.error = error
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """A backend lookup in progress that identical concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SearchCache:
+    """TTL cache for search results with negative caching and single-flight lookups.
+
+    Successful non-empty results live for `ttl` seconds; empty results and
+    failures are remembered for `negative_ttl` so a flaky backend is not
+    hammered. Concurrent lookups of the same normalized query share one
+    backend call.
+    """
+
+    def __init__(self, ttl: float = 3600, negative_ttl: float = 60, max_entries: int = 5000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _store(self, key, value, error):
+        ttl = self.ttl if error is None and value else self.negative_ttl
+        self._entries[key] = _Entry(value, error, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_search(self, namespace: str, query: str, max_results: int,
+                      search: Callable[[], List[Dict]]) -> List[Dict]:
+        key = (namespace, normalize_query(query), max_results)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                if entry.error is not None or not entry.value:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                if entry.error is not None:
+                    raise entry.error
+                return list(entry.value)
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return list(flight.value)
+
+        completed = False
+        try:
+            flight.value = search()
+            completed = True
+        except Exception as e:
+            flight.error = e
+            completed = True
+        finally:
+            with self._lock:
+                if completed:
+                    self._store(key, flight.value, flight.error)
+                else:
+                    # Interrupted (e.g. KeyboardInterrupt): release waiters without caching
+                    flight.error = RuntimeError("Search was interrupted")
+                del self._flights[key]
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return list(flight.value)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses + self.coalesced
+            saved = self.hits + self.negative_hits + self.coalesced
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round(saved / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_search_cache() -> Optional[SearchCache]:
+    """Process-wide search cache so parallel questions and jobs share results"""
+    global _shared_cache
+    if Config.SEARCH_CACHE_TTL <= 0:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache(
+                ttl=Config.SEARCH_CACHE_TTL,
+                negative_ttl=Config.SEARCH_NEGATIVE_TTL,
+                max_entries=Config.SEARCH_CACHE_MAX_ENTRIES,
+            )
+        return _shared_cache
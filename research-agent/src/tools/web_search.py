@@ -1,15 +1,60 @@
 import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 
+from src.tools.http_backend import HTTPSearchBackend, get_shared_http_backend
+from src.tools.pdf_reader import PDFReader  # re-exported for existing imports
+from src.tools.search_cache import SearchCache, get_shared_search_cache
+from src.utils.config import Config
+
 class WebSearchTool:
-    def __init__(self):
-        pass
+    def __init__(self, cache: Optional[SearchCache] = None,
+                 backend: Optional[HTTPSearchBackend] = None):
+        # Shared by every agent in the process unless a cache is passed in
+        self.cache = cache if cache is not None else get_shared_search_cache()
+        # Without a backend the tool serves the built-in sample data
+        if backend is None and Config.SEARCH_BACKEND == "http":
+            backend = get_shared_http_backend()
+        self.backend = backend
     
     def search_web(self, query: str, max_results: int = 5) -> List[Dict]:
-        """Simulate web search"""
+        """Search the web, serving repeated (normalized) queries from the cache"""
+        if self.cache is None:
+            return self._search_web(query, max_results)
+        return self.cache.get_or_search(
+            "web", query, max_results, lambda: self._search_web(query, max_results)
+        )
+    
+    def search_academic(self, query: str, max_results: int = 3) -> List[Dict]:
+        """Search academic sources, serving repeated (normalized) queries from the cache"""
+        if self.cache is None:
+            return self._search_academic(query, max_results)
+        return self.cache.get_or_search(
+            "academic", query, max_results, lambda: self._search_academic(query, max_results)
+        )
+    
+    async def asearch_web(self, query: str, max_results: int = 5) -> List[Dict]:
+        """search_web for coroutines: backend requests wait on the backend's threads, not the loop"""
+        if self.backend is None:
+            # Sample data and cache lookups are in-memory, so they run inline
+            return self.search_web(query, max_results)
+        return await self.backend.run_async(self.search_web, query, max_results)
+    
+    async def asearch_academic(self, query: str, max_results: int = 3) -> List[Dict]:
+        if self.backend is None:
+            return self.search_academic(query, max_results)
+        return await self.backend.run_async(self.search_academic, query, max_results)
+    
+    def get_cache_stats(self) -> Dict:
+        """Hit rate and counters of the search cache"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def _search_web(self, query: str, max_results: int = 5) -> List[Dict]:
+        """Run a web search on the HTTP backend, or return sample data"""
         print(f"Searching web for: {query}")
+        if self.backend is not None:
+            return self.backend.search_web(query, max_results)
         
         # Return more realistic mock data for demonstration
         mock_data = {
@@ -53,9 +98,11 @@ class WebSearchTool:
             for i in range(max_results)
         ]
     
-    def search_academic(self, query: str, max_results: int = 3) -> List[Dict]:
-        """Simulate academic search - FIXED METHOD NAME"""
+    def _search_academic(self, query: str, max_results: int = 3) -> List[Dict]:
+        """Run an academic search on the HTTP backend, or return sample data"""
         print(f"Searching academic sources for: {query}")
+        if self.backend is not None:
+            return self.backend.search_academic(query, max_results)
         
         # Return mock academic data with more realistic content
         academic_mock_data = {
@@ -98,9 +145,3 @@ class WebSearchTool:
             }
             for i in range(max_results)
         ]
-
-class PDFReader:
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF file"""
-        # Implementation for PDF text extraction
-        return "PDF content would be extracted here in a real implementation."
@@ -0,0 +1,122 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; saves are then only serialized within one process
+    fcntl = None
+
+from src.utils.config import Config
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class CheckpointStore:
+    """One JSON checkpoint file per research id, replaced atomically on every save.
+
+    A checkpoint holds the topic, the questions, every answer finished so
+    far and optional agent state (e.g. serialized memory). Writes go to a
+    temp file in the same directory that is fsynced and then os.replace()d
+    over the old file, so a crash leaves either the previous or the new
+    checkpoint, never a torn one. Saves read, merge and replace under a lock
+    file in the directory, so runs in other processes never drop each
+    other's answers.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            # flock is per open file, so each save opens its own handle (also safe across fork)
+            with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, research_id: str) -> str:
+        return os.path.join(self.directory, _UNSAFE.sub("_", research_id) + ".json")
+
+    def load(self, research_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(research_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable checkpoint for {research_id}: {e}")
+            return None
+
+    def _write(self, research_id: str, checkpoint: Dict):
+        checkpoint["updated_at"] = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".ckpt-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(research_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def save_answer(self, research_id: str, topic: str, questions: List[str],
+                    question: str, answer: str, state: Optional[Dict] = None):
+        """Record one finished question (and the agent state after it)"""
+        with self._locked():
+            checkpoint = self.load(research_id) or {
+                "research_id": research_id, "topic": topic, "questions": list(questions), "answers": {}
+            }
+            checkpoint["answers"][question] = answer
+            if state is not None:
+                checkpoint["state"] = state
+            self._write(research_id, checkpoint)
+
+    def completed_answers(self, research_id: str, topic: str) -> Dict[str, str]:
+        """Answers already checkpointed for this research id (empty if the topic changed)"""
+        checkpoint = self.load(research_id)
+        if not checkpoint:
+            return {}
+        if checkpoint.get("topic") != topic:
+            print(f"⚠️ Checkpoint {research_id} is for a different topic, starting over")
+            return {}
+        # Failed questions are retried on resume
+        return {question: answer for question, answer in checkpoint.get("answers", {}).items()
+                if not str(answer).startswith("Research failed")}
+
+    def delete(self, research_id: str):
+        with self._locked():
+            try:
+                os.unlink(self._path(research_id))
+            except FileNotFoundError:
+                pass
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """Process-wide checkpoint store (None when CHECKPOINTS_ENABLED is off)"""
+    global _shared_store
+    if not Config.CHECKPOINTS_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = CheckpointStore(Config.CHECKPOINT_DIR)
+        return _shared_store
@@ -3,10 +3,160 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# research-agent/ directory, used to anchor default data paths
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 class Config:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    
+
+    # Model provider: "gemini", or "fake" (offline stand-in for demos and load tests; replies after
+    # FAKE_LLM_LATENCY seconds)
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+    FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.5"))
+
+    # Local state (job store, caches) lives here unless overridden
+    DATA_DIR = os.getenv("RESEARCH_DATA_DIR", os.path.join(PROJECT_ROOT, "data"))
+
+    # Concurrency and quota settings (gemini-1.5-flash free tier: 15 RPM, 1M TPM)
+    RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "3"))
+    GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "15"))
+    GEMINI_TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+
+    # Daily request budget (free tier: 1,500/day; 0 = unlimited), reset at midnight in this timezone
+    GEMINI_REQUESTS_PER_DAY = int(os.getenv("GEMINI_REQUESTS_PER_DAY", "1500"))
+    GEMINI_QUOTA_TIMEZONE = os.getenv("GEMINI_QUOTA_TIMEZONE", "America/Los_Angeles")
+    # Quota usage ledger shared by every process on the host ("" = in memory, per process)
+    QUOTA_STORE_PATH = os.getenv("QUOTA_STORE_PATH", os.path.join(DATA_DIR, "quota.db"))
+    # Completion tokens assumed per call until real sizes have been observed
+    QUOTA_STEP_COMPLETION_TOKENS = int(os.getenv("QUOTA_STEP_COMPLETION_TOKENS", "300"))
+    QUOTA_REPORT_COMPLETION_TOKENS = int(os.getenv("QUOTA_REPORT_COMPLETION_TOKENS", "2000"))
+
+    # LLM response cache: in-process LRU tier plus on-disk tier with TTL
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_CACHE_MEMORY_MB = int(os.getenv("LLM_CACHE_MEMORY_MB", "64"))
+    LLM_CACHE_DISK_MB = int(os.getenv("LLM_CACHE_DISK_MB", "512"))
+    LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.db"))
+
+    # Search backend: "mock" (built-in sample data) or "http" (SearxNG JSON + arXiv APIs)
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "mock")
+    SEARCH_API_URL = os.getenv("SEARCH_API_URL", "http://localhost:8888/search")
+    ACADEMIC_API_URL = os.getenv("ACADEMIC_API_URL", "http://export.arxiv.org/api/query")
+    SEARCH_FETCH_PAGES = os.getenv("SEARCH_FETCH_PAGES", "true").lower() in ("1", "true", "yes")
+    SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+    SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "16"))
+    SEARCH_PER_HOST_LIMIT = int(os.getenv("SEARCH_PER_HOST_LIMIT", "4"))
+    SEARCH_MAX_PAGE_KB = int(os.getenv("SEARCH_MAX_PAGE_KB", "512"))
+    SEARCH_SNIPPET_CHARS = int(os.getenv("SEARCH_SNIPPET_CHARS", "500"))
+
+    # HTML-to-text extraction: process pool size (0 = inline), text cap, pages parsed inline below this size
+    EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "20000"))
+    EXTRACT_INLINE_KB = int(os.getenv("EXTRACT_INLINE_KB", "8"))
+    EXTRACT_CACHE_ENTRIES = int(os.getenv("EXTRACT_CACHE_ENTRIES", "2000"))
+    # multiprocessing start method for the pool ("fork", "forkserver", "spawn"); empty = platform default
+    EXTRACT_START_METHOD = os.getenv("EXTRACT_START_METHOD", "")
+
+    # PDF reader: files the agent may open, page-extraction processes, text cap, page cache location
+    PDF_DIR = os.getenv("PDF_DIR", os.path.join(DATA_DIR, "pdfs"))
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "50000"))
+    PDF_TOOL_MAX_CHARS = int(os.getenv("PDF_TOOL_MAX_CHARS", "8000"))
+    PDF_CACHE_PATH = os.getenv("PDF_CACHE_PATH", os.path.join(DATA_DIR, "pdf_cache.db"))
+
+    # Search result cache (seconds); set SEARCH_CACHE_TTL=0 to disable
+    SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "3600"))
+    SEARCH_NEGATIVE_TTL = float(os.getenv("SEARCH_NEGATIVE_TTL", "60"))
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+
+    # Completed research indexed for /api/search and reuse of answers to near-identical questions.
+    # Reuse mode: "reuse" (take the earlier answer), "refresh" (one LLM call to update it) or "off"
+    RESEARCH_INDEX_ENABLED = os.getenv("RESEARCH_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+    RESEARCH_INDEX_PATH = os.getenv("RESEARCH_INDEX_PATH", os.path.join(DATA_DIR, "research_index.db"))
+    RESEARCH_INDEX_DIM = int(os.getenv("RESEARCH_INDEX_DIM", "256"))
+    RESEARCH_REUSE_MODE = os.getenv("RESEARCH_REUSE_MODE", "reuse")
+    RESEARCH_REUSE_THRESHOLD = float(os.getenv("RESEARCH_REUSE_THRESHOLD", "0.85"))
+
+    # Per-job evidence store: excerpt length, cap on each search tool output, LocalEvidence hits
+    EVIDENCE_EXCERPT_CHARS = int(os.getenv("EVIDENCE_EXCERPT_CHARS", "300"))
+    EVIDENCE_TOOL_MAX_CHARS = int(os.getenv("EVIDENCE_TOOL_MAX_CHARS", "1500"))
+    EVIDENCE_TOP_K = int(os.getenv("EVIDENCE_TOP_K", "5"))
+
+    # Report synthesis: above this many findings tokens, findings are condensed map-reduce style
+    REPORT_MAP_REDUCE_THRESHOLD = int(os.getenv("REPORT_MAP_REDUCE_THRESHOLD", "6000"))
+    REPORT_MAX_PROMPT_TOKENS = int(os.getenv("REPORT_MAX_PROMPT_TOKENS", "8000"))
+    REPORT_SUMMARY_TOKENS = int(os.getenv("REPORT_SUMMARY_TOKENS", "400"))
+
+    # Research engine: "react" (tool-using agent loop) or "graph" (LangGraph plan/search/answer graph)
+    RESEARCH_ENGINE = os.getenv("RESEARCH_ENGINE", "react")
+    GRAPH_EVIDENCE_CHARS = int(os.getenv("GRAPH_EVIDENCE_CHARS", "3000"))
+
+    # Agent memory between questions: "isolated" (fresh per question plus a digest of earlier
+    # answers), "window" (shared, oldest turns dropped) or "summary" (shared rolling summary)
+    AGENT_MEMORY_MODE = os.getenv("AGENT_MEMORY_MODE", "isolated")
+    AGENT_MEMORY_TOKENS = int(os.getenv("AGENT_MEMORY_TOKENS", "1500"))
+    AGENT_MEMORY_SUMMARY_TOKENS = int(os.getenv("AGENT_MEMORY_SUMMARY_TOKENS", "300"))
+
+    # Per-question checkpoints so an interrupted research run can resume under the same id
+    CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() in ("1", "true", "yes")
+    CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", os.path.join(DATA_DIR, "checkpoints"))
+
+    # Print the agent's ReAct trace (thoughts, tool inputs/outputs); costs real time under load
+    AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "true").lower() in ("1", "true", "yes")
+
+    # Metrics: each process writes a snapshot here every METRICS_FLUSH_SECONDS; /metrics merges them
+    METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(DATA_DIR, "metrics"))
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+    # Number of pre-built agents each web worker keeps ready
+    AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "4"))
+
+    # Web job scheduler: fixed workers, bounded queue, initial run-time estimate
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", str(AGENT_POOL_SIZE)))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "20"))
+    JOB_EXPECTED_SECONDS = float(os.getenv("JOB_EXPECTED_SECONDS", "90"))
+
+    # ASGI server mode (app/asgi.py): jobs run as tasks on the event loop, this many at once per
+    # worker process (hypercorn -w N runs up to N times as many, all sharing one Gemini quota)
+    ASYNC_JOB_WORKERS = int(os.getenv("ASYNC_JOB_WORKERS", "200"))
+
+    # Where job status/results are kept: sqlite:///path/to/jobs.db or memory://
+    JOB_STORE_URL = os.getenv("JOB_STORE_URL", "sqlite:///" + os.path.join(DATA_DIR, "research_jobs.db"))
+    # Progress events of finished jobs are dropped this long after they finish (0 = keep them)
+    JOB_EVENT_RETENTION_MINUTES = float(os.getenv("JOB_EVENT_RETENTION_MINUTES", "60"))
+
+    # Where jobs run: "inline" (web process scheduler) or "queue" (web processes only enqueue;
+    # `python -m src.worker` processes run the jobs)
+    JOB_EXECUTION = os.getenv("JOB_EXECUTION", "inline")
+    # Durable job queue: sqlite:///path/to/queue.db (one host or shared volume) or redis://host:6379/0
+    JOB_QUEUE_URL = os.getenv("JOB_QUEUE_URL", "sqlite:///" + os.path.join(DATA_DIR, "job_queue.db"))
+    # Worker leases, renewed every third of JOB_LEASE_SECONDS; a lapsed job is re-queued until it
+    # has been claimed JOB_MAX_ATTEMPTS times
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # Leases are only renewed for jobs that published a progress event within JOB_STALL_SECONDS
+    # and have run for less than JOB_MAX_RUNTIME_SECONDS (0 = no limit); others are stopped.
+    # A forced /resume is refused while the job record changed within JOB_STALL_SECONDS.
+    JOB_STALL_SECONDS = float(os.getenv("JOB_STALL_SECONDS", "600"))
+    JOB_MAX_RUNTIME_SECONDS = float(os.getenv("JOB_MAX_RUNTIME_SECONDS", "3600"))
+    # Worker idle poll interval, and how long a stopping worker lets running jobs finish
+    WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "1"))
+    WORKER_SHUTDOWN_SECONDS = float(os.getenv("WORKER_SHUTDOWN_SECONDS", "30"))
+
+    # Server-Sent Events: how often a stream checks the store, and when it recycles
+    SSE_POLL_INTERVAL = float(os.getenv("SSE_POLL_INTERVAL", "0.5"))
+    SSE_MAX_STREAM_SECONDS = float(os.getenv("SSE_MAX_STREAM_SECONDS", "300"))
+
+    # Retry/backoff settings for every LLM call (seconds)
+    LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "5"))
+    LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+    LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60"))
+    LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "120"))
+    LLM_CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", "300"))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
     @classmethod
     def validate_config(cls):
-        if not cls.GEMINI_API_KEY:
+        if not cls.GEMINI_API_KEY and cls.LLM_PROVIDER != "fake":
             raise ValueError("GEMINI_API_KEY not found in environment variables")
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+
+class FakeRateLimitError(Exception):
+    """Mimics the 429 error raised by the Gemini API"""
+
+    code = 429
+
+
+class FakeChatModel(BaseChatModel):
+    """Local stand-in for Gemini that can inject 429s and hung calls.
+
+    `failures` is a script consumed one entry per call ("429", "timeout",
+    "error" or "ok"); once exhausted, `failure_rate` decides randomly.
+    `reply_tokens` pads answers to roughly that many tokens (by repeating
+    `reply`) so output size can be varied in benchmarks.
+    Replies follow the structured-chat agent format when the prompt asks
+    for it, so the full ReAct loop can run offline. The async methods
+    sleep on the event loop, like a real async client waiting on the network.
+    """
+
+    reply: str = "This is a simulated research answer."
+    reply_tokens: int = 0
+    latency: float = 0.0
+    failures: List[str] = []
+    failure_rate: float = 0.0
+    retry_after: Optional[float] = 1.0
+    hang_seconds: float = 30.0
+    seed: int = 0
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _rng: Any = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def _next_outcome(self) -> str:
+        with self._lock:
+            index = self._calls
+            self._calls += 1
+            if self._rng is None:
+                self._rng = random.Random(self.seed)
+            if index < len(self.failures):
+                return self.failures[index]
+            if self.failure_rate and self._rng.random() < self.failure_rate:
+                return "429"
+            return "ok"
+
+    def _reply_text(self) -> str:
+        if self.reply_tokens <= 0:
+            return self.reply
+        target = self.reply_tokens * 4
+        repeats = target // (len(self.reply) + 1) + 1
+        return " ".join([self.reply] * repeats)[:target]
+
+    def _reply_for(self, prompt: str) -> str:
+        if '"action"' not in prompt:
+            return self._reply_text()
+        # The structured-chat agent replays earlier steps under this heading
+        if "previous work" in prompt:
+            action = {"action": "Final Answer", "action_input": self._reply_text()}
+        else:
+            action = {"action": "WebSearch", "action_input": "research topic"}
+        return f"```json\n{json.dumps(action)}\n```"
+
+    @staticmethod
+    def _chunks(text: str) -> Iterator[ChatGenerationChunk]:
+        # Word-sized chunks, like a streaming API
+        for index, word in enumerate(text.split(" ")):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else " " + word))
+
+    def _result(self, outcome: str, messages: List[BaseMessage]) -> ChatResult:
+        if outcome == "429":
+            hint = f" Please retry in {self.retry_after}s." if self.retry_after is not None else ""
+            raise FakeRateLimitError(f"429 Resource has been exhausted (e.g. check quota).{hint}")
+        if outcome == "error":
+            raise ValueError("Invalid request")
+        prompt = "\n".join(str(m.content) for m in messages)
+        message = AIMessage(content=self._reply_for(prompt))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._generate(messages, stop=stop, run_manager=run_manager).generations[0].text
+        yield from self._chunks(text)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        result = await self._agenerate(messages, stop=stop, run_manager=run_manager)
+        for chunk in self._chunks(result.generations[0].text):
+            yield chunk
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        outcome = self._next_outcome()
+        if self.latency:
+            time.sleep(self.latency)
+        if outcome == "timeout":
+            time.sleep(self.hang_seconds)
+        return self._result(outcome, messages)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        outcome = self._next_outcome()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if outcome == "timeout":
+            await asyncio.sleep(self.hang_seconds)
+        return self._result(outcome, messages)
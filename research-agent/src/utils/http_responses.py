@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import json
+import re
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent as is; compressing them saves nothing
+COMPRESS_MIN_BYTES = 512
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/markdown", "text/html", "text/css",
+                      "application/javascript", "text/javascript")
+
+
+def parse_fields(value: Optional[str]) -> Optional[list]:
+    """`fields=status,progress` -> ["status", "progress"]; None when no projection was asked for"""
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    return fields or None
+
+
+def project(record: Dict, fields: Optional[Iterable[str]]) -> Dict:
+    """Only the requested top-level keys of a record (all of it without a projection)"""
+    if fields is None:
+        return record
+    return {name: record[name] for name in fields if name in record}
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from whatever determines the response body (record version, projection, ...)"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as required for If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    strip = lambda tag: tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+    return strip(etag) in {strip(tag) for tag in if_none_match.split(",")}
+
+
+def should_compress(status_code: int, mimetype: Optional[str], headers) -> bool:
+    """Whether a (non-streamed) response body is a candidate for content coding"""
+    return (200 <= status_code and status_code != 304 and "Content-Encoding" not in headers
+            and mimetype in COMPRESSIBLE_TYPES)
+
+
+def sse_event(event: Dict) -> str:
+    """One stored job event in Server-Sent Events wire format"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred content coding the client accepts: br (if available), then gzip"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        match = re.search(r"q=([0-9.]+)", params)
+        accepted[name.strip().lower()] = float(match.group(1)) if match else 1.0
+    for encoding in (("br",) if brotli is not None else ()) + ("gzip",):
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        # Quality 5 is close to gzip -9 in size at a fraction of the CPU of quality 11
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_stream(chunks: Iterable[str], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk (gzip framing or brotli)"""
+    compressor = brotli.Compressor(quality=5) if encoding == "br" else zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.process(chunk.encode("utf-8")) if encoding == "br" else compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.finish() if encoding == "br" else compressor.flush()
+
+
+def iter_chunks(text: str, chunk_chars: int = 64 * 1024) -> Iterator[str]:
+    """Yield a large string in pieces so a download starts before it is all encoded"""
+    for start in range(0, len(text), chunk_chars):
+        yield text[start:start + chunk_chars]
+
+
+def download_filename(topic: str, extension: str) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "_", topic).strip("_")[:80] or "research"
+    return f"research_report_{stem}.{extension}"
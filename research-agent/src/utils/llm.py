@@ -0,0 +1,234 @@
+import asyncio
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.utils.llm_cache import LLMCache, cache_key
+from src.utils.metrics import get_metrics
+from src.utils.rate_limiter import QuotaGrant, QuotaPlanner, estimate_tokens
+from src.utils.retry import RetryEngine
+
+
+def messages_to_text(messages: List[BaseMessage]) -> str:
+    """Flatten chat messages into a single string (used for sizing and keys)"""
+    return "\n".join(f"{m.type}: {m.content}" for m in messages)
+
+
+class ManagedChatModel(BaseChatModel):
+    """Chat model wrapper that adds caching, rate limiting and retries around the wrapped model.
+
+    The async entry points (ainvoke/astream) take the same path on the event
+    loop: quota waits, backoff and the wrapped model's own async API never
+    block a thread, and cache and quota ledger I/O runs off the loop.
+    """
+
+    inner: BaseChatModel
+    limiter: Optional[QuotaPlanner] = None
+    retry_engine: Optional[RetryEngine] = None
+    response_cache: Optional[LLMCache] = None
+    # When set, skip cache lookups (fresh answers) but still store the new responses
+    cache_bypass: bool = False
+    # Quota admission order (lower goes first) and the completion size class of the next calls
+    priority: float = 1.0
+    quota_kind: str = "step"
+
+    @property
+    def _llm_type(self) -> str:
+        return f"managed-{self.inner._llm_type}"
+
+    def _before_call(self, messages: List[BaseMessage]) -> Optional[QuotaGrant]:
+        if self.limiter is None:
+            return None
+        grant = self.limiter.reserve(estimate_tokens(messages_to_text(messages)),
+                                     kind=self.quota_kind, priority=self.priority)
+        get_metrics().observe("research_rate_limit_wait_seconds", grant.waited)
+        return grant
+
+    async def _abefore_call(self, messages: List[BaseMessage]) -> Optional[QuotaGrant]:
+        if self.limiter is None:
+            return None
+        grant = await self.limiter.areserve(estimate_tokens(messages_to_text(messages)),
+                                            kind=self.quota_kind, priority=self.priority)
+        get_metrics().observe("research_rate_limit_wait_seconds", grant.waited)
+        return grant
+
+    def _after_call(self, grant: Optional[QuotaGrant], text: str):
+        if grant is not None:
+            self.limiter.settle(grant, estimate_tokens(text))
+
+    def _cache_key(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        model = getattr(self.inner, "model", None) or self.inner._llm_type
+        return cache_key(model, getattr(self.inner, "temperature", None), messages, stop)
+
+    def _cached(self, key: Optional[str]) -> Optional[str]:
+        if key is None or self.cache_bypass:
+            return None
+        return self.response_cache.get(key)
+
+    async def _acached(self, key: Optional[str]) -> Optional[str]:
+        if key is None or self.cache_bypass:
+            return None
+        # The cache may be on disk (SQLite)
+        return await asyncio.to_thread(self.response_cache.get, key)
+
+    def _call_with_retry(self, func, messages: List[BaseMessage]):
+        """Returns the result and the quota grant of the attempt that produced it"""
+        grants = []
+        # Every attempt (including retries) waits for and counts against the quota
+        before_attempt = lambda: grants.append(self._before_call(messages))
+        if self.retry_engine is None:
+            before_attempt()
+            return func(), grants[-1]
+        result = self.retry_engine.call(func, before_attempt=before_attempt)
+        return result, grants[-1]
+
+    async def _acall_with_retry(self, func, messages: List[BaseMessage]):
+        grants = []
+
+        async def before_attempt():
+            grants.append(await self._abefore_call(messages))
+
+        if self.retry_engine is None:
+            await before_attempt()
+            return await func(), grants[-1]
+        result = await self.retry_engine.acall(func, before_attempt=before_attempt)
+        return result, grants[-1]
+
+    def _cached_result(self, cached: str) -> ChatResult:
+        # Flagged so metrics can tell cache hits from model calls
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=cached))],
+                          llm_output={"cached": True})
+
+    def _store(self, key: Optional[str], grant: Optional[QuotaGrant], text: str):
+        self._after_call(grant, text)
+        if key is not None:
+            self.response_cache.set(key, text)
+
+    async def _astore(self, key: Optional[str], grant: Optional[QuotaGrant], text: str):
+        if grant is not None or key is not None:
+            await asyncio.to_thread(self._store, key, grant, text)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = self._cache_key(messages, stop)
+        cached = self._cached(key)
+        if cached is not None:
+            return self._cached_result(cached)
+
+        def attempt():
+            return self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        result, grant = self._call_with_retry(attempt, messages)
+        self._store(key, grant, "".join(g.text for g in result.generations))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = self._cache_key(messages, stop)
+        cached = await self._acached(key)
+        if cached is not None:
+            return self._cached_result(cached)
+
+        async def attempt():
+            return await self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        result, grant = await self._acall_with_retry(attempt, messages)
+        await self._astore(key, grant, "".join(g.text for g in result.generations))
+        return result
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        key = self._cache_key(messages, stop)
+        cached = self._cached(key)
+        if cached is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=cached))
+            return
+
+        if type(self.inner)._stream is BaseChatModel._stream:
+            # The wrapped model cannot stream; deliver its whole answer as one chunk
+            result = self._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            message = result.generations[0].message
+            yield ChatGenerationChunk(message=AIMessageChunk(content=message.content))
+            return
+
+        def open_stream():
+            # Retries are only safe until the first chunk has been handed out
+            stream = self.inner._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return stream, next(stream, None)
+
+        (stream, first), grant = self._call_with_retry(open_stream, messages)
+        if first is None:
+            self._after_call(grant, "")
+            return
+        produced = [first.text]
+        yield first
+        for chunk in stream:
+            produced.append(chunk.text)
+            yield chunk
+        self._store(key, grant, "".join(produced))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._cache_key(messages, stop)
+        cached = await self._acached(key)
+        if cached is not None:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=cached))
+            return
+
+        if type(self.inner)._astream is BaseChatModel._astream:
+            # No native async streaming; deliver the whole (async) answer as one chunk
+            result = await self._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            message = result.generations[0].message
+            yield ChatGenerationChunk(message=AIMessageChunk(content=message.content))
+            return
+
+        async def open_stream():
+            # Retries are only safe until the first chunk has been handed out
+            stream = self.inner._astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return stream, await anext(stream, None)
+
+        (stream, first), grant = await self._acall_with_retry(open_stream, messages)
+        if first is None:
+            await self._astore(None, grant, "")
+            return
+        produced = [first.text]
+        yield first
+        async for chunk in stream:
+            produced.append(chunk.text)
+            yield chunk
+        await self._astore(key, grant, "".join(produced))
+
+    def get_stats(self) -> dict:
+        """Retry counters, time spent backing off and cache hit rates for this model"""
+        stats = {}
+        if self.retry_engine is not None:
+            stats.update(self.retry_engine.stats.as_dict())
+            stats["circuit_state"] = self.retry_engine.breaker.state
+        if self.response_cache is not None:
+            stats["cache"] = self.response_cache.stats()
+        return stats
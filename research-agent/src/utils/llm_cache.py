@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.utils.config import Config
+
+
+def cache_key(model: str, temperature: Optional[float], messages: List, stop: Optional[List[str]] = None) -> str:
+    """Content address of an LLM call: model, sampling settings and the exact messages"""
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[m.type, m.content] for m in messages],
+            "stop": stop,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryLRUCache:
+    """In-process LRU tier capped by total bytes of cached text"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old.encode("utf-8"))
+            self._items[key] = value
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.bytes -= len(evicted.encode("utf-8"))
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DiskCache:
+    """Persistent SQLite tier with a TTL and least-recently-used eviction by size"""
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at);
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value.encode("utf-8")), now, now)
+        )
+        self._writes += 1
+        # Size check is a full-table SUM, so only run it every few writes
+        if self._writes % 50 == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size cap"""
+        conn = self._connect()
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def total_bytes(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+
+class LLMCache:
+    """Two-tier (memory, then disk) cache of LLM responses with hit/miss/byte stats"""
+
+    def __init__(self, memory: MemoryLRUCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.bytes_stored = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        tier = "memory"
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            tier = "disk"
+            if value is not None:
+                # Promote so the next lookup stays in process
+                self.memory.set(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                if tier == "memory":
+                    self.memory_hits += 1
+                else:
+                    self.disk_hits += 1
+                self.bytes_served += len(value.encode("utf-8"))
+        return value
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+        with self._lock:
+            self.bytes_stored += len(value.encode("utf-8"))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "bytes_served": self.bytes_served,
+                "bytes_stored": self.bytes_stored,
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory.bytes,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_llm_cache() -> Optional[LLMCache]:
+    """Process-wide response cache (None when LLM_CACHE_ENABLED is off)"""
+    global _shared_cache
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            disk = None
+            if Config.LLM_CACHE_DISK_MB > 0:
+                disk = DiskCache(
+                    Config.LLM_CACHE_PATH,
+                    max_bytes=Config.LLM_CACHE_DISK_MB * 1024 * 1024,
+                    ttl_seconds=Config.LLM_CACHE_TTL_HOURS * 3600,
+                )
+            _shared_cache = LLMCache(MemoryLRUCache(Config.LLM_CACHE_MEMORY_MB * 1024 * 1024), disk)
+        return _shared_cache
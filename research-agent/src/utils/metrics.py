@@ -0,0 +1,205 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.config import Config
+
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+_STAGE_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 3600)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "research_llm_call_seconds": ("histogram", "Latency of LLM calls", _LATENCY_BUCKETS),
+    "research_llm_calls_total": ("counter", "LLM calls by outcome (ok, cached, error)", None),
+    "research_llm_prompt_tokens_total": ("counter", "Prompt tokens sent to the LLM", None),
+    "research_llm_completion_tokens_total": ("counter", "Completion tokens received from the LLM", None),
+    "research_llm_retries_total": ("counter", "LLM attempts retried after a retryable error", None),
+    "research_rate_limit_wait_seconds": ("histogram", "Time LLM calls waited for rate-limit capacity", _LATENCY_BUCKETS),
+    "research_tool_call_seconds": ("histogram", "Latency of agent tool calls", _LATENCY_BUCKETS),
+    "research_tool_errors_total": ("counter", "Agent tool calls that raised", None),
+    "research_stage_seconds": ("histogram", "Duration of job stages (queue, research, synthesis, report, job)", _STAGE_BUCKETS),
+    "research_jobs_total": ("counter", "Finished research jobs by status", None),
+    "research_jobs_requeued_total": ("counter", "Jobs put back on the queue by reason (lease_expired, shutdown)", None),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """In-process counters and histograms, optionally persisted as one snapshot file per process.
+
+    Gunicorn workers do not share memory, so each process writes its own
+    snapshot to `directory/<pid>.json` and /metrics merges every file it
+    finds. Counters from workers that have exited stay in the total, so
+    scraped counters never go backwards when a worker is recycled.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Dict] = {}
+        self._flusher = None
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> Tuple[str, LabelKey]:
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric: {name}")
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        buckets = METRICS[name][2]
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * (len(buckets) + 1), "sum": 0.0, "count": 0}
+            # Per-bucket counts; made cumulative when rendered
+            histogram["buckets"][bisect.bisect_left(buckets, value)] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the wall time of a block into histogram `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of every series"""
+        with self._lock:
+            return {
+                "pid": self.pid,
+                "counters": [[name, list(map(list, labels)), value]
+                             for (name, labels), value in self._counters.items()],
+                "histograms": [[name, list(map(list, labels)), dict(h, buckets=list(h["buckets"]))]
+                               for (name, labels), h in self._histograms.items()],
+            }
+
+    def flush(self):
+        """Atomically write this process's snapshot into the shared directory"""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            os.replace(tmp_path, os.path.join(self.directory, f"{self.pid}.json"))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def start_flusher(self, interval: float):
+        """Flush every `interval` seconds from a daemon thread (idempotent)"""
+        if self._flusher is not None or not self.directory:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"⚠️ Could not write metrics snapshot: {e}")
+
+        self._flusher = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def collect(self) -> List[Dict]:
+        """Snapshots of every process sharing the directory (this one always current)"""
+        own = self.snapshot()
+        if not self.directory or not os.path.isdir(self.directory):
+            return [own]
+        snapshots = [own]
+        for entry in os.listdir(self.directory):
+            if not entry.endswith(".json") or entry == f"{self.pid}.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, entry)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # replaced or removed while we were reading
+        return snapshots
+
+
+def merge_snapshots(snapshots: Iterable[Dict]) -> Tuple[Dict, Dict]:
+    """Sum counters and histogram buckets across process snapshots"""
+    counters: Dict[Tuple[str, LabelKey], float] = {}
+    histograms: Dict[Tuple[str, LabelKey], Dict] = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get("counters", []):
+            if name not in METRICS:
+                continue
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, histogram in snapshot.get("histograms", []):
+            if name not in METRICS or len(histogram["buckets"]) != len(METRICS[name][2]) + 1:
+                continue  # written with different buckets by an older deploy
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, {"buckets": [0] * len(histogram["buckets"]), "sum": 0.0, "count": 0})
+            merged["buckets"] = [a + b for a, b in zip(merged["buckets"], histogram["buckets"])]
+            merged["sum"] += histogram["sum"]
+            merged["count"] += histogram["count"]
+    return counters, histograms
+
+
+def _format_labels(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+
+def render_prometheus(snapshots: Iterable[Dict]) -> str:
+    """Prometheus text exposition format (0.0.4) for the merged snapshots"""
+    counters, histograms = merge_snapshots(snapshots)
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (series, labels), value in sorted(counters.items()):
+                if series == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            continue
+        for (series, labels), histogram in sorted(histograms.items()):
+            if series != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], histogram["buckets"]):
+                cumulative += count
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']:.6g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide registry; a forked child starts its own instead of inheriting the parent's counts"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None or _shared_registry.pid != os.getpid():
+            _shared_registry = MetricsRegistry(Config.METRICS_DIR)
+        return _shared_registry
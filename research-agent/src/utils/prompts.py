@@ -8,6 +8,7 @@ Guidelines:
 3. Provide citations and sources when possible
 4. Summarize key findings clearly
 5. Identify knowledge gaps and suggest further research directions
+6. Check LocalEvidence for sources already gathered in this research before searching again
 
 Current research topic: {topic}
 User query: {query}
@@ -26,3 +27,75 @@ Include:
 4. Recommendations for further reading
 5. Potential applications or implications
 """
+
+REPORT_PROMPT = """
+Generate a comprehensive research report on the topic: {topic}
+
+Research Findings:
+{findings}
+
+Please structure the report with:
+1. Executive Summary
+2. Key Findings
+3. Methodology
+4. Analysis
+5. Conclusions
+6. Recommendations
+7. References
+
+Make the report professional and well-structured.
+Be concise but comprehensive.
+"""
+
+FINDINGS_DIGEST_PROMPT = """
+You are condensing research findings on the topic: {topic}
+
+Findings:
+{findings}
+
+Write a dense digest of these findings in at most {max_words} words.
+Keep every concrete fact, statistic, source and disagreement; drop repetition and filler.
+Label each point with the question it answers.
+"""
+
+ROLLING_SUMMARY_PROMPT = """
+Progressively summarize the research conversation, adding the new lines to the current summary.
+
+Current summary:
+{summary}
+
+New lines:
+{new_lines}
+
+Return the updated summary in at most {max_words} words, keeping facts, figures and sources.
+"""
+
+GRAPH_ANSWER_PROMPT = """
+You are a research assistant answering one question from search evidence.
+
+Research topic: {topic}
+Question: {question}
+
+Web search results:
+{web_evidence}
+
+Academic search results:
+{academic_evidence}
+
+Answer the question in a few well-organized paragraphs using only this evidence.
+Cite sources by title, note disagreements, and state clearly what the evidence does not cover.
+"""
+
+REFRESH_ANSWER_PROMPT = """
+Earlier research on a closely related question produced the answer below.
+
+Research topic: {topic}
+Question now asked: {question}
+Question answered earlier: {previous_question}
+
+Earlier answer:
+{previous_answer}
+
+Rewrite the answer so it addresses the question now asked. Keep what still holds,
+drop what does not apply, and flag claims that may have become outdated.
+"""
@@ -0,0 +1,381 @@
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+
+WINDOW_SECONDS = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for Gemini models)"""
+    return max(1, len(text) // 4)
+
+
+class QuotaExhaustedError(RuntimeError):
+    """Raised when the daily request budget is spent; waiting minutes would not help"""
+
+    def __init__(self, used: int, limit: int, resets_in: float):
+        super().__init__(
+            f"Daily Gemini request budget exhausted ({used}/{limit}); resets in {resets_in / 3600:.1f}h"
+        )
+        self.resets_in = resets_in
+
+
+class QuotaGrant:
+    """One admitted LLM call: the ledger row and the tokens it was charged up front"""
+
+    def __init__(self, grant_id: int, kind: str, prompt_tokens: int, reserved_tokens: int, waited: float):
+        self.id = grant_id
+        self.kind = kind
+        self.prompt_tokens = prompt_tokens
+        self.reserved_tokens = reserved_tokens
+        self.waited = waited
+
+
+def _window_wait(rows: List[Tuple[float, int]], now: float, requests_per_minute: int,
+                 tokens_per_minute: Optional[int], tokens: int) -> float:
+    """Seconds until one more request of `tokens` fits the last-minute window (0 = now)"""
+    count = len(rows)
+    used = sum(t for _, t in rows)
+    wait = 0.0
+    if count + 1 > requests_per_minute:
+        # The oldest entries have to age out until a request slot frees up
+        wait = rows[count - requests_per_minute][0] + WINDOW_SECONDS - now
+    if tokens_per_minute and used + tokens > tokens_per_minute:
+        freed = 0
+        for at, row_tokens in rows:
+            freed += row_tokens
+            if used - freed + tokens <= tokens_per_minute:
+                wait = max(wait, at + WINDOW_SECONDS - now)
+                break
+    return max(0.0, wait)
+
+
+class _MemoryLedger:
+    """Sliding-window usage log for a single process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[int, List] = {}
+        self._ids = itertools.count(1)
+
+    def try_reserve(self, now: float, day: str, tokens: int, limits: Tuple) -> Tuple[float, Optional[int], int]:
+        requests_per_minute, tokens_per_minute, requests_per_day = limits
+        with self._lock:
+            for grant_id in [i for i, (at, _, d) in self._rows.items() if at <= now - WINDOW_SECONDS and d != day]:
+                del self._rows[grant_id]
+            used_today = sum(1 for _, _, d in self._rows.values() if d == day)
+            if requests_per_day and used_today >= requests_per_day:
+                return -1.0, None, used_today
+            window = sorted((at, t) for at, t, _ in self._rows.values() if at > now - WINDOW_SECONDS)
+            wait = _window_wait(window, now, requests_per_minute, tokens_per_minute, tokens)
+            if wait > 0:
+                return wait, None, used_today
+            grant_id = next(self._ids)
+            self._rows[grant_id] = [now, tokens, day]
+            return 0.0, grant_id, used_today + 1
+
+    def adjust(self, grant_id: int, tokens: int):
+        with self._lock:
+            if grant_id in self._rows:
+                self._rows[grant_id][1] = tokens
+
+    def usage(self, now: float, day: str) -> Dict:
+        with self._lock:
+            window = [(at, t) for at, t, _ in self._rows.values() if at > now - WINDOW_SECONDS]
+            return {
+                "minute_requests": len(window),
+                "minute_tokens": sum(t for _, t in window),
+                "day_requests": sum(1 for _, _, d in self._rows.values() if d == day),
+            }
+
+
+class _SQLiteLedger:
+    """Sliding-window usage log in SQLite, shared by every process on the host.
+
+    Each reservation is one BEGIN IMMEDIATE transaction, so gunicorn workers
+    and batch runs admit calls against the same minute and day totals.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS quota_grants (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                at REAL NOT NULL,
+                tokens INTEGER NOT NULL,
+                day TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_quota_at ON quota_grants(at);
+            CREATE INDEX IF NOT EXISTS idx_quota_day ON quota_grants(day);
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def try_reserve(self, now: float, day: str, tokens: int, limits: Tuple) -> Tuple[float, Optional[int], int]:
+        requests_per_minute, tokens_per_minute, requests_per_day = limits
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Keep today's rows for the daily count; older ones are only needed for the window
+            conn.execute("DELETE FROM quota_grants WHERE at <= ? AND day != ?", (now - WINDOW_SECONDS, day))
+            used_today = conn.execute("SELECT COUNT(*) FROM quota_grants WHERE day = ?", (day,)).fetchone()[0]
+            if requests_per_day and used_today >= requests_per_day:
+                conn.execute("COMMIT")
+                return -1.0, None, used_today
+            window = conn.execute(
+                "SELECT at, tokens FROM quota_grants WHERE at > ? ORDER BY at", (now - WINDOW_SECONDS,)
+            ).fetchall()
+            wait = _window_wait(window, now, requests_per_minute, tokens_per_minute, tokens)
+            if wait > 0:
+                conn.execute("COMMIT")
+                return wait, None, used_today
+            grant_id = conn.execute(
+                "INSERT INTO quota_grants (at, tokens, day) VALUES (?, ?, ?)", (now, tokens, day)
+            ).lastrowid
+            conn.execute("COMMIT")
+            return 0.0, grant_id, used_today + 1
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def adjust(self, grant_id: int, tokens: int):
+        self._connect().execute("UPDATE quota_grants SET tokens = ? WHERE id = ?", (tokens, grant_id))
+
+    def usage(self, now: float, day: str) -> Dict:
+        conn = self._connect()
+        requests, tokens = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tokens), 0) FROM quota_grants WHERE at > ?", (now - WINDOW_SECONDS,)
+        ).fetchone()
+        day_requests = conn.execute("SELECT COUNT(*) FROM quota_grants WHERE day = ?", (day,)).fetchone()[0]
+        return {"minute_requests": requests, "minute_tokens": tokens, "day_requests": day_requests}
+
+
+class QuotaPlanner:
+    """Admits LLM calls so requests/tokens per minute and requests per day are never exceeded.
+
+    Before a call is issued it is charged its estimated prompt tokens plus
+    the completion size expected for its kind ("step" or "report", learned
+    from recent calls), and settled with the real completion size
+    afterwards. Waiting calls are admitted in priority order (lower first,
+    then arrival), so a high-priority job's report is not stuck behind a
+    low-priority job's agent steps. Usage is kept in a sliding one-minute
+    window plus a per-day count that resets at midnight in the quota
+    timezone; once the day's budget is spent calls fail fast with
+    QuotaExhaustedError instead of sleeping until tomorrow. Threads wait
+    in reserve() and coroutines in areserve(), in one shared order.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: Optional[int] = None,
+                 requests_per_day: Optional[int] = None, store_path: Optional[str] = None,
+                 quota_timezone: str = "UTC", completion_estimates: Optional[Dict[str, int]] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute or None
+        self.requests_per_day = requests_per_day or None
+        self.ledger = _SQLiteLedger(store_path) if store_path else _MemoryLedger()
+        self.timezone = self._load_timezone(quota_timezone)
+        self.completion_estimates = dict(completion_estimates or {"step": 300, "report": 2000})
+        self._cond = threading.Condition()
+        self._waiters = []
+        # (event loop, asyncio.Event) of every coroutine waiting in areserve()
+        self._async_waiters = set()
+        # Bumped on every wake-up, so a thread can tell it missed one while checking the ledger
+        self._wakeups = 0
+        self._seq = itertools.count()
+        self.total_wait = 0.0
+        self.admitted = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _load_timezone(name: str):
+        try:
+            from zoneinfo import ZoneInfo
+            return ZoneInfo(name)
+        except Exception:
+            print(f"⚠️ Unknown quota timezone {name!r}, using UTC")
+            return timezone.utc
+
+    def _day(self) -> Tuple[str, float]:
+        """Current quota day and seconds until it resets"""
+        now = datetime.now(self.timezone)
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return now.strftime("%Y-%m-%d"), (tomorrow - now).total_seconds()
+
+    def expected_completion(self, kind: str) -> int:
+        with self._cond:
+            return self.completion_estimates.get(kind, self.completion_estimates.get("step", 300))
+
+    def _charge(self, prompt_tokens: int, kind: str) -> int:
+        reserved = prompt_tokens + self.expected_completion(kind)
+        if self.tokens_per_minute:
+            # A call larger than the whole minute budget can never fit, so cap its charge
+            reserved = min(reserved, self.tokens_per_minute)
+        return reserved
+
+    def _wake_locked(self):
+        """Let every waiter (thread or coroutine) re-check whether it is at the head and fits"""
+        self._wakeups += 1
+        self._cond.notify_all()
+        for loop, event in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _try_admit(self, entry: Tuple, reserved: int) -> Tuple[Optional[int], float]:
+        """(grant id, 0) if `entry` is at the head and fits now, else (None, seconds to wait).
+
+        The lock is held only for the head-of-line check; the ledger call
+        (a BEGIN IMMEDIATE transaction on a shared file) runs without it.
+        """
+        with self._cond:
+            if self._waiters[0] != entry:
+                return None, 1.0
+        limits = (self.requests_per_minute, self.tokens_per_minute, self.requests_per_day)
+        day, resets_in = self._day()
+        wait, grant_id, used_today = self.ledger.try_reserve(time.time(), day, reserved, limits)
+        if grant_id is not None:
+            return grant_id, 0.0
+        if wait < 0:
+            with self._cond:
+                self.rejected += 1
+            raise QuotaExhaustedError(used_today, self.requests_per_day, resets_in)
+        return None, wait
+
+    def _leave_locked(self, entry: Tuple, start: float, admitted: bool) -> float:
+        self._waiters.remove(entry)
+        heapq.heapify(self._waiters)
+        self._wake_locked()
+        waited = time.monotonic() - start
+        if admitted:
+            self.total_wait += waited
+            self.admitted += 1
+        return waited
+
+    def reserve(self, prompt_tokens: int, kind: str = "step", priority: float = 1.0) -> QuotaGrant:
+        """Block until the call fits every limit; returns the grant to settle afterwards"""
+        reserved = self._charge(prompt_tokens, kind)
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+        grant_id = None
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            self._wake_locked()
+        try:
+            while True:
+                with self._cond:
+                    seen = self._wakeups
+                grant_id, timeout = self._try_admit(entry, reserved)
+                if grant_id is not None:
+                    break
+                with self._cond:
+                    # Woken early when a higher-priority call arrives or the head is admitted
+                    if self._wakeups == seen:
+                        self._cond.wait(timeout)
+        finally:
+            with self._cond:
+                waited = self._leave_locked(entry, start, grant_id is not None)
+        return QuotaGrant(grant_id, kind, prompt_tokens, reserved, waited)
+
+    async def areserve(self, prompt_tokens: int, kind: str = "step", priority: float = 1.0) -> QuotaGrant:
+        """reserve() for coroutines: waits on the event loop instead of blocking a thread.
+
+        Admission checks run on a worker thread: the ledger may be a shared
+        SQLite file whose transactions wait on other processes.
+        """
+        reserved = self._charge(prompt_tokens, kind)
+        entry = (priority, next(self._seq))
+        start = time.monotonic()
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        grant_id = None
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            self._async_waiters.add(waiter)
+            self._wake_locked()
+        try:
+            while True:
+                # Cleared before the check, so a wake-up during it is not lost
+                event.clear()
+                grant_id, timeout = await asyncio.to_thread(self._try_admit, entry, reserved)
+                if grant_id is not None:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+                waited = self._leave_locked(entry, start, grant_id is not None)
+        return QuotaGrant(grant_id, kind, prompt_tokens, reserved, waited)
+
+    def settle(self, grant: QuotaGrant, completion_tokens: int):
+        """Replace a grant's estimate with the real size and refine the estimate for its kind"""
+        self.ledger.adjust(grant.id, grant.prompt_tokens + completion_tokens)
+        with self._cond:
+            previous = self.completion_estimates.get(grant.kind, completion_tokens)
+            self.completion_estimates[grant.kind] = int(0.8 * previous + 0.2 * completion_tokens)
+
+    def stats(self) -> Dict:
+        """Usage and headroom against every limit, across all processes sharing the ledger"""
+        day, resets_in = self._day()
+        usage = self.ledger.usage(time.time(), day)
+        with self._cond:
+            stats = {
+                "requests_per_minute": {"limit": self.requests_per_minute, "used": usage["minute_requests"],
+                                        "remaining": max(0, self.requests_per_minute - usage["minute_requests"])},
+                "tokens_per_minute": {"limit": self.tokens_per_minute, "used": usage["minute_tokens"],
+                                      "remaining": max(0, self.tokens_per_minute - usage["minute_tokens"])
+                                      if self.tokens_per_minute else None},
+                "requests_per_day": {"limit": self.requests_per_day, "used": usage["day_requests"],
+                                     "remaining": max(0, self.requests_per_day - usage["day_requests"])
+                                     if self.requests_per_day else None,
+                                     "resets_in_seconds": int(resets_in)},
+                "waiting_calls": len(self._waiters),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "total_wait_seconds": round(self.total_wait, 2),
+                "expected_completion_tokens": dict(self.completion_estimates),
+            }
+        return stats
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> QuotaPlanner:
+    """Process-wide quota planner; its ledger is shared by every process using QUOTA_STORE_PATH"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = QuotaPlanner(
+                Config.GEMINI_REQUESTS_PER_MINUTE,
+                Config.GEMINI_TOKENS_PER_MINUTE,
+                requests_per_day=Config.GEMINI_REQUESTS_PER_DAY,
+                store_path=Config.QUOTA_STORE_PATH or None,
+                quota_timezone=Config.GEMINI_QUOTA_TIMEZONE,
+                completion_estimates={
+                    "step": Config.QUOTA_STEP_COMPLETION_TOKENS,
+                    "report": Config.QUOTA_REPORT_COMPLETION_TOKENS,
+                },
+            )
+        return _shared_limiter
@@ -0,0 +1,237 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from src.utils.config import Config
+
+try:
+    import numpy as np
+except ImportError:  # optional; without it the index is disabled
+    np = None
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it of on or that the this to was what "
+    "when where which who why will with about into than their there these those does do can".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so "benefits"/"benefit" and "costs"/"cost" share a feature"""
+    for suffix in ("ies", "es", "s"):
+        if len(token) > 4 and token.endswith(suffix) and not token.endswith("ss"):
+            return token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+    return token
+
+
+def embed(text: str, dim: int) -> "np.ndarray":
+    """L2-normalized signed feature-hashing vector of the text's terms.
+
+    crc32 is used instead of hash() because str hashes are salted per
+    process and the vectors are persisted.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    counts: Dict[str, int] = {}
+    for token in _TOKEN.findall(text.lower()):
+        if token not in _STOPWORDS and len(token) > 1:
+            token = _stem(token)
+            counts[token] = counts.get(token, 0) + 1
+    for token, count in counts.items():
+        h = zlib.crc32(token.encode("utf-8"))
+        vector[h % dim] += (1.0 + np.log(count)) * (1.0 if (h >> 31) & 1 else -1.0)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class ResearchIndex:
+    """Completed research (topic, questions, answers, report) with a similarity index for reuse.
+
+    Rows live in SQLite with one hashed-embedding vector per job; every
+    process keeps the vectors in a NumPy matrix and appends rows written by
+    other processes before each query (rowid > last seen), so updates are
+    incremental and a query is a single matrix-vector product even at
+    100k jobs. Per-question matches are only computed for the best
+    candidate jobs.
+    """
+
+    def __init__(self, path: str, dim: int = 256, candidates: int = 20):
+        self.path = path
+        self.dim = dim
+        self.candidates = candidates
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._rowids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._last_rowid = 0
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS research (
+                rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+                research_id TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                results TEXT NOT NULL,
+                report TEXT,
+                created_at REAL NOT NULL,
+                vector BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_research_id ON research(research_id);
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _job_text(self, topic: str, results: Dict[str, str]) -> "np.ndarray":
+        # Topic counts most, then the questions, then (a little) the answers
+        vector = (2.0 * embed(topic, self.dim)
+                  + embed(" ".join(results), self.dim)
+                  + 0.5 * embed(" ".join(results.values()), self.dim))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _refresh(self):
+        """Append vectors written since the last query (by any process); call with the lock held"""
+        rows = self._connect().execute(
+            "SELECT rowid, vector FROM research WHERE rowid > ? ORDER BY rowid", (self._last_rowid,)
+        ).fetchall()
+        if not rows:
+            return
+        needed = self._size + len(rows)
+        if needed > len(self._matrix):
+            # Grow geometrically so appends stay amortized O(1)
+            capacity = max(needed, 2 * len(self._matrix), 1024)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            rowids = np.zeros(capacity, dtype=np.int64)
+            rowids[:self._size] = self._rowids[:self._size]
+            self._matrix, self._rowids = matrix, rowids
+        for row in rows:
+            vector = np.frombuffer(row["vector"], dtype=np.float32)
+            if len(vector) != self.dim:
+                continue  # written with another RESEARCH_INDEX_DIM
+            self._matrix[self._size] = vector
+            self._rowids[self._size] = row["rowid"]
+            self._size += 1
+        self._last_rowid = rows[-1]["rowid"]
+
+    def add(self, research_id: str, topic: str, results: Dict[str, str], report: Optional[str] = None):
+        """Index one finished research run (failed answers are left out)"""
+        answers = {q: a for q, a in results.items() if a and not str(a).startswith("Research failed")}
+        if not answers:
+            return
+        vector = self._job_text(topic, answers)
+        conn = self._connect()
+        # Replace in one transaction: readers never see the job missing, a crash never loses it
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM research WHERE research_id = ?", (research_id,))
+            conn.execute(
+                "INSERT INTO research (research_id, topic, results, report, created_at, vector) VALUES (?, ?, ?, ?, ?, ?)",
+                (research_id, topic, json.dumps(answers), report, time.time(), vector.astype(np.float32).tobytes())
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _top(self, query: "np.ndarray", k: int) -> List[tuple]:
+        with self._lock:
+            self._refresh()
+            if self._size == 0:
+                return []
+            scores = self._matrix[:self._size] @ query
+            rowids = self._rowids[:self._size]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(rowids[i]), float(scores[i])) for i in top]
+
+    def _rows(self, ranked: List[tuple]) -> List[Dict]:
+        if not ranked:
+            return []
+        placeholders = ", ".join("?" * len(ranked))
+        rows = self._connect().execute(
+            f"SELECT rowid, research_id, topic, results, report, created_at FROM research WHERE rowid IN ({placeholders})",
+            [rowid for rowid, _ in ranked]
+        ).fetchall()
+        by_rowid = {row["rowid"]: row for row in rows}
+        # Rows replaced by a newer run of the same research id are skipped
+        return [dict(by_rowid[rowid], score=score) for rowid, score in ranked if rowid in by_rowid]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Past research most similar to free text"""
+        results = []
+        for row in self._rows(self._top(embed(query, self.dim), limit)):
+            answers = json.loads(row["results"])
+            results.append({
+                "research_id": row["research_id"],
+                "topic": row["topic"],
+                "questions": list(answers),
+                "score": round(row["score"], 4),
+                "created_at": row["created_at"],
+                "snippet": (row["report"] or next(iter(answers.values()), ""))[:300],
+            })
+        return results
+
+    def match_answers(self, topic: str, questions: List[str], threshold: float) -> Dict[str, Dict]:
+        """Best earlier answer per question scoring at least `threshold`.
+
+        Score = 0.7 * question similarity + 0.3 * topic similarity, so the
+        same question asked under an unrelated topic is not reused.
+        """
+        if not questions:
+            return {}
+        query = self._job_text(topic, {q: "" for q in questions})
+        topic_vector = embed(topic, self.dim)
+        question_vectors = {q: embed(q, self.dim) for q in questions}
+        best: Dict[str, Dict] = {}
+        for row in self._rows(self._top(query, self.candidates)):
+            topic_score = float(embed(row["topic"], self.dim) @ topic_vector)
+            for old_question, answer in json.loads(row["results"]).items():
+                old_vector = embed(old_question, self.dim)
+                for question, vector in question_vectors.items():
+                    score = 0.7 * float(old_vector @ vector) + 0.3 * topic_score
+                    if score >= threshold and score > best.get(question, {}).get("score", 0.0):
+                        best[question] = {"answer": answer, "score": round(score, 4),
+                                          "research_id": row["research_id"], "question": old_question}
+        return best
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            return {"jobs": self._size, "dim": self.dim,
+                    "matrix_mb": round(self._matrix.nbytes / 1e6, 1)}
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+_warned_numpy = False
+
+
+def get_research_index() -> Optional[ResearchIndex]:
+    """Process-wide research index (None when RESEARCH_INDEX_ENABLED is off or numpy is missing)"""
+    global _shared_index, _warned_numpy
+    if not Config.RESEARCH_INDEX_ENABLED:
+        return None
+    if np is None:
+        if not _warned_numpy:
+            print("⚠️ Research index disabled: it requires numpy (pip install numpy)")
+            _warned_numpy = True
+        return None
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = ResearchIndex(Config.RESEARCH_INDEX_PATH, dim=Config.RESEARCH_INDEX_DIM)
+        return _shared_index
@@ -0,0 +1,415 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.utils.config import Config
+from src.utils.metrics import get_metrics
+
+T = TypeVar("T")
+
+# Patterns the Gemini API uses to suggest a retry delay in error messages
+_RETRY_DELAY_PATTERNS = [
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+(?:\.\d+)?)", re.IGNORECASE),
+    re.compile(r"retry in\s+(\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+    re.compile(r"retry-after:?\s*(\d+(?:\.\d+)?)", re.IGNORECASE),
+]
+
+# Status codes must stand alone, so "1500 tokens" or "max_timeout_ms" is not mistaken for one
+_RETRYABLE_STATUS = re.compile(r"\b(429|5\d\d)\b")
+_RETRYABLE_MARKERS = (
+    "quota", "rate limit", "resource has been exhausted", "resourceexhausted",
+    "unavailable", "overloaded", "timed out",
+)
+# Client timeouts that do not subclass TimeoutError (httpx.ReadTimeout, google DeadlineExceeded)
+_TIMEOUT_TYPE = re.compile(r"timeout|deadline", re.IGNORECASE)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call (including its retries) runs past its deadline"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is rejecting calls to the model endpoint"""
+
+
+def suggested_retry_delay(error: Exception) -> Optional[float]:
+    """Extract a server-suggested retry delay (Retry-After / RetryInfo) from an error"""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers and headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+
+    message = str(error)
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Quota, overload, server and timeout errors are worth retrying"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code == 429 or code >= 500
+    if _TIMEOUT_TYPE.search(type(error).__name__):
+        return True
+    message = f"{type(error).__name__} {error}".lower()
+    if _RETRYABLE_STATUS.search(message):
+        return True
+    return any(marker in message for marker in _RETRYABLE_MARKERS)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff bounded by an attempt count and a per-call deadline"""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 attempt_timeout: Optional[float] = 120.0, deadline: Optional[float] = 300.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=Config.LLM_MAX_ATTEMPTS,
+            base_delay=Config.LLM_BACKOFF_BASE,
+            max_delay=Config.LLM_BACKOFF_MAX,
+            attempt_timeout=Config.LLM_ATTEMPT_TIMEOUT,
+            deadline=Config.LLM_CALL_DEADLINE,
+        )
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number `attempt` (1-based), preferring the server's hint"""
+        suggested = suggested_retry_delay(error)
+        if suggested is not None:
+            # Small jitter so callers told the same delay do not all return together
+            return suggested + random.uniform(0, min(1.0, self.base_delay))
+        # "Full jitter" exponential backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def time_until_retry(self) -> float:
+        """Seconds until the breaker will admit a call (0 when it admits now)"""
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining <= 0 and self.probing:
+                # Another caller holds the probe; check back shortly
+                return min(1.0, self.reset_timeout)
+            return max(0.0, remaining)
+
+    def allow(self) -> str:
+        """"closed" (call freely), "probe" (this caller holds the single probe) or "" (wait)"""
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout and not self.probing:
+                self.probing = True
+                return "probe"
+            return ""
+
+    def release_probe(self):
+        """Give the probe back without a verdict (the caller never reached the endpoint)"""
+        with self.lock:
+            self.probing = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class RetryStats:
+    """Thread-safe counters describing how much retrying a model has needed"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.circuit_rejections = 0
+        self.abandoned = 0
+        self.backoff_seconds = 0.0
+
+    def add(self, **increments):
+        with self.lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "deadline_exceeded": self.deadline_exceeded,
+                "circuit_rejections": self.circuit_rejections,
+                "abandoned": self.abandoned,
+                "abandoned_running": abandoned_running(),
+                "backoff_seconds": round(self.backoff_seconds, 3),
+            }
+
+
+# Attempts run on this pool so a hung request can be abandoned at its deadline. A thread cannot
+# be killed, so an abandoned attempt keeps its pool thread until the request itself returns (the
+# client's own timeout bounds that); they are counted so a pool clogged by them is visible.
+_ATTEMPT_POOL_SIZE = 64
+_attempt_pool = ThreadPoolExecutor(max_workers=_ATTEMPT_POOL_SIZE, thread_name_prefix="llm-attempt")
+_abandoned = set()
+_abandoned_lock = threading.Lock()
+
+
+def abandoned_running() -> int:
+    """Timed-out attempts still occupying an _attempt_pool thread"""
+    with _abandoned_lock:
+        return len(_abandoned)
+
+
+def _abandon(future):
+    with _abandoned_lock:
+        _abandoned.add(future)
+    future.add_done_callback(lambda done: _forget_abandoned(done))
+
+
+def _forget_abandoned(future):
+    with _abandoned_lock:
+        _abandoned.discard(future)
+
+
+class RetryEngine:
+    """Runs a callable with backoff, deadline enforcement and a circuit breaker"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 stats: Optional[RetryStats] = None):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = stats or RetryStats()
+
+    def _run_attempt(self, func: Callable[[], T], timeout: Optional[float]) -> T:
+        if timeout is None:
+            return func()
+        future = _attempt_pool.submit(func)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                # Never started: every pool thread is busy, most likely with abandoned attempts
+                raise DeadlineExceeded(f"LLM call still queued after {timeout:.1f}s "
+                                       f"({abandoned_running()} hung attempts hold the pool)")
+            _abandon(future)
+            self.stats.add(abandoned=1)
+            if abandoned_running() >= _ATTEMPT_POOL_SIZE // 2:
+                print(f"⚠️ {abandoned_running()} hung LLM attempts are holding "
+                      f"{_ATTEMPT_POOL_SIZE} attempt threads")
+            raise DeadlineExceeded(f"LLM call timed out after {timeout:.1f}s")
+
+    async def _arun_attempt(self, func: Callable[[], Awaitable[T]], timeout: Optional[float]) -> T:
+        if timeout is None:
+            return await func()
+        try:
+            return await asyncio.wait_for(func(), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"LLM call timed out after {timeout:.1f}s")
+
+    def _circuit_wait(self, deadline_at: Optional[float]) -> Tuple[float, bool]:
+        """(seconds to wait before the breaker admits a call, whether this call now holds the probe);
+        a wait of 0 means go now"""
+        admitted = self.breaker.allow()
+        if admitted:
+            return 0.0, admitted == "probe"
+        wait = self.breaker.time_until_retry()
+        if deadline_at is not None and time.monotonic() + wait > deadline_at:
+            self.stats.add(circuit_rejections=1, failures=1)
+            raise CircuitOpenError(
+                f"Model endpoint circuit is open; retry in {wait:.1f}s"
+            )
+        self.stats.add(backoff_seconds=wait)
+        # A breaker that is closed again (or half open) is re-checked without sleeping
+        return max(wait, 1e-3), False
+
+    def _wait_for_circuit(self, deadline_at: Optional[float]) -> bool:
+        """Block until the breaker admits the call; True if it holds the probe"""
+        while True:
+            wait, probe = self._circuit_wait(deadline_at)
+            if not wait:
+                return probe
+            time.sleep(wait)
+
+    def _attempt_timeout(self, deadline_at: Optional[float]) -> Optional[float]:
+        timeout = self.policy.attempt_timeout
+        if deadline_at is not None:
+            remaining = deadline_at - time.monotonic()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        self.stats.add(attempts=1)
+        return timeout
+
+    def _failed(self, error: Exception, attempt: int, deadline_at: Optional[float], probe: bool) -> float:
+        """Book a failed attempt; returns the delay before retrying, or raises to give up.
+
+        Must be called from the `except` block handling `error` (a bare
+        raise re-raises it). `probe` says whether this attempt held the
+        breaker's half-open probe.
+        """
+        policy = self.policy
+        retryable = is_retryable(error)
+        if retryable:
+            self.breaker.record_failure()
+        elif probe:
+            # The endpoint answered the probe, if only to reject the request
+            self.breaker.record_success()
+        # Any other caller error says nothing about endpoint health, so the breaker is left alone
+
+        if isinstance(error, DeadlineExceeded):
+            self.stats.add(deadline_exceeded=1)
+        if not retryable or attempt >= policy.max_attempts:
+            self.stats.add(failures=1)
+            raise
+
+        delay = policy.backoff(attempt, error)
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            # Waiting would blow the deadline anyway, so fail now
+            self.stats.add(failures=1, deadline_exceeded=1)
+            raise DeadlineExceeded(
+                f"Giving up after {attempt} attempt(s); next retry in {delay:.1f}s "
+                f"would exceed the {policy.deadline:.0f}s deadline: {error}"
+            ) from error
+
+        print(f"⏳ LLM call failed ({type(error).__name__}), retrying in {delay:.1f}s "
+              f"(attempt {attempt}/{policy.max_attempts})")
+        self.stats.add(retries=1, backoff_seconds=delay)
+        get_metrics().inc("research_llm_retries_total")
+        return delay
+
+    def call(self, func: Callable[[], T],
+             before_attempt: Optional[Callable[[], None]] = None) -> T:
+        """Call `func` until it succeeds, retries run out or the deadline passes.
+
+        `before_attempt` runs ahead of every attempt (e.g. waiting for rate
+        limit capacity); time spent there does not count against the deadline.
+        """
+        policy = self.policy
+        deadline_at = time.monotonic() + policy.deadline if policy.deadline else None
+        self.stats.add(calls=1)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if before_attempt is not None:
+                # Ahead of the breaker, so a caller stuck here (or failing) never holds the probe
+                queued_at = time.monotonic()
+                before_attempt()
+                if deadline_at is not None:
+                    deadline_at += time.monotonic() - queued_at
+            probe = self._wait_for_circuit(deadline_at)
+
+            try:
+                result = self._run_attempt(func, self._attempt_timeout(deadline_at))
+            except Exception as e:
+                time.sleep(self._failed(e, attempt, deadline_at, probe))
+                continue
+            except BaseException:
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, func: Callable[[], Awaitable[T]],
+                    before_attempt: Optional[Callable[[], Awaitable[None]]] = None) -> T:
+        """call() for coroutines: same policy, breaker and stats, waiting without blocking the loop"""
+        policy = self.policy
+        deadline_at = time.monotonic() + policy.deadline if policy.deadline else None
+        self.stats.add(calls=1)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if before_attempt is not None:
+                queued_at = time.monotonic()
+                await before_attempt()
+                if deadline_at is not None:
+                    deadline_at += time.monotonic() - queued_at
+            while True:
+                wait, probe = self._circuit_wait(deadline_at)
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+
+            try:
+                result = await self._arun_attempt(func, self._attempt_timeout(deadline_at))
+            except Exception as e:
+                await asyncio.sleep(self._failed(e, attempt, deadline_at, probe))
+                continue
+            except BaseException:
+                # Cancelled (or interrupted) mid-attempt: no verdict on the endpoint
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            self.breaker.record_success()
+            return result
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """Process-wide breaker per model endpoint so every agent sees the same health"""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(
+                failure_threshold=Config.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=Config.CIRCUIT_RESET_SECONDS,
+            )
+        return _breakers[endpoint]
@@ -0,0 +1,216 @@
+"""
+Research worker: runs the jobs web processes put on the durable queue (JOB_EXECUTION=queue).
+
+Start as many as research throughput needs, on any host that reaches
+JOB_QUEUE_URL and JOB_STORE_URL, independently of the web tier:
+
+    python -m src.worker [--concurrency 4]    (from the research-agent/ directory)
+
+Every claimed job is leased to this worker and a heartbeat thread renews
+the leases of jobs that are still making progress. If the worker is killed,
+or a job publishes no progress for JOB_STALL_SECONDS or runs past
+JOB_MAX_RUNTIME_SECONDS, the lease lapses, the run is told to stop and any
+worker re-queues the job, which then resumes from its per-question
+checkpoints. SIGTERM stops claiming, lets running jobs finish for up to
+WORKER_SHUTDOWN_SECONDS and hands the rest back to the queue.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from src.agents.agent_pool import AgentPool
+from src.jobs.queue import JobQueue, create_job_queue
+from src.jobs.runner import JobRunner
+from src.jobs.store import JobStore, create_job_store
+from src.utils.config import Config
+from src.utils.metrics import get_metrics
+
+
+@dataclass
+class HeldJob:
+    """A job this worker is running: monotonic start and last progress, and its cancel flag"""
+    started: float
+    progressed: float
+    cancel: threading.Event = field(default_factory=threading.Event)
+
+    def touch(self):
+        self.progressed = time.monotonic()
+
+
+class ResearchWorker:
+    """Claims jobs from a JobQueue and runs them with a JobRunner, `concurrency` at a time"""
+
+    def __init__(self, job_queue: JobQueue, job_store: JobStore, runner: JobRunner,
+                 concurrency: int, worker_id: Optional[str] = None):
+        self.job_queue = job_queue
+        self.job_store = job_store
+        self.runner = runner
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        # Every job this worker is running, by id
+        self._held: Dict[str, HeldJob] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def stop(self, *_):
+        if not self._stopping.is_set():
+            print(f"🛑 Worker {self.worker_id} stopping: no new jobs, waiting for running ones")
+        self._stopping.set()
+
+    def run(self):
+        print(f"👷 Worker {self.worker_id} running up to {self.concurrency} jobs from {Config.JOB_QUEUE_URL}")
+        self.job_queue.heartbeat(self.worker_id, [], self.concurrency)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="queue-heartbeat", daemon=True)
+        heartbeat.start()
+        slots = [threading.Thread(target=self._slot, name=f"research-worker-{i}", daemon=True)
+                 for i in range(self.concurrency)]
+        for slot in slots:
+            slot.start()
+
+        while not self._stopping.wait(1.0):
+            pass
+
+        deadline = time.monotonic() + Config.WORKER_SHUTDOWN_SECONDS
+        for slot in slots:
+            slot.join(max(0.0, deadline - time.monotonic()))
+        self._release_held()
+        self.job_queue.leave(self.worker_id)
+        print(f"👋 Worker {self.worker_id} stopped")
+
+    def _slot(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.job_queue.claim(self.worker_id)
+            except Exception as e:
+                print(f"⚠️ Could not claim a job: {e}")
+                job = None
+            if job is None:
+                self._stopping.wait(Config.WORKER_POLL_SECONDS)
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict):
+        job_id, payload = job["id"], job["payload"]
+        started = time.monotonic()
+        held = HeldJob(started, started)
+        with self._lock:
+            self._held[job_id] = held
+        if job["attempts"] == 1:
+            self.runner.metrics.observe('research_stage_seconds', job["waited"], stage='queue')
+        try:
+            record = self.job_store.get(job_id, ['status'])
+            if record is None or record.get('status') == 'completed':
+                # Deleted, or finished by a worker whose lease lapsed just before it completed
+                return
+            self.runner.mark_processing(job_id)
+            self.job_store.update(job_id, worker=self.worker_id, attempt=job["attempts"])
+            # Failures are recorded on the job by the runner; the queue only tracks the lease
+            self.runner.run(job_id, payload["topic"], payload["questions"],
+                            fresh=payload.get("fresh", False), priority=payload.get("priority", "normal"),
+                            cancel=held.cancel, on_progress=held.touch)
+        except Exception as e:
+            print(f"❌ Job {job_id} crashed: {e}")
+        finally:
+            with self._lock:
+                self._held.pop(job_id, None)
+            if held.cancel.is_set():
+                # Given up or released: the lapsed lease (or the release) puts it back on the queue
+                return
+            if not self.job_queue.complete(job_id, self.worker_id, time.monotonic() - started):
+                print(f"⚠️ Lease on {job_id} had lapsed; another worker may have run it again")
+
+    def _heartbeat_loop(self):
+        interval = Config.JOB_LEASE_SECONDS / 3
+        while True:
+            time.sleep(interval)
+            try:
+                with self._lock:
+                    held = dict(self._held)
+                live = [job_id for job_id, job in held.items() if self._live(job_id, job)]
+                renewed = self.job_queue.heartbeat(self.worker_id, live, self.concurrency)
+                for job_id in set(live) - set(renewed):
+                    print(f"⚠️ Lost the lease on {job_id} (worker stalled past JOB_LEASE_SECONDS?)")
+                # Stopped between questions; the job is re-queued once its lease lapses
+                for job_id in set(held) - set(renewed):
+                    held[job_id].cancel.set()
+                # Every worker reaps; the queue hands each lapsed job to exactly one of them
+                for job_id, requeued in self.job_queue.requeue_expired():
+                    self._lapsed(job_id, requeued)
+            except Exception as e:
+                print(f"⚠️ Queue heartbeat failed: {e}")
+
+    @staticmethod
+    def _live(job_id: str, job: HeldJob) -> bool:
+        """Whether the job still deserves its lease (recent progress, within the runtime limit)"""
+        if job.cancel.is_set():
+            return False
+        now = time.monotonic()
+        if now - job.progressed > Config.JOB_STALL_SECONDS:
+            print(f"⚠️ {job_id} made no progress for {Config.JOB_STALL_SECONDS:.0f}s; giving up its lease")
+            return False
+        if Config.JOB_MAX_RUNTIME_SECONDS and now - job.started > Config.JOB_MAX_RUNTIME_SECONDS:
+            print(f"⚠️ {job_id} ran past JOB_MAX_RUNTIME_SECONDS; giving up its lease")
+            return False
+        return True
+
+    def _lapsed(self, job_id: str, requeued: bool):
+        if requeued:
+            print(f"♻️ Re-queued {job_id}: its worker stopped renewing the lease")
+            self.job_store.update(job_id, status='queued')
+            self.job_store.append_event(job_id, 'job_requeued', {'reason': 'lease_expired'})
+            self.runner.metrics.inc('research_jobs_requeued_total', reason='lease_expired')
+            return
+        error = f"Job abandoned after {self.job_queue.max_attempts} attempts (workers stopped responding)"
+        print(f"❌ {job_id}: {error}")
+        self.job_store.update(job_id, status='error', error=error)
+        self.job_store.append_event(job_id, 'job_failed', {'error': error})
+        self.runner.metrics.inc('research_jobs_total', status='error')
+
+    def _release_held(self):
+        """Hand jobs still running at shutdown back to the queue; another worker resumes them"""
+        with self._lock:
+            held = dict(self._held)
+        for job_id, job in held.items():
+            # A run still going stops before its next question instead of racing the next worker
+            job.cancel.set()
+            if self.job_queue.release(job_id, self.worker_id):
+                print(f"↩️ Released {job_id} back to the queue")
+                self.job_store.update(job_id, status='queued')
+                self.job_store.append_event(job_id, 'job_requeued', {'reason': 'shutdown'})
+                self.runner.metrics.inc('research_jobs_requeued_total', reason='shutdown')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research job worker")
+    parser.add_argument("--concurrency", type=int, default=Config.JOB_WORKERS,
+                        help="Jobs run at once (default: JOB_WORKERS)")
+    parser.add_argument("--worker-id", help="Name in queue stats and job records (default: host-pid-random)")
+    args = parser.parse_args()
+
+    job_store = create_job_store(Config.JOB_STORE_URL)
+    job_queue = create_job_queue(Config.JOB_QUEUE_URL)
+
+    metrics = get_metrics()
+    metrics.start_flusher(Config.METRICS_FLUSH_SECONDS)
+
+    # One pre-built agent per job slot
+    agent_pool = AgentPool(args.concurrency)
+    agent_pool.warm()
+
+    worker = ResearchWorker(job_queue, job_store, JobRunner(job_store, agent_pool, metrics),
+                            args.concurrency, args.worker_id)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+    metrics.flush()
+
+
+if __name__ == "__main__":
+    main()
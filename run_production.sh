@@ -1,4 +1,13 @@
 #!/bin/bash
 echo "🚀 Starting Research Agent in Production Mode..."
 cd app
-gunicorn -w 4 -b 0.0.0.0:5000 app:app
+# The agent's ReAct trace is for debugging; printing it slows every worker down
+export AGENT_VERBOSE=${AGENT_VERBOSE:-false}
+if [ "${SERVER_MODE:-threaded}" = "async" ]; then
+    # ASGI: jobs, LLM calls and progress streams are coroutines on each worker's event loop;
+    # each of the 4 workers runs up to ASYNC_JOB_WORKERS jobs against the shared quota
+    hypercorn -w 4 -b 0.0.0.0:5000 asgi:app
+else
+    # Threaded workers so long-lived progress streams (SSE) do not block other requests
+    gunicorn -w 4 --threads 16 -b 0.0.0.0:5000 app:app
+fi